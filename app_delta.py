@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+app_delta.py - Dosya Listesi ile Delta Güncelleme
+
+Her sürümün dosya listesi (yol, boyut, sha256) arşivlerin yanında ayrı
+bir dosya olarak yayınlanır; index girdisi sadece bu listenin adresini
+(files_manifest_url) ve sha256'sını (files_manifest_sha256) ile dosyaların
+tek tek indirilebildiği files_url adresini taşır (bkz. build_index.py).
+Liste sadece o uygulama güncellenirken indirilir.
+
+Kurulumda çıkarılan dosyalardan aynı biçimde bir liste hesaplanıp
+uygulama klasörüne .clapp-files.json olarak yazılır (ağa çıkılmaz).
+
+Güncellemede yeni sürümün listesi kurulu ağaçla karşılaştırılır:
+- .clapp-files.json varsa içeriği aynı kalan dosyalar (yeri değişmiş
+  olsalar bile), yoksa sadece aynı yolda duran dosyalar yeniden kullanılır;
+  bunlar staging alanına hard link ile (olmazsa kopyalanarak) alınır
+- Sadece değişen veya yeni dosyalar indirilir ve sha256 ile doğrulanır
+- Hazırlanan ağaç app_staging.swap_in_app ile tek rename'de yerine konur
+
+Kurulu dosyalar yeniden kullanılmadan önce hash'leri dosya içeriğinden
+(stat cache'ine güvenmeden) kontrol edilir; .clapp-files.json
+sadece hangi dosyaların aday olduğunu söyler. Delta yapılamazsa veya
+indirilecek veri arşivden çok daha küçük değilse çağıran taraf tam arşive
+geri döner.
+"""
+
+import os
+import json
+import shutil
+import posixpath
+import concurrent.futures
+from urllib.parse import quote
+from typing import Dict, Any, List, Optional, Tuple
+
+# Kurulu uygulama klasöründeki dosya listesi
+FILE_MANIFEST_NAME = ".clapp-files.json"
+FILE_MANIFEST_FORMAT = 1
+
+# İndirilecek veri arşiv boyutunun bu oranını aşarsa tam arşiv tercih edilir
+DELTA_MAX_RATIO = 0.8
+
+# Eşzamanlı dosya indirme sayısı
+DELTA_JOBS = 4
+
+# Yayınlanan dosya listesinin kabul edilen en büyük boyutu
+FILES_MANIFEST_MAX_SIZE = 16 * 1024 * 1024
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _safe_rel_path(path: Any) -> Optional[str]:
+    """Dosya listesindeki yolu doğrular; ağacın dışına çıkan yollar için None döner"""
+    if not isinstance(path, str) or not path or '\\' in path or '\0' in path:
+        return None
+    normalized = posixpath.normpath(path)
+    if normalized != path or normalized.startswith(('/', '../')) or normalized in ('.', '..'):
+        return None
+    if normalized == FILE_MANIFEST_NAME:
+        return None
+    return normalized
+
+
+def _valid_files(files: Any) -> Optional[List[Dict[str, Any]]]:
+    """Index'teki dosya listesini doğrular; geçersizse None döner"""
+    if not isinstance(files, list):
+        return None
+    seen = set()
+    for entry in files:
+        if not isinstance(entry, dict) or _safe_rel_path(entry.get('path')) is None:
+            return None
+        if not isinstance(entry.get('size'), int) or not isinstance(entry.get('sha256'), str):
+            return None
+        if entry['path'] in seen:
+            return None
+        seen.add(entry['path'])
+    return files
+
+
+def load_file_manifest(app_path: str) -> Optional[Dict[str, Any]]:
+    """Kurulu uygulamanın dosya listesini yükler (yoksa veya bozuksa None)"""
+    try:
+        with open(os.path.join(app_path, FILE_MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('format') != FILE_MANIFEST_FORMAT:
+        return None
+    if _valid_files(data.get('files')) is None:
+        return None
+    return data
+
+
+def encode_file_manifest(files: List[Dict[str, Any]], version: Optional[str] = None) -> bytes:
+    """Dosya listesini yayınlanan ve kurulu klasöre yazılan ortak biçimde kodlar"""
+    data = {'format': FILE_MANIFEST_FORMAT, 'version': version, 'files': files}
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_file_manifest(app_path: str, files: List[Dict[str, Any]], version: Optional[str] = None):
+    """Dosya listesini uygulama klasörüne atomik olarak yazar"""
+    path = os.path.join(app_path, FILE_MANIFEST_NAME)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(encode_file_manifest(files, version))
+    os.replace(temp_path, path)
+
+
+def scan_file_manifest(app_path: str) -> List[Dict[str, Any]]:
+    """Klasördeki normal dosyalardan (yol, boyut, sha256) listesi üretir"""
+    from file_hasher import compute_file_hash
+
+    files = []
+    for dirpath, dirnames, filenames in os.walk(app_path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            full_path = os.path.join(dirpath, filename)
+            rel_path = os.path.relpath(full_path, app_path).replace(os.sep, '/')
+            if rel_path == FILE_MANIFEST_NAME or os.path.islink(full_path) or not os.path.isfile(full_path):
+                continue
+            entry = {'path': rel_path, 'size': os.path.getsize(full_path), 'sha256': compute_file_hash(full_path)}
+            if os.access(full_path, os.X_OK):
+                entry['executable'] = True
+            files.append(entry)
+    return files
+
+
+def record_file_manifest(app_path: str, app_info: Dict[str, Any]) -> bool:
+    """
+    İndirilen uygulama klasörünün dosya listesini .clapp-files.json olarak yazar
+
+    Liste çıkarılan dosyalardan hesaplanır; yayınlanan liste kurulumda
+    indirilmez. Liste sadece bir ipucudur (dosyalar kullanılmadan önce yine
+    hash'lenir), bu yüzden yazılamaması kurulumu etkilemez.
+
+    Returns:
+        Liste yazıldıysa True
+    """
+    try:
+        write_file_manifest(app_path, scan_file_manifest(app_path), app_info.get('version'))
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def fetch_files_manifest(app_info: Dict[str, Any]) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+    """
+    Index girdisinin işaret ettiği yayınlanmış dosya listesini indirir
+
+    Liste files_manifest_sha256 ile doğrulanır.
+
+    Returns:
+        (dosya listesi veya None, hata mesajı)
+    """
+    import hashlib
+    from http_client import get_http_client
+
+    url = app_info.get('files_manifest_url')
+    expected_sha256 = app_info.get('files_manifest_sha256')
+    if not url or not isinstance(expected_sha256, str):
+        return None, "Index'te dosya listesi yok"
+
+    hasher = hashlib.sha256()
+    chunks = []
+    size = 0
+    try:
+        with get_http_client().stream(url) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > FILES_MANIFEST_MAX_SIZE:
+                    return None, "Dosya listesi çok büyük"
+                hasher.update(chunk)
+                chunks.append(chunk)
+    except Exception as e:
+        return None, f"Dosya listesi indirilemedi: {e}"
+
+    if hasher.hexdigest() != expected_sha256.lower():
+        return None, "Dosya listesi sha256 doğrulaması başarısız"
+    try:
+        data = json.loads(b''.join(chunks).decode('utf-8'))
+    except ValueError:
+        return None, "Dosya listesi okunamadı"
+    if not isinstance(data, dict) or data.get('format') != FILE_MANIFEST_FORMAT:
+        return None, "Dosya listesi biçimi tanınmadı"
+    files = _valid_files(data.get('files'))
+    if files is None:
+        return None, "Dosya listesi geçersiz"
+    return files, ""
+
+
+def plan_delta(installed_path: str, files: List[Dict[str, Any]]) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+    """
+    Yeni dosya listesini kurulu ağaçla karşılaştırır
+
+    Args:
+        installed_path: Kurulu uygulama klasörü
+        files: Yeni sürümün dosya listesi
+
+    Returns:
+        (yeniden kullanılacaklar: yeni yol -> kurulu dosyanın tam yolu,
+         indirilecek dosya kayıtları)
+    """
+    from file_hasher import compute_file_hash
+
+    installed = load_file_manifest(installed_path)
+    by_hash: Dict[str, List[str]] = {}
+    recorded: Dict[str, str] = {}
+    if installed is not None:
+        for entry in installed['files']:
+            by_hash.setdefault(entry['sha256'], []).append(entry['path'])
+            recorded[entry['path']] = entry['sha256']
+
+    reuse: Dict[str, str] = {}
+    fetch: List[Dict[str, Any]] = []
+    for entry in files:
+        sha256 = entry['sha256'].lower()
+        if installed is not None:
+            # Kayıtlı içeriği aynı olan dosyalar (yer değiştirmiş olabilir)
+            candidates = by_hash.get(sha256, [])
+        else:
+            # Liste yoksa sadece aynı yoldaki dosyaya bakılır
+            candidates = [entry['path']]
+
+        for candidate in candidates:
+            source = os.path.join(installed_path, *candidate.split('/'))
+            try:
+                if os.path.islink(source) or not os.path.isfile(source):
+                    continue
+                if os.path.getsize(source) != entry['size'] or compute_file_hash(source) != sha256:
+                    continue
+            except OSError:
+                continue
+            reuse[entry['path']] = source
+            break
+        else:
+            fetch.append(entry)
+
+    return reuse, fetch
+
+
+def _place_existing(source: str, target: str, executable: bool):
+    """Kurulu dosyayı hard link ile (olmazsa kopyalayarak) hedefe koyar"""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    # İzin değişecekse link verilmez; chmod kurulu dosyayı da etkilerdi
+    if bool(os.stat(source).st_mode & 0o111) == executable:
+        try:
+            os.link(source, target)
+            return
+        except OSError:
+            pass
+    shutil.copy2(source, target)
+    _set_executable(target, executable)
+
+
+def _set_executable(path: str, executable: bool):
+    mode = os.stat(path).st_mode
+    new_mode = (mode | 0o755) if executable else (mode & ~0o111)
+    if new_mode != mode:
+        os.chmod(path, new_mode)
+
+
+def _download_file(url: str, target: str, entry: Dict[str, Any], progress=None):
+    """
+    Tek dosyayı indirir, boyut ve sha256'yı akış sırasında doğrular
+
+    Raises:
+        OSError, ValueError: İndirme veya doğrulama başarısız olursa
+    """
+    import hashlib
+    from http_client import get_http_client
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    part_path = target + ".part"
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with get_http_client().stream(url, headers={'Accept-Encoding': 'identity'}) as response:
+            response.raise_for_status()
+            with open(part_path, 'wb') as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    if progress is not None:
+                        progress.update(len(chunk))
+
+        if size != entry['size']:
+            raise ValueError(f"{entry['path']}: boyut uyuşmuyor (beklenen {entry['size']}, gelen {size})")
+        if hasher.hexdigest() != entry['sha256'].lower():
+            raise ValueError(f"{entry['path']}: sha256 doğrulaması başarısız")
+
+        os.replace(part_path, target)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+    _set_executable(target, bool(entry.get('executable')))
+
+
+def stage_delta_update(app_name: str, app_info: Dict[str, Any], temp_dir: str,
+                       max_ratio: float = DELTA_MAX_RATIO, jobs: int = DELTA_JOBS) -> Tuple[bool, str]:
+    """
+    Yeni sürümü kurulu sürümden ve sadece değişen dosyalardan hazırlar
+
+    Args:
+        app_name: Uygulama adı
+        app_info: Index'teki yeni sürüm kaydı (files_manifest_url,
+            files_manifest_sha256 ve files_url gerekli)
+        temp_dir: Staging içindeki çalışma dizini
+        max_ratio: İndirilecek veri artifact_size'ın bu oranını aşarsa delta yapılmaz
+        jobs: Eşzamanlı dosya indirme sayısı
+
+    Returns:
+        (success, hazırlanan klasörün yolu veya neden yapılamadığı)
+    """
+    from app_staging import get_apps_directory
+
+    files_url = app_info.get('files_url')
+    if not files_url or not app_info.get('files_manifest_url'):
+        return False, "Index'te dosya listesi yok"
+
+    installed_path = os.path.join(get_apps_directory(), app_name)
+    if not os.path.isdir(installed_path):
+        return False, "Kurulu sürüm bulunamadı"
+
+    # Liste sadece güncellenen uygulama için indirilir
+    files, error = fetch_files_manifest(app_info)
+    if files is None:
+        return False, error
+
+    reuse, fetch = plan_delta(installed_path, files)
+    fetch_bytes = sum(entry['size'] for entry in fetch)
+    artifact_size = app_info.get('artifact_size')
+    if fetch and isinstance(artifact_size, int) and fetch_bytes >= artifact_size * max_ratio:
+        return False, f"Değişen veri ({fetch_bytes} byte) arşivden belirgin şekilde küçük değil"
+
+    staged_path = os.path.join(temp_dir, f"delta-{app_name}")
+    if os.path.exists(staged_path):
+        shutil.rmtree(staged_path)
+    os.makedirs(staged_path)
+
+    try:
+        for entry in files:
+            source = reuse.get(entry['path'])
+            if source is not None:
+                target = os.path.join(staged_path, *entry['path'].split('/'))
+                _place_existing(source, target, bool(entry.get('executable')))
+
+        if fetch:
+            from tqdm import tqdm
+
+            base_url = files_url.rstrip('/')
+            with tqdm(total=fetch_bytes, unit='B', unit_scale=True, ncols=80,
+                      desc=f"📦 {app_name} ({len(fetch)} dosya)") as bar:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(jobs, len(fetch)))) as executor:
+                    futures = [
+                        executor.submit(_download_file, f"{base_url}/{quote(entry['path'])}",
+                                        os.path.join(staged_path, *entry['path'].split('/')), entry, bar)
+                        for entry in fetch
+                    ]
+                    for future in futures:
+                        future.result()
+
+        write_file_manifest(staged_path, files, app_info.get('version'))
+    except Exception as e:
+        shutil.rmtree(staged_path, ignore_errors=True)
+        return False, f"Delta hazırlanamadı: {e}"
+
+    print(f"♻️  {len(reuse)} dosya kurulu sürümden alındı, {len(fetch)} dosya indirildi ({fetch_bytes} byte)")
+    return True, staged_path
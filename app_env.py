@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+app_env.py - Uygulamaya Özel Python Ortamları
+
+Bu modül Python uygulamaları için isteğe bağlı izole ortamlar kurar:
+- Her uygulama için ~/.clapp/envs/<app> altında bir venv (pip'siz, hızlı)
+- Bağımlılık wheel'leri ~/.clapp/cache/wheels altında içerik adresli
+  (sha256) depoda bir kez saklanır ve bir kez açılır
+- Açılmış wheel dosyaları venv'in site-packages dizinine hardlink ile
+  bağlanır; 10 uygulama aynı requests sürümünü kullansa da disk üzerinde
+  tek kopya bulunur
+- Gereksinim kümesinin çözümü (hangi wheel'ler) depoda kaydedilir; aynı
+  gereksinimlere sahip sonraki uygulamalar için pip hiç çalıştırılmaz
+
+Ayarlar:
+    CLAPP_WHEEL_DIR  Yerel wheel dizini; verilirse pip ağa çıkmaz
+                     (--no-index --find-links), çevrimdışı kurulum için
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import sysconfig
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Tuple, Optional, List, Dict, Any
+
+from platform_utils import run_command_safely, is_windows
+
+ENV_METADATA_FILE = "clapp-env.json"
+
+# Sürümü sabitlenmemiş gereksinimlerin çözümü bu süreden sonra pip ile yenilenir
+RESOLUTION_MAX_AGE = 24 * 60 * 60
+
+
+def get_envs_directory() -> str:
+    """Uygulama ortamlarının bulunduğu dizini döndürür"""
+    return str(Path.home() / ".clapp" / "envs")
+
+
+def get_wheel_store_directory() -> str:
+    """İçerik adresli wheel deposunun dizinini döndürür"""
+    return str(Path.home() / ".clapp" / "cache" / "wheels")
+
+
+def get_env_path(app_name: str) -> str:
+    """Uygulamanın ortam dizinini döndürür"""
+    return os.path.join(get_envs_directory(), app_name)
+
+
+def get_env_python(env_path: str) -> str:
+    """venv içindeki Python yorumlayıcısının yolunu döndürür"""
+    if is_windows():
+        return os.path.join(env_path, "Scripts", "python.exe")
+    return os.path.join(env_path, "bin", "python")
+
+
+def get_env_site_packages(env_path: str) -> str:
+    """venv'in site-packages dizinini döndürür"""
+    if is_windows():
+        return os.path.join(env_path, "Lib", "site-packages")
+    version = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    return os.path.join(env_path, "lib", version, "site-packages")
+
+
+def get_app_python(app_name: str) -> Optional[str]:
+    """
+    Uygulamanın izole ortamı varsa yorumlayıcı yolunu döndürür
+
+    Returns:
+        Yorumlayıcı yolu veya None (ortam yoksa)
+    """
+    env_path = get_env_path(app_name)
+    python_path = get_env_python(env_path)
+    if os.path.exists(os.path.join(env_path, ENV_METADATA_FILE)) and os.path.exists(python_path):
+        return python_path
+    return None
+
+
+def _file_sha256(file_path: str) -> str:
+    from file_hasher import hash_file
+    return hash_file(file_path)
+
+
+def _link_or_copy(source: str, target: str):
+    """Dosyayı hardlink ile bağlar; desteklenmiyorsa kopyalar"""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class WheelStore:
+    """İçerik adresli wheel deposu"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or get_wheel_store_directory()
+
+    def _entry_dir(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _resolution_path(self, key: str) -> str:
+        return os.path.join(self.root, "resolved", f"{key}.json")
+
+    def lookup_resolution(self, key: str, max_age: Optional[int] = RESOLUTION_MAX_AGE) -> Optional[List[Tuple[str, str]]]:
+        """
+        Gereksinim kümesi için kaydedilmiş wheel listesini döndürür
+
+        Args:
+            key: resolution_key değeri
+            max_age: Kaydın en fazla yaşı (None: süresiz)
+
+        Returns:
+            [(wheel_adı, sha256), ...] veya None (kayıt yok, eski ya da wheel eksik)
+        """
+        try:
+            with open(self._resolution_path(key), 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            if max_age is not None and time.time() - record["created"] > max_age:
+                return None
+            wheels = [(item["file"], item["sha256"]) for item in record["wheels"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        for wheel_name, digest in wheels:
+            if not os.path.exists(os.path.join(self._entry_dir(digest), wheel_name)):
+                return None
+        return wheels
+
+    def save_resolution(self, key: str, wheels: List[Tuple[str, str]]):
+        """Gereksinim kümesinin çözümünü (wheel adı, sha256) kaydeder"""
+        path = self._resolution_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"created": time.time(),
+                       "wheels": [{"file": name, "sha256": digest} for name, digest in wheels]}, f)
+        os.replace(temp_path, path)
+
+    def add(self, wheel_path: str) -> str:
+        """
+        Wheel'i depoya ekler (aynı içerik varsa tekrar saklanmaz)
+
+        Returns:
+            Wheel'in sha256 değeri
+        """
+        digest = _file_sha256(wheel_path)
+        entry_dir = self._entry_dir(digest)
+        stored_wheel = os.path.join(entry_dir, os.path.basename(wheel_path))
+
+        if not os.path.exists(stored_wheel):
+            os.makedirs(entry_dir, exist_ok=True)
+            temp_path = f"{stored_wheel}.{os.getpid()}.tmp"
+            shutil.copy2(wheel_path, temp_path)
+            os.replace(temp_path, stored_wheel)
+
+        return digest
+
+    def unpacked(self, digest: str) -> str:
+        """
+        Wheel'in açılmış içerik dizinini döndürür; ilk istekte bir kez açılır
+
+        Returns:
+            Açılmış içerik dizini
+        """
+        entry_dir = self._entry_dir(digest)
+        unpacked_dir = os.path.join(entry_dir, "unpacked")
+        if os.path.isdir(unpacked_dir):
+            return unpacked_dir
+
+        wheels = [name for name in os.listdir(entry_dir) if name.endswith(".whl")]
+        if not wheels:
+            raise FileNotFoundError(f"Depoda wheel bulunamadı: {digest}")
+
+        # Önce geçici dizine aç, sonra rename ile yerine koy (yarım açılmış içerik kalmasın)
+        temp_dir = tempfile.mkdtemp(prefix="unpack-", dir=entry_dir)
+        try:
+            with zipfile.ZipFile(os.path.join(entry_dir, wheels[0])) as wheel:
+                root = os.path.realpath(temp_dir)
+                for member in wheel.namelist():
+                    target = os.path.realpath(os.path.join(temp_dir, member))
+                    if os.path.commonpath([root, target]) != root:
+                        raise ValueError(f"Güvenli olmayan wheel girdisi: {member}")
+                wheel.extractall(temp_dir)
+            try:
+                os.rename(temp_dir, unpacked_dir)
+            except OSError:
+                # Başka bir süreç aynı anda açtıysa onunkini kullan
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        return unpacked_dir
+
+
+def _link_tree(source_dir: str, target_dir: str):
+    """source_dir altındaki dosyaları target_dir'e hardlink ile bağlar"""
+    for dirpath, dirnames, filenames in os.walk(source_dir):
+        relative = os.path.relpath(dirpath, source_dir)
+        destination = target_dir if relative == "." else os.path.join(target_dir, relative)
+        os.makedirs(destination, exist_ok=True)
+        for filename in filenames:
+            target = os.path.join(destination, filename)
+            if os.path.lexists(target):
+                os.remove(target)
+            _link_or_copy(os.path.join(dirpath, filename), target)
+
+
+def _install_scripts(scripts_dir: str, env_path: str):
+    """Wheel'in .data/scripts dosyalarını venv'e kopyalar (shebang venv'e çevrilir)"""
+    bin_dir = os.path.dirname(get_env_python(env_path))
+    python_path = get_env_python(env_path)
+    for filename in os.listdir(scripts_dir):
+        source = os.path.join(scripts_dir, filename)
+        target = os.path.join(bin_dir, filename)
+        with open(source, 'rb') as f:
+            content = f.read()
+        if content.startswith(b"#!python"):
+            content = b"#!" + python_path.encode() + content[len(b"#!python"):]
+        with open(target, 'wb') as f:
+            f.write(content)
+        os.chmod(target, 0o755)
+
+
+def link_wheel_into_env(unpacked_dir: str, env_path: str):
+    """
+    Açılmış wheel'i venv'e bağlar
+
+    purelib/platlib içerikleri ve kök dosyalar site-packages'a hardlink'lenir,
+    scripts ise shebang'i düzeltilerek kopyalanır.
+    """
+    site_packages = get_env_site_packages(env_path)
+    os.makedirs(site_packages, exist_ok=True)
+
+    for item in os.listdir(unpacked_dir):
+        source = os.path.join(unpacked_dir, item)
+        if item.endswith(".data") and os.path.isdir(source):
+            for scheme in os.listdir(source):
+                scheme_dir = os.path.join(source, scheme)
+                if scheme in ("purelib", "platlib"):
+                    _link_tree(scheme_dir, site_packages)
+                elif scheme == "scripts":
+                    _install_scripts(scheme_dir, env_path)
+            continue
+
+        if os.path.isdir(source):
+            _link_tree(source, os.path.join(site_packages, item))
+        else:
+            target = os.path.join(site_packages, item)
+            if os.path.lexists(target):
+                os.remove(target)
+            _link_or_copy(source, target)
+
+
+def collect_requirements(app_path: str, manifest: Dict[str, Any]) -> Tuple[List[str], Optional[str]]:
+    """
+    Uygulamanın pip gereksinimlerini toplar
+
+    Gereksinimler clapp uygulama adlarıyla filtrelenmez (bkz.
+    dependency_resolver.check_and_install_python_dependencies).
+
+    Returns:
+        (gereksinimler, requirements.txt yolu veya None)
+    """
+    from dependency_resolver import parse_requirement
+
+    requirements = []
+    for dependency in manifest.get('dependencies', []) or []:
+        if not isinstance(dependency, str):
+            continue
+        if parse_requirement(dependency) is not None:
+            requirements.append(dependency)
+
+    requirements_txt = os.path.join(app_path, "requirements.txt")
+    return requirements, requirements_txt if os.path.exists(requirements_txt) else None
+
+
+def build_wheels(requirements: List[str], requirements_txt: Optional[str], wheel_dir: str,
+                 find_links: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Gereksinimlerin tüm bağımlılık kapanışı için wheel'leri tek pip çağrısıyla hazırlar
+
+    Args:
+        requirements: Gereksinim ifadeleri
+        requirements_txt: requirements.txt yolu
+        wheel_dir: Wheel'lerin yazılacağı dizin
+        find_links: Yerel wheel dizini (verilirse ağa çıkılmaz)
+
+    Returns:
+        (success, message)
+    """
+    command = [sys.executable, "-m", "pip", "wheel", "--wheel-dir", wheel_dir,
+               "--disable-pip-version-check", "--quiet"]
+    if find_links:
+        command += ["--no-index", "--find-links", find_links]
+    command += requirements
+    if requirements_txt:
+        command += ["-r", requirements_txt]
+
+    try:
+        result = run_command_safely(command, capture_output=True, text=True,
+                                    timeout=180 + 30 * len(requirements))
+    except Exception as e:
+        return False, f"pip çalıştırılamadı: {e}"
+
+    if result.returncode != 0:
+        error_lines = (result.stderr or result.stdout or "").strip().splitlines()
+        return False, f"Wheel hazırlanamadı: {' '.join(error_lines[-3:])}"
+
+    return True, "Wheel'ler hazırlandı"
+
+
+def resolution_key(requirements: List[str], requirements_txt: Optional[str],
+                   find_links: Optional[str] = None) -> str:
+    """Gereksinim kümesinin yorumlayıcı ve platforma göre çözüm anahtarı"""
+    hasher = hashlib.sha256()
+    parts = [sys.implementation.name, f"{sys.version_info.major}.{sys.version_info.minor}",
+             sysconfig.get_platform(), find_links or ""]
+    parts += sorted(requirements)
+    for part in parts:
+        hasher.update(part.encode('utf-8') + b"\0")
+    if requirements_txt:
+        with open(requirements_txt, 'rb') as f:
+            hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def resolve_wheels(requirements: List[str], requirements_txt: Optional[str], store: WheelStore,
+                   find_links: Optional[str] = None) -> Tuple[bool, str, List[Tuple[str, str]]]:
+    """
+    Gereksinimlerin wheel'lerini depodan bulur; yoksa pip ile hazırlayıp depoya ekler
+
+    Returns:
+        (success, message, [(wheel_adı, sha256), ...])
+    """
+    if not requirements and not requirements_txt:
+        return True, "Gereksinim yok", []
+
+    # Tamamen sabitlenmiş (==) gereksinimlerin çözümü değişmez
+    pinned = not requirements_txt and all("==" in requirement for requirement in requirements)
+    key = resolution_key(requirements, requirements_txt, find_links)
+    wheels = store.lookup_resolution(key, None if pinned else RESOLUTION_MAX_AGE)
+    if wheels is not None:
+        return True, "Wheel'ler depodan alındı", wheels
+
+    wheels = []
+    with tempfile.TemporaryDirectory() as wheel_dir:
+        success, message = build_wheels(requirements, requirements_txt, wheel_dir, find_links)
+        if not success:
+            return False, message, []
+        for wheel_name in sorted(os.listdir(wheel_dir)):
+            if wheel_name.endswith(".whl"):
+                wheels.append((wheel_name, store.add(os.path.join(wheel_dir, wheel_name))))
+
+    store.save_resolution(key, wheels)
+    return True, message, wheels
+
+
+def _fix_bin_scripts(env_path: str, old_path: str):
+    """venv geçici dizinde kurulduğu için betiklerdeki (activate, shebang) yolu düzeltir"""
+    bin_dir = os.path.dirname(get_env_python(env_path))
+    for filename in os.listdir(bin_dir):
+        script = os.path.join(bin_dir, filename)
+        if os.path.islink(script) or not os.path.isfile(script):
+            continue
+        try:
+            with open(script, 'r', encoding='utf-8') as f:
+                content = f.read()
+            if old_path in content:
+                with open(script, 'w', encoding='utf-8') as f:
+                    f.write(content.replace(old_path, env_path))
+        except (OSError, UnicodeDecodeError):
+            continue
+
+
+def create_app_env(app_name: str, app_path: str, find_links: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Uygulama için izole venv oluşturur ve bağımlılıklarını wheel deposundan bağlar
+
+    Args:
+        app_name: Uygulama adı
+        app_path: Kurulu uygulama dizini
+        find_links: Yerel wheel dizini (varsayılan: CLAPP_WHEEL_DIR)
+
+    Returns:
+        (success, message)
+    """
+    import venv
+
+    manifest_path = os.path.join(app_path, "manifest.json")
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        return False, f"Manifest okunamadı: {e}"
+
+    if manifest.get('language') != 'python':
+        return False, "İzole ortam sadece Python uygulamaları için desteklenir"
+
+    find_links = find_links or os.environ.get("CLAPP_WHEEL_DIR") or None
+    requirements, requirements_txt = collect_requirements(app_path, manifest)
+    store = WheelStore()
+
+    env_path = get_env_path(app_name)
+    os.makedirs(get_envs_directory(), exist_ok=True)
+    staging_path = tempfile.mkdtemp(prefix=f".{app_name}-", dir=get_envs_directory())
+
+    try:
+        # 1. pip'siz venv (hızlı); paketler wheel deposundan bağlanır
+        venv.EnvBuilder(with_pip=False, symlinks=not is_windows(), clear=True).create(staging_path)
+
+        # 2. Wheel'leri depodan bul; yoksa pip ile hazırla ve depoya ekle
+        success, message, digests = resolve_wheels(requirements, requirements_txt, store, find_links)
+        if not success:
+            return False, message
+
+        # 3. Açılmış wheel'leri site-packages'a hardlink'le
+        for wheel_name, digest in digests:
+            link_wheel_into_env(store.unpacked(digest), staging_path)
+
+        metadata = {
+            "app": app_name,
+            "python": sys.version.split()[0],
+            "requirements": requirements,
+            "wheels": [{"file": wheel_name, "sha256": digest} for wheel_name, digest in digests],
+        }
+        with open(os.path.join(staging_path, ENV_METADATA_FILE), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+
+        # 4. Hazır ortamı yerine koy
+        if os.path.exists(env_path):
+            shutil.rmtree(env_path)
+        os.rename(staging_path, env_path)
+        _fix_bin_scripts(env_path, staging_path)
+        staging_path = None
+
+        return True, f"İzole ortam hazır: {env_path} ({len(digests)} paket)"
+
+    except Exception as e:
+        return False, f"İzole ortam oluşturulamadı: {e}"
+    finally:
+        if staging_path and os.path.exists(staging_path):
+            shutil.rmtree(staging_path, ignore_errors=True)
+
+
+def remove_app_env(app_name: str) -> bool:
+    """Uygulamanın izole ortamını siler (yoksa False)"""
+    env_path = get_env_path(app_name)
+    if not os.path.isdir(env_path):
+        return False
+    shutil.rmtree(env_path, ignore_errors=True)
+    return True
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+app_staging.py - Aşamalı (staged) Kurulum ve Atomik Değiştirme
+
+Bu modül uygulama kurulum ve güncellemelerinin yarım kalmamasını sağlar:
+- Yeni sürüm ~/.clapp/staging altında (apps ile aynı dosya sisteminde) hazırlanır
+- Hazır klasör rename ile ~/.clapp/apps/<app> yerine konur (kopyalama yok)
+- Eski sürüm önce ~/.clapp/trash altına taşınır, sonra arka planda silinir;
+  süreç kapanırken silme en fazla TRASH_JOIN_TIMEOUT saniye beklenir, yarım
+  kalanlar bir sonraki kurulum veya güncellemede cleanup_stale_staging()
+  tarafından silinir
+- Değiştirme sırasında yazılan günlük dosyası sayesinde yarıda kesilen bir
+  işlem bir sonraki çalıştırmada geri alınır; uygulama hiçbir zaman yarım
+  veya eksik kalmaz
+"""
+
+import os
+import json
+import time
+import uuid
+import atexit
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Tuple
+
+# Bu süreden eski staging klasörleri yarıda kalmış sayılır ve silinir
+STALE_STAGING_SECONDS = 6 * 60 * 60
+
+# Süreç kapanırken arka plandaki silmeler için beklenen en uzun süre (saniye)
+TRASH_JOIN_TIMEOUT = 5.0
+
+_removals = []
+_removals_lock = threading.Lock()
+
+
+def get_clapp_directory() -> str:
+    return str(Path.home() / ".clapp")
+
+
+def get_apps_directory() -> str:
+    """Uygulamaların kurulu olduğu dizini döndürür"""
+    return os.path.join(get_clapp_directory(), "apps")
+
+
+def get_staging_root() -> str:
+    """Kurulumların hazırlandığı dizini döndürür (yoksa oluşturur)"""
+    path = os.path.join(get_clapp_directory(), "staging")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_trash_root() -> str:
+    """Silinmeyi bekleyen eski sürümlerin dizinini döndürür (yoksa oluşturur)"""
+    path = os.path.join(get_clapp_directory(), "trash")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def remove_tree_async(path: str) -> threading.Thread:
+    """
+    Dizini arka planda siler
+
+    Thread'ler daemon'dur; süreç kapanırken join_pending_removals() ile en
+    fazla TRASH_JOIN_TIMEOUT saniye beklenir. Bitmeyen silme kapanışta
+    kesilir ve kalan dizin bir sonraki cleanup_stale_staging() çağrısında
+    temizlenir.
+    """
+    thread = threading.Thread(target=shutil.rmtree, args=(path,),
+                              kwargs={"ignore_errors": True}, daemon=True)
+    with _removals_lock:
+        _removals[:] = [pending for pending in _removals if pending.is_alive()]
+        _removals.append(thread)
+    thread.start()
+    return thread
+
+
+def join_pending_removals(timeout: float = TRASH_JOIN_TIMEOUT):
+    """Arka plandaki silmelerin bitmesini toplam en fazla timeout saniye bekler"""
+    deadline = time.monotonic() + timeout
+    with _removals_lock:
+        pending = list(_removals)
+    for thread in pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        thread.join(remaining)
+
+
+atexit.register(join_pending_removals)
+
+
+def _journal_path(app_name: str, staging_id: str) -> str:
+    # Aynı uygulamanın eş zamanlı kurulumları ayrı günlük yazar
+    return os.path.join(get_staging_root(), f"{app_name}-{staging_id}.swap.json")
+
+
+def _write_journal(path: str, data: dict):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def stage_tree(source_path: str, app_name: str) -> str:
+    """
+    Kaynak klasörü staging alanına koyar
+
+    Kaynak zaten apps ile aynı dosya sistemindeyse sadece taşınır (rename),
+    değilse staging alanına bir kez kopyalanır.
+
+    Returns:
+        Staging içindeki klasörün yolu
+    """
+    staged_path = os.path.join(get_staging_root(), f"{app_name}-{uuid.uuid4().hex[:12]}")
+    try:
+        os.rename(source_path, staged_path)
+    except OSError:
+        shutil.copytree(source_path, staged_path, symlinks=True)
+    return staged_path
+
+
+def swap_in_app(app_name: str, source_path: str, move_source: bool = True) -> Tuple[bool, str]:
+    """
+    Hazırlanan uygulama klasörünü ~/.clapp/apps/<app_name> yerine koyar
+
+    Args:
+        app_name: Uygulama adı
+        source_path: Yeni sürümün klasörü
+        move_source: True ise kaynak taşınabilir (rename); False ise kopyalanır
+
+    Returns:
+        (success, message)
+    """
+    apps_dir = get_apps_directory()
+    os.makedirs(apps_dir, exist_ok=True)
+    target_path = os.path.join(apps_dir, app_name)
+
+    if os.path.dirname(os.path.abspath(target_path)) != os.path.abspath(apps_dir):
+        return False, "Güvenlik hatası: Geçersiz uygulama adı"
+
+    try:
+        if move_source:
+            staged_path = stage_tree(source_path, app_name)
+        else:
+            staged_path = os.path.join(get_staging_root(), f"{app_name}-{uuid.uuid4().hex[:12]}")
+            shutil.copytree(source_path, staged_path, symlinks=True)
+    except Exception as e:
+        return False, f"Staging hatası: {e}"
+
+    old_path = None
+    if os.path.exists(target_path):
+        old_path = os.path.join(get_trash_root(), f"{app_name}-{uuid.uuid4().hex[:12]}")
+
+    # Günlük: yarıda kesilirse recover_interrupted_swaps() eski sürümü geri koyar.
+    # Adı staging klasörünün benzersiz kimliğini taşır
+    journal_path = _journal_path(app_name, os.path.basename(staged_path).rsplit("-", 1)[-1])
+    _write_journal(journal_path, {"target": target_path, "staged": staged_path,
+                                  "old": old_path, "started_at": time.time()})
+    try:
+        if old_path:
+            os.rename(target_path, old_path)
+        try:
+            os.rename(staged_path, target_path)
+        except OSError:
+            if old_path:
+                os.rename(old_path, target_path)
+            raise
+    except Exception as e:
+        if old_path and not os.path.exists(target_path):
+            # Geri alma da başarısız: eski sürüm çöp kutusunda duruyor.
+            # Günlük ve staging klasörü recover_interrupted_swaps() için bırakılır
+            return False, (f"Uygulama yerine konamadı: {e}. Eski sürüm {old_path} konumunda; "
+                           f"bir sonraki clapp çalıştırmasında geri yüklenecek")
+        shutil.rmtree(staged_path, ignore_errors=True)
+        os.remove(journal_path)
+        return False, f"Uygulama yerine konamadı: {e}"
+
+    os.remove(journal_path)
+
+    if old_path:
+        remove_tree_async(old_path)
+        return True, f"Mevcut {app_name} yeni sürümle değiştirildi"
+    return True, f"{app_name} yerine kondu"
+
+
+def recover_interrupted_swaps():
+    """Yarıda kalan değiştirme işlemlerini günlüklerden tamamlar veya geri alır"""
+    staging_root = get_staging_root()
+    for name in os.listdir(staging_root):
+        if not name.endswith(".swap.json"):
+            continue
+        journal = os.path.join(staging_root, name)
+        try:
+            with open(journal, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            target, staged, old = data["target"], data["staged"], data.get("old")
+
+            # Başka bir süreçte hâlâ sürüyor olabilir (değiştirme milisaniyeler sürer)
+            if time.time() - data.get("started_at", 0) < 60:
+                continue
+
+            if not os.path.exists(target) and old and os.path.exists(old):
+                # Eski sürüm taşınmış ama yenisi konamamış: geri al
+                os.rename(old, target)
+            elif old and os.path.exists(old):
+                remove_tree_async(old)
+
+            if os.path.exists(staged):
+                shutil.rmtree(staged, ignore_errors=True)
+            os.remove(journal)
+        except Exception:
+            continue
+
+
+def cleanup_stale_staging(max_age: int = STALE_STAGING_SECONDS):
+    """
+    Yarım kalan işlemleri kurtarır, çöp kutusunu ve eski staging klasörlerini siler
+
+    Kurulum başında çağrılır; hatalar kurulumu etkilemez.
+    """
+    try:
+        recover_interrupted_swaps()
+
+        # Henüz kurtarılmamış günlüklerin eski sürümleri silinmez
+        pending = set()
+        staging_root = get_staging_root()
+        for name in os.listdir(staging_root):
+            if name.endswith(".swap.json"):
+                try:
+                    with open(os.path.join(staging_root, name), 'r', encoding='utf-8') as f:
+                        old = json.load(f).get("old")
+                    if old:
+                        pending.add(os.path.abspath(old))
+                except (OSError, ValueError, AttributeError):
+                    continue
+
+        trash_root = get_trash_root()
+        for name in os.listdir(trash_root):
+            path = os.path.join(trash_root, name)
+            if os.path.abspath(path) not in pending:
+                remove_tree_async(path)
+
+        now = time.time()
+        for name in os.listdir(staging_root):
+            path = os.path.join(staging_root, name)
+            try:
+                if now - os.path.getmtime(path) < max_age:
+                    continue
+                if os.path.isdir(path):
+                    remove_tree_async(path)
+                else:
+                    os.remove(path)
+            except OSError:
+                continue
+    except Exception:
+        pass
+
+
+def staging_workspace() -> tempfile.TemporaryDirectory:
+    """
+    Staging alanında geçici çalışma dizini döndürür
+
+    İndirme ve çıkarma bu dizinde yapılırsa hazırlanan klasör apps ile aynı
+    dosya sisteminde olur ve yerine koyma tek bir rename işlemidir.
+    """
+    cleanup_stale_staging()
+    return tempfile.TemporaryDirectory(prefix="work-", dir=get_staging_root())
@@ -4,13 +4,56 @@ build_index.py - clapp Index Builder Script
 
 Bu script packages/ klasörünü tarayarak tüm uygulamaların metadata'sını
 index.json dosyasına toplar. Publish işlemlerinden sonra otomatik çalışır.
+
+Her uygulama için ayrıca artifacts/ altına tek başına indirilebilen bir
+arşiv ({name}-{version}.tar.gz) üretilir; URL, boyut ve sha256 bilgisi
+index.json'a yazılır. Böylece istemciler tüm paket deposunu değil sadece
+kurulacak uygulamanın arşivini indirir.
+
+Uygulama klasörlerinin parmak izleri (dosya stat'ları ve içerik hash'leri)
+index.json'un yanındaki .build_index_cache.json dosyasında tutulur; sadece
+değişen uygulamalar yeniden okunur ve arşivlenir, bunlar da işçi havuzunda
+paralel işlenir. Tek bir uygulama yayınlanırken sadece onun klasörüne
+bakmak için: --only <klasör>. Tam tarama için: --no-cache
+
+Uygulamanın dosya listesi (yol, boyut, sha256) arşivin yanına
+{name}-{version}.files.json olarak yazılır; index girdisi sadece bu
+listenin URL'sini ve sha256'sını, ayrıca dosyaların tek tek
+indirilebileceği files_url adresini içerir. İstemciler listeyi sadece
+güncellenen uygulama için indirir ve değişen dosyaları çeker (bkz. app_delta.py).
 """
 
 import os
 import json
 import sys
+import gzip
+import tarfile
+import hashlib
+import argparse
+import concurrent.futures
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+# Per-app arşivlerin yayınlandığı varsayılan adres
+DEFAULT_ARTIFACTS_DIR = "artifacts"
+DEFAULT_ARTIFACT_BASE_URL = "https://raw.githubusercontent.com/mburakmmm/clapp-packages/main/artifacts"
+
+# Uygulama dosyalarının tek tek indirilebildiği varsayılan adres ({base}/{klasör}/{yol})
+DEFAULT_FILES_BASE_URL = "https://raw.githubusercontent.com/mburakmmm/clapp-packages/main/packages"
+
+# Arşive alınmayacak dosya ve klasörler
+ARTIFACT_EXCLUDES = {'.git', '__pycache__', '.DS_Store', '.venv', 'node_modules', '.clapp-files.json'}
+
+# Uygulama parmak izi cache'i (index.json'un yanında tutulur)
+BUILD_CACHE_FILE = ".build_index_cache.json"
+BUILD_CACHE_FORMAT = 3
+
+# index.json girdilerinin alan sırası
+INDEX_FIELD_ORDER = (
+    'name', 'version', 'language', 'description', 'entry', 'dependencies',
+    'folder', 'repo_url', 'subdir', 'artifact_url', 'artifact_size', 'artifact_sha256',
+    'files_url', 'files_manifest_url', 'files_manifest_sha256',
+)
 
 def load_manifest(app_path: str) -> Dict[str, Any]:
     """Uygulama klasöründen manifest.json yükler"""
@@ -36,72 +79,384 @@ def validate_manifest(manifest: Dict[str, Any], app_name: str) -> bool:
     
     return True
 
-def scan_packages_directory(packages_dir: str = "./packages") -> List[Dict[str, Any]]:
-    """packages klasörünü tarayarak tüm uygulamaları bulur"""
+def _iter_app_files(app_path: str) -> List[str]:
+    """Arşive girecek dosyaların göreli yollarını sıralı olarak döndürür"""
+    files = []
+    for root, dirs, filenames in os.walk(app_path):
+        dirs[:] = sorted(d for d in dirs if d not in ARTIFACT_EXCLUDES)
+        for filename in sorted(filenames):
+            if filename in ARTIFACT_EXCLUDES or filename.endswith(('.pyc', '.pyo')):
+                continue
+            full_path = os.path.join(root, filename)
+            files.append(os.path.relpath(full_path, app_path).replace(os.sep, '/'))
+    return files
+
+def build_app_artifact(app_path: str, app_name: str, version: str, artifacts_dir: str) -> Dict[str, Any]:
+    """
+    Uygulama klasöründen tekrar üretilebilir bir .tar.gz arşivi oluşturur.
+    
+    Arşiv içindeki dosyalar '{app_name}/...' altında tutulur. Zaman damgası,
+    sahiplik ve sıralama sabitlendiği için aynı içerik her zaman aynı
+    sha256 değerini üretir.
+    
+    Returns:
+        {'file', 'size', 'sha256'}
+    """
+    os.makedirs(artifacts_dir, exist_ok=True)
+    artifact_name = f"{app_name}-{version}.tar.gz"
+    artifact_path = os.path.join(artifacts_dir, artifact_name)
+    
+    with open(artifact_path, 'wb') as raw:
+        with gzip.GzipFile(filename="", mode='wb', fileobj=raw, mtime=0) as gz:
+            with tarfile.open(fileobj=gz, mode='w', format=tarfile.PAX_FORMAT) as tar:
+                for rel_path in _iter_app_files(app_path):
+                    full_path = os.path.join(app_path, rel_path)
+                    info = tarfile.TarInfo(name=f"{app_name}/{rel_path}")
+                    info.size = os.path.getsize(full_path)
+                    info.mtime = 0
+                    info.mode = 0o755 if os.access(full_path, os.X_OK) else 0o644
+                    info.uid = info.gid = 0
+                    info.uname = info.gname = ""
+                    with open(full_path, 'rb') as f:
+                        tar.addfile(info, f)
+    
+    from file_hasher import hash_file
+    
+    return {
+        'file': artifact_name,
+        'size': os.path.getsize(artifact_path),
+        'sha256': hash_file(artifact_path)
+    }
+
+def _tree_signature(app_path: str, files: List[str]) -> str:
+    """Dosya adları, boyutları, mtime'ları ve çalıştırma izinlerinden özet üretir (içerik okunmaz)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for rel_path in files:
+        st = os.stat(os.path.join(app_path, rel_path))
+        digest.update(f"{rel_path}\0{st.st_size}\0{st.st_mtime_ns}\0{int(bool(st.st_mode & 0o111))}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def build_file_manifest(app_path: str, files: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Uygulamanın dosya listesini yol, boyut ve sha256 ile döndürür
+    
+    Çalıştırılabilir dosyalarda ayrıca 'executable': True bulunur.
+    """
+    # Bu yola ancak stat'lar değiştiğinde gelinir; kalıcı hash cache'i isabet etmeyeceği için kullanılmaz
+    from file_hasher import compute_file_hash
+    
+    if files is None:
+        files = _iter_app_files(app_path)
+    
+    manifest = []
+    for rel_path in files:
+        path = os.path.join(app_path, rel_path)
+        entry = {'path': rel_path, 'size': os.path.getsize(path), 'sha256': compute_file_hash(path)}
+        if os.access(path, os.X_OK):
+            entry['executable'] = True
+        manifest.append(entry)
+    return manifest
+
+def _content_signature(file_manifest: List[Dict[str, Any]]) -> str:
+    """Dosya adları, içerik hash'leri ve çalıştırma izinlerinden özet üretir"""
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in file_manifest:
+        executable = int(bool(entry.get('executable')))
+        digest.update(f"{entry['path']}\0{entry['sha256']}\0{executable}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def build_files_manifest_artifact(app_name: str, version: str, file_manifest: List[Dict[str, Any]],
+                                  artifacts_dir: str) -> Dict[str, Any]:
+    """
+    Dosya listesini arşivin yanına {app_name}-{version}.files.json olarak yazar
+    
+    Returns:
+        {'file', 'size', 'sha256'}
+    """
+    from app_delta import encode_file_manifest
+    
+    os.makedirs(artifacts_dir, exist_ok=True)
+    manifest_name = f"{app_name}-{version}.files.json"
+    data = encode_file_manifest(file_manifest, version)
+    _write_if_changed(os.path.join(artifacts_dir, manifest_name), data)
+    return {'file': manifest_name, 'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+
+def build_app_entry(app_path: str, app_name: str,
+                    artifacts_dir: Optional[str] = None,
+                    file_manifest: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Tek bir uygulama klasöründen index girdisini (ve istenirse arşivini) üretir
+    
+    Args:
+        file_manifest: Önceden hesaplanmış dosya listesi (None ise hesaplanır)
+    
+    Returns:
+        Index girdisi; manifest geçersizse None
+    
+    Raises:
+        FileNotFoundError, ValueError: manifest.json okunamazsa
+    """
+    manifest = load_manifest(app_path)
+    
+    # Manifest'i doğrula
+    if not validate_manifest(manifest, app_name):
+        return None
+    
+    # Index için gerekli alanları çıkar
+    app_info = {
+        'name': manifest['name'],
+        'version': manifest['version'],
+        'language': manifest['language'],
+        'description': manifest['description'],
+        'entry': manifest['entry'],
+        'dependencies': manifest.get('dependencies', []),
+        'folder': app_name,
+        'repo_url': f"https://github.com/mburakmmm/clapp-packages",
+        'subdir': app_name
+    }
+    
+    # Per-app arşiv ve delta güncellemeler için ayrı yayınlanan dosya listesi
+    if artifacts_dir:
+        artifact = build_app_artifact(app_path, manifest['name'], manifest['version'], artifacts_dir)
+        app_info['artifact_file'] = artifact['file']
+        app_info['artifact_size'] = artifact['size']
+        app_info['artifact_sha256'] = artifact['sha256']
+        
+        if file_manifest is None:
+            file_manifest = build_file_manifest(app_path)
+        files_manifest = build_files_manifest_artifact(manifest['name'], manifest['version'],
+                                                       file_manifest, artifacts_dir)
+        app_info['files_manifest_file'] = files_manifest['file']
+        app_info['files_manifest_size'] = files_manifest['size']
+        app_info['files_manifest_sha256'] = files_manifest['sha256']
+    
+    return app_info
+
+def load_build_cache(cache_file: Optional[str]) -> Dict[str, Any]:
+    """Uygulama parmak izi cache'ini yükler; biçim tanınmazsa boş döner"""
+    if not cache_file:
+        return {}
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('format') != BUILD_CACHE_FORMAT:
+        return {}
+    return data.get('apps', {})
+
+def save_build_cache(cache_file: Optional[str], apps: Dict[str, Any]):
+    """Uygulama parmak izi cache'ini sıralı ve atomik olarak yazar"""
+    if not cache_file:
+        return
+    data = json.dumps({'format': BUILD_CACHE_FORMAT, 'apps': apps}, sort_keys=True, ensure_ascii=False,
+                      separators=(',', ':'))
+    _write_if_changed(cache_file, data.encode('utf-8'))
+
+def _write_if_changed(path: str, data: bytes) -> bool:
+    """İçerik değiştiyse dosyayı atomik olarak yazar; değişmediyse dokunmaz"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return True
+
+def _cached_entry(cached: Optional[Dict[str, Any]], artifacts_dir: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Cache kaydı bu çalıştırma için kullanılabiliyorsa index girdisini döndürür"""
+    if not cached or not cached.get('app'):
+        return None
+    app_info = dict(cached['app'])
+    if artifacts_dir:
+        # Arşiv ve dosya listesi cache'te olmalı ve diskte aynı boyutta durmalı
+        for file_key, size_key in (('artifact_file', 'artifact_size'),
+                                   ('files_manifest_file', 'files_manifest_size')):
+            artifact_file = app_info.get(file_key)
+            if not artifact_file:
+                return None
+            try:
+                if os.path.getsize(os.path.join(artifacts_dir, artifact_file)) != app_info.get(size_key):
+                    return None
+            except OSError:
+                return None
+    return app_info
+
+def _process_app(packages_dir: str, app_name: str, cached: Optional[Dict[str, Any]],
+                 artifacts_dir: Optional[str], trust_cache: bool = False) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Uygulamayı değiştiyse yeniden işler
+    
+    Args:
+        trust_cache: True ise cache kaydı dosyalara bakılmadan kullanılır (--only)
+    
+    Returns:
+        (cache kaydı, yeniden işlendi mi)
+    """
+    if trust_cache and _cached_entry(cached, artifacts_dir) is not None:
+        return cached, False
+    
+    app_path = os.path.join(packages_dir, app_name)
+    files = _iter_app_files(app_path)
+    tree = _tree_signature(app_path, files)
+    
+    # 1. Dosyalar stat düzeyinde aynı: hiç okumadan kullan
+    if cached and cached.get('tree') == tree and _cached_entry(cached, artifacts_dir) is not None:
+        return cached, False
+    
+    # 2. Stat değişti (ör. yeni git clone) ama içerik aynı: sadece hash'le
+    file_manifest = build_file_manifest(app_path, files)
+    content = _content_signature(file_manifest)
+    if cached and cached.get('content') == content and _cached_entry(cached, artifacts_dir) is not None:
+        return dict(cached, tree=tree), False
+    
+    # 3. İçerik değişti: manifest'i oku, doğrula, arşivi üret
+    app_info = build_app_entry(app_path, app_name, artifacts_dir, file_manifest)
+    if app_info is None:
+        return None, True
+    return {'tree': tree, 'content': content, 'app': app_info}, True
+
+def scan_packages_directory(packages_dir: str = "./packages",
+                            artifacts_dir: Optional[str] = None,
+                            artifact_base_url: str = DEFAULT_ARTIFACT_BASE_URL,
+                            cache_file: Optional[str] = None,
+                            max_workers: Optional[int] = None,
+                            only: Optional[List[str]] = None,
+                            files_base_url: str = DEFAULT_FILES_BASE_URL) -> List[Dict[str, Any]]:
+    """
+    packages klasörünü tarayarak tüm uygulamaları bulur
+    
+    Değişmeyen uygulamalar parmak izi cache'inden alınır; değişenler
+    işçi havuzunda paralel işlenir.
+    
+    Args:
+        packages_dir: Uygulama klasörlerinin bulunduğu dizin
+        artifacts_dir: Per-app arşivlerin yazılacağı dizin (None ise arşiv üretilmez)
+        artifact_base_url: Arşivlerin indirileceği temel URL
+        cache_file: Parmak izi cache dosyası (None ise cache kullanılmaz)
+        max_workers: İşçi sayısı (varsayılan: min(8, CPU sayısı))
+        only: Verilirse sadece bu klasörler kontrol edilir; diğerlerinin
+            cache kaydı dosyalara bakılmadan kullanılır
+        files_base_url: Uygulama dosyalarının tek tek indirileceği temel URL
+    
+    Returns:
+        Klasör adına göre sıralı index girdileri
+    """
     apps = []
     
     if not os.path.exists(packages_dir):
         print(f"⚠️  packages klasörü bulunamadı: {packages_dir}")
         return apps
     
-    for app_name in os.listdir(packages_dir):
-        app_path = os.path.join(packages_dir, app_name)
-        
-        # Sadece klasörleri işle
-        if not os.path.isdir(app_path):
-            continue
-            
-        # Gizli klasörleri atla
-        if app_name.startswith('.'):
-            continue
-        
-        try:
-            manifest = load_manifest(app_path)
-            
-            # Manifest'i doğrula
-            if not validate_manifest(manifest, app_name):
+    # Sadece klasörler, gizli klasörler hariç; sıralı işlenir
+    app_names = sorted(
+        name for name in os.listdir(packages_dir)
+        if not name.startswith('.') and os.path.isdir(os.path.join(packages_dir, name))
+    )
+    
+    cache = load_build_cache(cache_file)
+    new_cache = {}
+    reused = 0
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+        for app_name in app_names:
+            if only is None or app_name in only:
+                futures[app_name] = executor.submit(_process_app, packages_dir, app_name,
+                                                    cache.get(app_name), artifacts_dir)
+                continue
+            # Kontrol edilmeyecek uygulamalar havuza gönderilmeden cache'ten alınır
+            future = concurrent.futures.Future()
+            try:
+                future.set_result(_process_app(packages_dir, app_name, cache.get(app_name), artifacts_dir, True))
+            except Exception as e:
+                future.set_exception(e)
+            futures[app_name] = future
+        for app_name in app_names:
+            try:
+                entry, processed = futures[app_name].result()
+            except Exception as e:
+                print(f"❌ {app_name}: {e}")
                 continue
             
-            # Index için gerekli alanları çıkar
-            app_info = {
-                'name': manifest['name'],
-                'version': manifest['version'],
-                'language': manifest['language'],
-                'description': manifest['description'],
-                'entry': manifest['entry'],
-                'dependencies': manifest.get('dependencies', []),
-                'folder': app_name,
-                'repo_url': f"https://github.com/mburakmmm/clapp-packages",
-                'subdir': app_name
-            }
+            if entry is None:
+                continue
+            new_cache[app_name] = entry
             
-            apps.append(app_info)
-            print(f"✅ {app_name} (v{manifest['version']}) eklendi")
+            app_info = dict(entry['app'])
+            artifact_file = app_info.pop('artifact_file', None)
+            files_manifest_file = app_info.pop('files_manifest_file', None)
+            if artifacts_dir and artifact_file:
+                app_info['artifact_url'] = f"{artifact_base_url.rstrip('/')}/{artifact_file}"
+            if artifacts_dir and files_manifest_file:
+                app_info['files_manifest_url'] = f"{artifact_base_url.rstrip('/')}/{files_manifest_file}"
+                app_info['files_url'] = f"{files_base_url.rstrip('/')}/{app_info['folder']}"
+            # Sadece INDEX_FIELD_ORDER'daki alanlar yazılır; URL'si olmayan boyut/sha256 atılır
+            if 'artifact_url' not in app_info:
+                app_info.pop('artifact_size', None)
+                app_info.pop('artifact_sha256', None)
+            if 'files_manifest_url' not in app_info:
+                app_info.pop('files_manifest_sha256', None)
+            apps.append({key: app_info[key] for key in INDEX_FIELD_ORDER if key in app_info})
             
-        except Exception as e:
-            print(f"❌ {app_name}: {e}")
-            continue
+            if processed:
+                print(f"✅ {app_name} (v{app_info['version']}) eklendi")
+            else:
+                reused += 1
+    
+    if reused:
+        print(f"♻️  {reused} uygulama değişmedi (cache)")
+    save_build_cache(cache_file, new_cache)
     
     return apps
 
-def generate_index(output_file: str = "index.json") -> bool:
-    """Index.json dosyasını oluşturur"""
+def generate_index(output_file: str = "index.json",
+                   packages_dir: str = "./packages",
+                   artifacts_dir: Optional[str] = DEFAULT_ARTIFACTS_DIR,
+                   artifact_base_url: str = DEFAULT_ARTIFACT_BASE_URL,
+                   use_cache: bool = True,
+                   max_workers: Optional[int] = None,
+                   only: Optional[List[str]] = None,
+                   files_base_url: str = DEFAULT_FILES_BASE_URL) -> bool:
+    """
+    Index.json dosyasını (ve per-app arşivleri) oluşturur
+    
+    Çıktı deterministiktir: aynı girdiler bayt bayt aynı index.json ve
+    search_index.bin üretir; içerik değişmediyse dosyalara dokunulmaz.
+    """
     try:
         print("🔄 packages/ klasörü taranıyor...")
-        apps = scan_packages_directory()
+        output_dir = os.path.dirname(output_file)
+        cache_file = os.path.join(output_dir, BUILD_CACHE_FILE) if use_cache else None
+        apps = scan_packages_directory(packages_dir, artifacts_dir, artifact_base_url, cache_file, max_workers,
+                                       only if use_cache else None, files_base_url)
         
         if not apps:
             print("⚠️  Hiç geçerli uygulama bulunamadı!")
             return False
         
-        # Alfabetik sıralama
-        apps.sort(key=lambda x: x['name'].lower())
+        # Alfabetik sıralama (eşit adlarda klasör adı belirleyicidir)
+        apps.sort(key=lambda x: (x['name'].lower(), x['name'], x['folder']))
         
         # Index.json'u yaz
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(apps, f, indent=2, ensure_ascii=False)
+        index_data = json.dumps(apps, indent=2, ensure_ascii=False).encode('utf-8')
+        if _write_if_changed(output_file, index_data):
+            print(f"✅ {output_file} başarıyla oluşturuldu ({len(apps)} uygulama)")
+        else:
+            print(f"✅ {output_file} güncel ({len(apps)} uygulama)")
         
-        print(f"✅ {output_file} başarıyla oluşturuldu ({len(apps)} uygulama)")
+        # Arama indeksini index.json'un yanına yaz; sürümü index.json'un sha256'sıdır
+        from search_index import SEARCH_INDEX_FILE, build_search_index, index_version_of
+        search_index_path = os.path.join(output_dir, SEARCH_INDEX_FILE)
+        search_data = build_search_index(apps, index_version_of(index_data))
+        if _write_if_changed(search_index_path, search_data):
+            print(f"🔎 {search_index_path} oluşturuldu ({len(search_data)} bayt)")
         return True
         
     except Exception as e:
@@ -114,12 +469,25 @@ def main():
     print("=" * 40)
     
     # Komut satırı argümanları
-    output_file = "index.json"
-    if len(sys.argv) > 1:
-        output_file = sys.argv[1]
+    parser = argparse.ArgumentParser(description="packages/ klasöründen index.json üretir")
+    parser.add_argument('output_file', nargs='?', default="index.json", help="Çıktı dosyası")
+    parser.add_argument('--packages-dir', default="./packages", help="Uygulama klasörlerinin dizini")
+    parser.add_argument('--artifacts-dir', default=DEFAULT_ARTIFACTS_DIR, help="Per-app arşiv dizini")
+    parser.add_argument('--artifact-base-url', default=DEFAULT_ARTIFACT_BASE_URL, help="Arşivlerin temel URL'si")
+    parser.add_argument('--files-base-url', default=DEFAULT_FILES_BASE_URL,
+                        help="Uygulama dosyalarının tek tek indirileceği temel URL (delta güncellemeler)")
+    parser.add_argument('--no-artifacts', action='store_true', help="Per-app arşiv üretme")
+    parser.add_argument('--no-cache', action='store_true', help="Parmak izi cache'ini yok say, tüm uygulamaları yeniden işle")
+    parser.add_argument('--jobs', type=int, default=None, help="Paralel işçi sayısı")
+    parser.add_argument('--only', action='append', metavar='FOLDER',
+                        help="Sadece bu uygulama klasörünü kontrol et (tekrarlanabilir); diğerleri cache'ten alınır")
+    args = parser.parse_args()
     
     # Index oluştur
-    success = generate_index(output_file)
+    artifacts_dir = None if args.no_artifacts else args.artifacts_dir
+    success = generate_index(args.output_file, args.packages_dir, artifacts_dir, args.artifact_base_url,
+                             use_cache=not args.no_cache, max_workers=args.jobs, only=args.only,
+                             files_base_url=args.files_base_url)
     
     if success:
         print("\n🎉 Index başarıyla güncellendi!")
@@ -8,30 +8,282 @@ Bu modül clapp'in performansını artırmak için:
 - Dosya checksum'larını önbellekleme
 - Akıllı cache yönetimi
 - Paralel indirme desteği
+
+Her cache türünün bir byte bütçesi vardır; bütçe aşılınca en uzun süredir
+erişilmeyen dosyalar silinir (LRU, erişim zamanına göre). Okunan veriler
+süreç içi bir bellek katmanında da tutulur; aynı komutta tekrarlanan get()
+çağrıları diske gitmez.
+
+Yazmalar geçici dosya + os.replace ile yapılır; okuyucular yarım yazılmış
+dosya görmez. Aynı anahtara yazan süreçler cache/locks altındaki danışma
+kilitleriyle (fcntl.flock / msvcrt.locking) sıraya girer.
+
+Kayıtların boyut ve erişim zamanları cache/ledger.db defterinde tutulur;
+istatistik ve tahliye kararları dizin taranmadan defterden hesaplanır.
+
+Tür dizinlerine sadece CacheManager yazar. Registry snapshot'ı ve arama
+indeksleri kendi dosya adlarıyla cache/index altında tutulur; defter,
+tahliye ve clear() bu dizine dokunmaz.
+
+Ayarlar:
+    CLAPP_CACHE_BUDGET_<TÜR>  Tür başına bütçe (MB), ör. CLAPP_CACHE_BUDGET_DOWNLOAD=1024
 """
 
 import os
 import json
 import hashlib
-import pickle
+import shutil
 import threading
 import time
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 import concurrent.futures
-import requests
+from collections import OrderedDict
 from functools import wraps
 
+# Tür başına varsayılan disk bütçesi (MB)
+DEFAULT_CACHE_BUDGETS_MB = {
+    "metadata": 16,
+    "registry": 32,
+    "checksum": 4,
+    "download": 512,
+    "memo": 32,
+}
+
+# Bellek katmanında tutulan en fazla kayıt (indirme dosyaları hariç)
+MEMORY_TIER_MAX_ENTRIES = 512
+
+_memory_tier: "OrderedDict[Tuple[str, str, str], Tuple[Any, float]]" = OrderedDict()
+_memory_lock = threading.Lock()
+_MISSING = object()
+
+# Anahtar kilitleri bu sayıda dosyaya dağıtılır (kilit dosyası sayısı sınırlı kalır)
+LOCK_STRIPES = 64
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_stripe_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+
+class _KeyLock:
+    """
+    Süreçler ve thread'ler arası danışma kilidi
+    
+    Anahtar LOCK_STRIPES kilit dosyasından birine eşlenir; aynı süreçteki
+    thread'ler için ayrıca threading.Lock kullanılır.
+    """
+    
+    def __init__(self, lock_dir: Path, name: str):
+        stripe = int(hashlib.blake2b(name.encode(), digest_size=4).hexdigest(), 16) % LOCK_STRIPES
+        self.path = lock_dir / f"{stripe:02d}.lock"
+        self.thread_lock = _stripe_locks[stripe]
+        self._file = None
+    
+    def __enter__(self):
+        self.thread_lock.acquire()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a+b')
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            else:
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+        except Exception:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.thread_lock.release()
+            raise
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+            self.thread_lock.release()
+
+
+def _write_atomic(path: Path, payload: bytes):
+    """Veriyi aynı dizinde geçici dosyaya yazıp os.replace ile yerine koyar"""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def get_cache_budget(cache_type: str) -> int:
+    """Cache türünün byte bütçesini döndürür (CLAPP_CACHE_BUDGET_<TÜR> ile değiştirilebilir)"""
+    default_mb = DEFAULT_CACHE_BUDGETS_MB.get(cache_type, 16)
+    try:
+        mb = float(os.environ.get(f"CLAPP_CACHE_BUDGET_{cache_type.upper()}", default_mb))
+    except ValueError:
+        mb = default_mb
+    return max(0, int(mb * 1024 * 1024))
+
+class CacheLedger:
+    """
+    Cache kayıtlarının boyut ve erişim zamanı defteri (SQLite)
+    
+    Tür başına dosya sayısı ve toplam boyut tetikleyicilerle güncel tutulur;
+    istatistikler O(1), LRU adayları (tür, atime) indeksiyle O(log n) okunur.
+    Defter sadece hızlandırma amaçlıdır: SQLite hataları yutulur ve
+    'clapp cache stats --verify' ile dosya sisteminden onarılır.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            type TEXT NOT NULL,
+            key TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            atime REAL NOT NULL,
+            PRIMARY KEY (type, key)
+        );
+        CREATE INDEX IF NOT EXISTS entries_lru ON entries (type, atime);
+        CREATE TABLE IF NOT EXISTS totals (
+            type TEXT PRIMARY KEY,
+            files INTEGER NOT NULL DEFAULT 0,
+            bytes INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS counters (
+            type TEXT PRIMARY KEY,
+            evictions INTEGER NOT NULL DEFAULT 0,
+            evicted_bytes INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+        CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+            INSERT OR IGNORE INTO totals (type) VALUES (NEW.type);
+            UPDATE totals SET files = files + 1, bytes = bytes + NEW.size WHERE type = NEW.type;
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+            UPDATE totals SET files = files - 1, bytes = bytes - OLD.size WHERE type = OLD.type;
+        END;
+        CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+            UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE type = NEW.type;
+        END;
+    """
+    
+    def __init__(self, db_path: Path):
+        import sqlite3
+        
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            self._conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None,
+                                         check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        except sqlite3.Error as e:
+            print(f"⚠️  Cache defteri açılamadı: {e}")
+            self._conn = None
+    
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        import sqlite3
+        
+        if self._conn is None:
+            return []
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error:
+                return []
+    
+    def is_bootstrapped(self) -> bool:
+        return bool(self._execute("SELECT 1 FROM meta WHERE name = 'bootstrapped'"))
+    
+    def mark_bootstrapped(self):
+        self._execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('bootstrapped', ?)",
+                      (str(time.time()),))
+    
+    def record(self, cache_type: str, key: str, size: int, atime: Optional[float] = None):
+        """Kaydı ekler veya boyutunu/erişim zamanını günceller"""
+        self._execute(
+            "INSERT INTO entries (type, key, size, atime) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (type, key) DO UPDATE SET size = excluded.size, atime = excluded.atime",
+            (cache_type, key, size, time.time() if atime is None else atime))
+    
+    def touch(self, cache_type: str, key: str, atime: Optional[float] = None):
+        self._execute("UPDATE entries SET atime = ? WHERE type = ? AND key = ?",
+                      (time.time() if atime is None else atime, cache_type, key))
+    
+    def remove(self, cache_type: str, key: str):
+        self._execute("DELETE FROM entries WHERE type = ? AND key = ?", (cache_type, key))
+    
+    def clear(self, cache_type: Optional[str] = None):
+        if cache_type:
+            self._execute("DELETE FROM entries WHERE type = ?", (cache_type,))
+        else:
+            self._execute("DELETE FROM entries")
+    
+    def total(self, cache_type: str) -> Tuple[int, int]:
+        """(dosya sayısı, toplam byte)"""
+        rows = self._execute("SELECT files, bytes FROM totals WHERE type = ?", (cache_type,))
+        return tuple(rows[0]) if rows else (0, 0)
+    
+    def totals(self) -> Dict[str, Tuple[int, int]]:
+        return {row[0]: (row[1], row[2]) for row in self._execute("SELECT type, files, bytes FROM totals")}
+    
+    def oldest(self, cache_type: str, limit: int = 64, offset: int = 0) -> List[Tuple[str, int]]:
+        """En eski erişilen kayıtlar: [(anahtar, boyut), ...]"""
+        return [tuple(row) for row in self._execute(
+            "SELECT key, size FROM entries WHERE type = ? ORDER BY atime LIMIT ? OFFSET ?",
+            (cache_type, limit, offset))]
+    
+    def entries(self, cache_type: str) -> Dict[str, int]:
+        """Türün tüm kayıtları: anahtar -> boyut (sadece doğrulama için)"""
+        return {row[0]: row[1] for row in self._execute(
+            "SELECT key, size FROM entries WHERE type = ?", (cache_type,))}
+    
+    def add_evictions(self, cache_type: str, count: int, size: int):
+        self._execute(
+            "INSERT INTO counters (type, evictions, evicted_bytes) VALUES (?, ?, ?) "
+            "ON CONFLICT (type) DO UPDATE SET evictions = evictions + excluded.evictions, "
+            "evicted_bytes = evicted_bytes + excluded.evicted_bytes",
+            (cache_type, count, size))
+    
+    def counters(self) -> Dict[str, Tuple[int, int]]:
+        """Tür başına (tahliye sayısı, tahliye edilen byte)"""
+        return {row[0]: (row[1], row[2]) for row in self._execute(
+            "SELECT type, evictions, evicted_bytes FROM counters")}
+
+
 class CacheManager:
     """Akıllı önbellekleme yöneticisi"""
     
-    def __init__(self, cache_dir: Optional[str] = None):
+    def __init__(self, cache_dir: Optional[str] = None, budgets: Optional[Dict[str, int]] = None):
         """
         CacheManager başlatıcısı
         
         Args:
             cache_dir: Cache dizini (varsayılan: ~/.clapp/cache)
+            budgets: Tür başına byte bütçesi (varsayılan: get_cache_budget)
         """
         if cache_dir is None:
             cache_dir = os.path.join(os.path.expanduser("~"), ".clapp", "cache")
@@ -44,23 +296,285 @@ class CacheManager:
         self.registry_cache = self.cache_dir / "registry"
         self.checksum_cache = self.cache_dir / "checksums"
         self.download_cache = self.cache_dir / "downloads"
+        self.memo_cache = self.cache_dir / "memo"
         
         # Cache dizinlerini oluştur
         for cache_path in [self.metadata_cache, self.registry_cache, 
-                          self.checksum_cache, self.download_cache]:
+                          self.checksum_cache, self.download_cache, self.memo_cache]:
             cache_path.mkdir(exist_ok=True)
         
+        self.budgets = {
+            cache_type: get_cache_budget(cache_type)
+            for cache_type in DEFAULT_CACHE_BUDGETS_MB
+        }
+        if budgets:
+            self.budgets.update(budgets)
+        
         # Cache istatistikleri
         self.stats = {
             "hits": 0,
+            "memory_hits": 0,
             "misses": 0,
             "evictions": 0,
             "size": 0
         }
         
+        # Boyut/erişim defteri (ilk kullanımda açılır)
+        self._ledger: Optional[CacheLedger] = None
+        
+        # Bellek katmanı isabetlerinin erişim zamanları; tahliyeden önce deftere yazılır
+        self._pending_touches: Dict[Tuple[str, str], float] = {}
+        self._lock_dir = self.cache_dir / "locks"
+        
         # Thread-safe cache
         self._lock = threading.Lock()
     
+    def _type_directory(self, cache_type: str) -> Path:
+        return self._get_cache_key("", cache_type).parent
+    
+    def _key_lock(self, key: str, cache_type: str) -> _KeyLock:
+        """Anahtar için süreçler arası yazma kilidi"""
+        return _KeyLock(self._lock_dir, f"{cache_type}/{key}")
+    
+    def _remove_if_unchanged(self, cache_file: Path, st: os.stat_result, key: str, cache_type: str):
+        """
+        Dosyayı, okunduğundan beri başka bir süreç değiştirmediyse siler
+        
+        Süresi dolmuş veya bozuk bir kayıt silinirken araya giren yeni bir
+        yazma kaybolmaz.
+        """
+        with self._key_lock(key, cache_type):
+            try:
+                current = cache_file.stat()
+                if (current.st_ino, current.st_mtime_ns) == (st.st_ino, st.st_mtime_ns):
+                    cache_file.unlink()
+                    self.ledger.remove(cache_type, key)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _serialize(data: Any, cache_type: str) -> bytes:
+        if cache_type in ["metadata", "registry", "memo"]:
+            return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        if cache_type == "checksum":
+            return str(data).encode('utf-8')
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("download cache'i sadece ham byte verisi kabul eder")
+        return bytes(data)
+    
+    @staticmethod
+    def _deserialize(payload: bytes, cache_type: str) -> Any:
+        if cache_type in ["metadata", "registry", "memo"]:
+            return json.loads(payload.decode('utf-8'))
+        if cache_type == "checksum":
+            return payload.decode('utf-8').strip()
+        return payload
+    
+    # --- Bellek katmanı --------------------------------------------------
+    
+    def _memory_key(self, key: str, cache_type: str) -> Tuple[str, str, str]:
+        return (str(self.cache_dir), cache_type, key)
+    
+    def _memory_get(self, key: str, cache_type: str, max_age: int) -> Any:
+        memory_key = self._memory_key(key, cache_type)
+        with _memory_lock:
+            entry = _memory_tier.get(memory_key)
+            if entry is None:
+                return _MISSING
+            data, written_at = entry
+            if time.time() - written_at > max_age:
+                del _memory_tier[memory_key]
+                return _MISSING
+            _memory_tier.move_to_end(memory_key)
+            return data
+    
+    def _memory_put(self, key: str, cache_type: str, data: Any, written_at: float):
+        memory_key = self._memory_key(key, cache_type)
+        with _memory_lock:
+            _memory_tier[memory_key] = (data, written_at)
+            _memory_tier.move_to_end(memory_key)
+            while len(_memory_tier) > MEMORY_TIER_MAX_ENTRIES:
+                _memory_tier.popitem(last=False)
+    
+    def _memory_drop(self, key: Optional[str] = None, cache_type: Optional[str] = None):
+        """Bellek katmanından kaydı (veya türün/tüm dizinin kayıtlarını) siler"""
+        cache_dir = str(self.cache_dir)
+        with _memory_lock:
+            for memory_key in list(_memory_tier):
+                if memory_key[0] != cache_dir:
+                    continue
+                if cache_type is not None and memory_key[1] != cache_type:
+                    continue
+                if key is not None and memory_key[2] != key:
+                    continue
+                del _memory_tier[memory_key]
+    
+    # --- Defter, bütçe ve LRU tahliye -----------------------------------
+    
+    @property
+    def ledger(self) -> "CacheLedger":
+        """Kayıt defteri; ilk açılışta mevcut dosyalar deftere aktarılır"""
+        if self._ledger is None:
+            with self._lock:
+                if self._ledger is None:
+                    ledger = CacheLedger(self.cache_dir / "ledger.db")
+                    if not ledger.is_bootstrapped():
+                        self._reconcile(ledger)
+                        ledger.mark_bootstrapped()
+                    self._ledger = ledger
+        return self._ledger
+    
+    def _touch(self, key: str, cache_type: str):
+        """LRU için erişim zamanını deftere yazar"""
+        self._pending_touches.pop((cache_type, key), None)
+        self.ledger.touch(cache_type, key)
+    
+    def _flush_touches(self, cache_type: str):
+        """Türün bellek katmanı isabetlerini deftere işler"""
+        for pending in [pending for pending in list(self._pending_touches) if pending[0] == cache_type]:
+            atime = self._pending_touches.pop(pending, None)
+            if atime is not None:
+                self.ledger.touch(cache_type, pending[1], atime)
+    
+    def _scan_type(self, cache_type: str) -> Dict[str, Tuple[int, float]]:
+        """Türün dosyalarını diskte tarar: anahtar -> (boyut, atime)"""
+        entries = {}
+        cache_path = self._type_directory(cache_type)
+        try:
+            with os.scandir(cache_path) as it:
+                for entry in it:
+                    if not entry.is_file() or entry.name.startswith("."):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries[os.path.splitext(entry.name)[0]] = (st.st_size, st.st_atime)
+        except OSError:
+            pass
+        return entries
+    
+    def _reconcile(self, ledger: "CacheLedger") -> Dict[str, int]:
+        """Defteri dosya sistemiyle eşitler; düzeltme sayılarını döndürür"""
+        fixes = {"added": 0, "removed": 0, "resized": 0}
+        for cache_type in DEFAULT_CACHE_BUDGETS_MB:
+            on_disk = self._scan_type(cache_type)
+            recorded = ledger.entries(cache_type)
+            
+            for key in recorded.keys() - on_disk.keys():
+                ledger.remove(cache_type, key)
+                fixes["removed"] += 1
+            for key, (size, atime) in on_disk.items():
+                if key not in recorded:
+                    ledger.record(cache_type, key, size, atime)
+                    fixes["added"] += 1
+                elif recorded[key] != size:
+                    ledger.record(cache_type, key, size, atime)
+                    fixes["resized"] += 1
+        return fixes
+    
+    def verify(self) -> Dict[str, int]:
+        """
+        Defteri dosya sistemiyle karşılaştırıp düzeltir (cache stats --verify)
+        
+        Returns:
+            {"added": ..., "removed": ..., "resized": ...}
+        """
+        return self._reconcile(self.ledger)
+    
+    def _account(self, cache_type: str, key: str, size: int):
+        """Yazılan kaydı deftere işler, bütçe aşıldıysa tahliye yapar"""
+        self.ledger.record(cache_type, key, size)
+        _, total = self.ledger.total(cache_type)
+        if total > self.budgets.get(cache_type, 0):
+            self.enforce_budget(cache_type, keep=key)
+    
+    def enforce_budget(self, cache_type: str, keep: Optional[str] = None) -> int:
+        """
+        Tür bütçesini aşan kısmı en eski erişilen kayıtlardan başlayarak siler
+        
+        Aday kayıtlar defterdeki (tür, erişim zamanı) indeksinden okunur;
+        dizin taranmaz.
+        
+        Args:
+            cache_type: Cache türü
+            keep: Silinmemesi gereken anahtar (ör. az önce yazılan)
+            
+        Returns:
+            Silinen kayıt sayısı
+        """
+        return self._evict_over_budget(cache_type, keep)[0]
+    
+    def _evict_over_budget(self, cache_type: str, keep: Optional[str] = None,
+                           dry_run: bool = False) -> Tuple[int, int]:
+        """
+        enforce_budget gövdesi; dry_run ise sadece silinecek kayıtları sayar
+        
+        Returns:
+            (silinen/silinecek kayıt sayısı, byte)
+        """
+        budget = self.budgets.get(cache_type, 0)
+        evicted = 0
+        evicted_bytes = 0
+        ledger = self.ledger
+        self._flush_touches(cache_type)
+        
+        with self._lock:
+            _, total = ledger.total(cache_type)
+            offset = 0
+            while total > budget:
+                batch = ledger.oldest(cache_type, limit=64, offset=offset)
+                if not batch:
+                    break
+                for key, size in batch:
+                    if total <= budget:
+                        break
+                    if key == keep:
+                        offset += 1
+                        continue
+                    if dry_run:
+                        # Kayıt defterde kaldığı için sonraki sayfa kaydırılır
+                        offset += 1
+                        total -= size
+                        evicted += 1
+                        evicted_bytes += size
+                        continue
+                    try:
+                        self._get_cache_key(key, cache_type).unlink()
+                    except FileNotFoundError:
+                        pass
+                    except OSError:
+                        offset += 1
+                        continue
+                    ledger.remove(cache_type, key)
+                    self._memory_drop(key, cache_type)
+                    total -= size
+                    evicted += 1
+                    evicted_bytes += size
+        
+        if evicted and not dry_run:
+            self.stats["evictions"] += evicted
+            ledger.add_evictions(cache_type, evicted, evicted_bytes)
+        return evicted, evicted_bytes
+    
+    def prune(self, dry_run: bool = False) -> Tuple[int, int]:
+        """
+        Tüm türlerde bütçeyi uygular (clapp clean)
+        
+        Args:
+            dry_run: True ise hiçbir kayıt silinmez, sadece silinecekler hesaplanır
+        
+        Returns:
+            (silinen kayıt sayısı, kazanılan byte)
+        """
+        evicted = 0
+        evicted_bytes = 0
+        for cache_type in DEFAULT_CACHE_BUDGETS_MB:
+            count, size = self._evict_over_budget(cache_type, dry_run=dry_run)
+            evicted += count
+            evicted_bytes += size
+        return evicted, evicted_bytes
+    
     def _get_cache_key(self, key: str, cache_type: str = "metadata") -> Path:
         """Cache anahtarı için dosya yolu oluşturur"""
         if cache_type == "metadata":
@@ -71,6 +585,8 @@ class CacheManager:
             return self.checksum_cache / f"{key}.txt"
         elif cache_type == "download":
             return self.download_cache / f"{key}.zip"
+        elif cache_type == "memo":
+            return self.memo_cache / f"{key}.json"
         else:
             raise ValueError(f"Geçersiz cache türü: {cache_type}")
     
@@ -88,36 +604,47 @@ class CacheManager:
         """
         cache_file = self._get_cache_key(key, cache_type)
         
-        if not cache_file.exists():
+        # Bellek katmanı: aynı süreçte daha önce okunan/yazılan veri
+        if cache_type != "download":
+            data = self._memory_get(key, cache_type, max_age)
+            if data is not _MISSING:
+                # Her isabette deftere yazılmaz; LRU sırası tahliyeden önce güncellenir
+                self._pending_touches[(cache_type, key)] = time.time()
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return data
+        
+        try:
+            st = cache_file.stat()
+        except OSError:
             self.stats["misses"] += 1
             return None
         
         # Dosya yaşını kontrol et
-        file_age = time.time() - cache_file.stat().st_mtime
+        file_age = time.time() - st.st_mtime
         if file_age > max_age:
-            cache_file.unlink()
+            self._remove_if_unchanged(cache_file, st, key, cache_type)
             self.stats["misses"] += 1
             return None
         
         try:
-            with self._lock:
-                if cache_type in ["metadata", "registry"]:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                elif cache_type == "checksum":
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        data = f.read().strip()
-                else:
-                    # Binary dosyalar için pickle kullan
-                    with open(cache_file, 'rb') as f:
-                        data = pickle.load(f)
+            # Yazmalar atomik olduğundan okuma kilitsiz yapılabilir
+            with open(cache_file, 'rb') as f:
+                data = self._deserialize(f.read(), cache_type)
             
+            self._touch(key, cache_type)
+            if cache_type != "download":
+                self._memory_put(key, cache_type, data, st.st_mtime)
             self.stats["hits"] += 1
             return data
             
+        except FileNotFoundError:
+            # Okuma sırasında tahliye edildi
+            self.stats["misses"] += 1
+            return None
         except Exception as e:
             print(f"Cache okuma hatası: {e}")
-            cache_file.unlink()
+            self._remove_if_unchanged(cache_file, st, key, cache_type)
             self.stats["misses"] += 1
             return None
     
@@ -136,18 +663,13 @@ class CacheManager:
         cache_file = self._get_cache_key(key, cache_type)
         
         try:
-            with self._lock:
-                if cache_type in ["metadata", "registry"]:
-                    with open(cache_file, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                elif cache_type == "checksum":
-                    with open(cache_file, 'w', encoding='utf-8') as f:
-                        f.write(str(data))
-                else:
-                    # Binary dosyalar için pickle kullan
-                    with open(cache_file, 'wb') as f:
-                        pickle.dump(data, f)
+            payload = self._serialize(data, cache_type)
+            with self._key_lock(key, cache_type):
+                _write_atomic(cache_file, payload)
             
+            if cache_type != "download":
+                self._memory_put(key, cache_type, data, time.time())
+            self._account(cache_type, key, len(payload))
             return True
             
         except Exception as e:
@@ -157,8 +679,10 @@ class CacheManager:
     def delete(self, key: str, cache_type: str = "metadata") -> bool:
         """Cache'den veri siler"""
         cache_file = self._get_cache_key(key, cache_type)
+        self._memory_drop(key, cache_type)
         
         try:
+            self.ledger.remove(cache_type, key)
             if cache_file.exists():
                 cache_file.unlink()
                 return True
@@ -177,6 +701,8 @@ class CacheManager:
             Silinen dosya sayısı
         """
         deleted_count = 0
+        self._memory_drop(cache_type=cache_type)
+        self.ledger.clear(cache_type)
         
         if cache_type:
             cache_path = self._get_cache_key("", cache_type).parent
@@ -188,7 +714,7 @@ class CacheManager:
         else:
             # Tüm cache'leri temizle
             for cache_path in [self.metadata_cache, self.registry_cache, 
-                              self.checksum_cache, self.download_cache]:
+                              self.checksum_cache, self.download_cache, self.memo_cache]:
                 if cache_path.exists():
                     for file in cache_path.iterdir():
                         if file.is_file():
@@ -197,43 +723,57 @@ class CacheManager:
         
         return deleted_count
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Cache istatistiklerini döndürür"""
+    def get_stats(self, verify: bool = False) -> Dict[str, Any]:
+        """
+        Cache istatistiklerini döndürür
+        
+        Boyutlar defterdeki tür toplamlarından okunur; dizinler taranmaz.
+        
+        Args:
+            verify: Önce defteri dosya sistemiyle eşitle
+        """
+        fixes = self.verify() if verify else None
+        totals = self.ledger.totals()
+        counters = self.ledger.counters()
         total_size = 0
+        types = {}
         
-        # Cache boyutunu hesapla
-        for cache_path in [self.metadata_cache, self.registry_cache, 
-                          self.checksum_cache, self.download_cache]:
-            if cache_path.exists():
-                for file in cache_path.iterdir():
-                    if file.is_file():
-                        total_size += file.stat().st_size
+        for cache_type in DEFAULT_CACHE_BUDGETS_MB:
+            files, size = totals.get(cache_type, (0, 0))
+            evictions, evicted_bytes = counters.get(cache_type, (0, 0))
+            total_size += size
+            types[cache_type] = {
+                "files": files,
+                "size_bytes": size,
+                "budget_bytes": self.budgets.get(cache_type, 0),
+                "evictions": evictions,
+                "evicted_bytes": evicted_bytes,
+            }
         
-        return {
+        stats = {
             **self.stats,
+            "evictions": sum(item["evictions"] for item in types.values()),
+            "types": types,
             "size_bytes": total_size,
             "size_mb": round(total_size / (1024 * 1024), 2),
             "hit_rate": round(self.stats["hits"] / max(1, self.stats["hits"] + self.stats["misses"]) * 100, 2)
         }
+        if fixes is not None:
+            stats["verify"] = fixes
+        return stats
     
     def calculate_checksum(self, file_path: str) -> str:
-        """Dosyanın SHA-256 checksum'unu hesaplar ve cache'ler"""
-        cache_key = hashlib.md5(file_path.encode()).hexdigest()
-        cached_checksum = self.get(cache_key, "checksum", max_age=86400)  # 24 saat
-        
-        if cached_checksum:
-            return cached_checksum
-        
-        # Checksum hesapla
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
+        """
+        Dosyanın SHA-256 checksum'unu döndürür
         
-        checksum = sha256_hash.hexdigest()
-        self.set(cache_key, checksum, "checksum")
+        Sonuç (boyut, mtime_ns, inode) ile doğrulanır; dosya değişirse
+        yeniden hesaplanır (bkz. file_hasher).
+        """
+        from file_hasher import FileHasher, get_file_hasher
         
-        return checksum
+        if self is get_default_cache_manager():
+            return get_file_hasher().hash_file(file_path)
+        return FileHasher(self).hash_file(file_path)
     
     def cache_package_metadata(self, package_path: str, metadata: Dict[str, Any]) -> bool:
         """Paket meta verilerini cache'ler"""
@@ -254,6 +794,89 @@ class CacheManager:
         """Cache'lenmiş registry verilerini alır"""
         cache_key = hashlib.md5(registry_url.encode()).hexdigest()
         return self.get(cache_key, "registry", max_age=1800)  # 30 dakika
+    
+    def _download_key(self, url: str, sha256: Optional[str] = None, etag: Optional[str] = None) -> Optional[str]:
+        """
+        İndirme cache anahtarını üretir
+        
+        sha256 biliniyorsa anahtar içerik adreslidir (aynı içerik = aynı dosya).
+        Aksi halde URL ve ETag birlikte kullanılır; ikisi de yoksa cache'lenmez.
+        """
+        if sha256:
+            return f"sha256-{sha256.lower()}"
+        if etag:
+            return "url-" + hashlib.sha256(f"{url}\n{etag}".encode()).hexdigest()
+        return None
+    
+    def get_download(self, url: str, sha256: Optional[str] = None, etag: Optional[str] = None) -> Optional[str]:
+        """
+        Daha önce indirilmiş arşivin cache'teki yolunu döndürür
+        
+        Args:
+            url: Arşiv URL'si
+            sha256: Beklenen içerik hash'i (varsa)
+            etag: Sunucunun bildirdiği ETag (varsa)
+            
+        Returns:
+            Cache'teki dosya yolu veya None
+        """
+        key = self._download_key(url, sha256, etag)
+        if key is None:
+            self.stats["misses"] += 1
+            return None
+        
+        cache_file = self._get_cache_key(key, "download")
+        if cache_file.exists():
+            self._touch(key, "download")
+            self.stats["hits"] += 1
+            return str(cache_file)
+        
+        self.stats["misses"] += 1
+        return None
+    
+    def evict_download(self, url: str, sha256: Optional[str] = None, etag: Optional[str] = None) -> bool:
+        """
+        Bozuk veya doğrulanamayan arşivi download cache'inden siler
+        
+        Returns:
+            Dosya silindiyse True
+        """
+        key = self._download_key(url, sha256, etag)
+        if key is None:
+            return False
+        with self._key_lock(key, "download"):
+            return self.delete(key, "download")
+    
+    def store_download(self, url: str, file_path: str, sha256: Optional[str] = None,
+                       etag: Optional[str] = None) -> Optional[str]:
+        """
+        İndirilen arşivi download cache'ine kopyalar
+        
+        Returns:
+            Cache'teki dosya yolu veya None (cache'lenemiyorsa)
+        """
+        key = self._download_key(url, sha256, etag)
+        if key is None:
+            return None
+        
+        cache_file = self._get_cache_key(key, "download")
+        temp_file = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        
+        try:
+            with self._key_lock(key, "download"):
+                # Aynı içerik-adresli arşivi başka bir süreç az önce yazmış olabilir
+                if sha256 and cache_file.exists():
+                    self._touch(key, "download")
+                    return str(cache_file)
+                shutil.copyfile(file_path, temp_file)
+                os.replace(temp_file, cache_file)
+            self._account("download", key, cache_file.stat().st_size)
+            return str(cache_file)
+        except Exception as e:
+            print(f"Cache yazma hatası: {e}")
+            if temp_file.exists():
+                temp_file.unlink()
+            return None
 
 class ParallelDownloader:
     """Paralel indirme yöneticisi"""
@@ -265,21 +888,21 @@ class ParallelDownloader:
         Args:
             max_workers: Maksimum paralel işçi sayısı
         """
+        from http_client import get_http_client
+        
         self.max_workers = max_workers
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'clapp-package-manager/1.0'
-        })
+        # Ortak istemci: bağlantı havuzu ve sunucu başına sınır tüm süreçte paylaşılır
+        self.client = get_http_client()
     
     def download_file(self, url: str, destination: str) -> Tuple[bool, str]:
         """Tek dosya indirir"""
         try:
-            response = self.session.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            with open(destination, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with self.client.stream(url) as response:
+                response.raise_for_status()
+                
+                with open(destination, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
             
             return True, f"Dosya indirildi: {destination}"
             
@@ -317,45 +940,133 @@ class ParallelDownloader:
         return results
 
 # Cache decorator
-def cached(max_age: int = 3600, cache_type: str = "metadata"):
-    """Cache decorator'ı"""
+_default_manager: Optional[CacheManager] = None
+_default_manager_lock = threading.Lock()
+
+# Fonksiyon adı -> {"hits": ..., "misses": ...} (süreç kapsamlı)
+_memo_stats: Dict[str, Dict[str, int]] = {}
+
+
+def get_default_cache_manager() -> CacheManager:
+    """Süreç kapsamlı varsayılan CacheManager döndürür (dizinler bir kez oluşturulur)"""
+    global _default_manager
+    if _default_manager is None:
+        with _default_manager_lock:
+            if _default_manager is None:
+                _default_manager = CacheManager()
+    return _default_manager
+
+
+def _canonical(value: Any) -> Any:
+    """Argümanı süreçten bağımsız, JSON ile kodlanabilir biçime çevirir"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(item) for item in value), key=lambda item: json.dumps(item, sort_keys=True))
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": bytes(value).hex()}
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    # Bilinmeyen nesneler: repr kararlıysa anahtar da kararlıdır
+    return {"__repr__": f"{type(value).__module__}.{type(value).__qualname__}:{value!r}"}
+
+
+def _memo_name(func) -> str:
+    name = f"{func.__module__}.{func.__qualname__}"
+    return "".join(char if char.isalnum() or char in "._" else "_" for char in name)
+
+
+def make_memo_key(func, args: tuple, kwargs: dict) -> str:
+    """
+    Fonksiyon çağrısı için kararlı cache anahtarı üretir
+    
+    hash() süreç başına rastgele olduğundan kullanılmaz; argümanlar kanonik
+    JSON'a çevrilip blake2b ile özetlenir.
+    """
+    payload = json.dumps([_canonical(args), _canonical(kwargs)], sort_keys=True,
+                         separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{_memo_name(func)}-{digest}"
+
+
+def cached(max_age: int = 3600, cache_type: str = "memo", cache_none: bool = False):
+    """
+    Fonksiyon sonucunu süreçler arası saklayan decorator
+    
+    Sonuç JSON'a çevrilebilir olmalıdır (tuple'lar liste olarak döner).
+    Sarılan fonksiyon cache_info() ve cache_clear() metodlarını kazanır.
+    
+    Byte bütçesi fonksiyon başına değil cache türü başınadır ve aynı türü
+    kullanan tüm fonksiyonlarca paylaşılır; CLAPP_CACHE_BUDGET_<TÜR> ile
+    değiştirilir (ör. CLAPP_CACHE_BUDGET_MEMO=64).
+    
+    Args:
+        max_age: Sonucun geçerlilik süresi (saniye)
+        cache_type: Kullanılacak cache türü
+        cache_none: None sonuçları da sakla
+    """
     def decorator(func):
+        name = _memo_name(func)
+        counters = _memo_stats.setdefault(name, {"hits": 0, "misses": 0})
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Cache anahtarı oluştur
-            cache_key = f"{func.__name__}_{hash(str(args) + str(sorted(kwargs.items())))}"
+            cache_manager = get_default_cache_manager()
+            cache_key = make_memo_key(func, args, kwargs)
             
-            # Cache manager oluştur
-            cache_manager = CacheManager()
+            # Sonuç {"value": ...} içinde saklanır; böylece None da ayırt edilir
+            entry = cache_manager.get(cache_key, cache_type, max_age)
+            if isinstance(entry, dict) and "value" in entry:
+                counters["hits"] += 1
+                return entry["value"]
             
-            # Cache'den kontrol et
-            cached_result = cache_manager.get(cache_key, cache_type, max_age)
-            if cached_result is not None:
-                return cached_result
-            
-            # Fonksiyonu çalıştır
+            counters["misses"] += 1
             result = func(*args, **kwargs)
-            
-            # Sonucu cache'le
-            cache_manager.set(cache_key, result, cache_type)
-            
+            if result is not None or cache_none:
+                cache_manager.set(cache_key, {"value": result}, cache_type)
             return result
+        
+        def cache_info() -> Dict[str, int]:
+            """Bu süreçteki isabet/ıska sayılarını döndürür"""
+            return dict(counters)
+        
+        def cache_clear() -> int:
+            """Bu fonksiyonun saklanan tüm sonuçlarını siler"""
+            cache_manager = get_default_cache_manager()
+            cache_path = cache_manager._type_directory(cache_type)
+            deleted = 0
+            for file in cache_path.glob(f"{name}-*"):
+                if cache_manager.delete(file.stem, cache_type):
+                    deleted += 1
+            return deleted
+        
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
         return wrapper
     return decorator
 
+
+def get_memo_stats() -> Dict[str, Dict[str, int]]:
+    """@cached ile sarılan fonksiyonların bu süreçteki isabet/ıska sayıları"""
+    return {name: dict(counters) for name, counters in _memo_stats.items()}
+
 # Yardımcı fonksiyonlar
 def create_cache_manager() -> CacheManager:
-    """Varsayılan ayarlarla CacheManager oluşturur"""
-    return CacheManager()
+    """Varsayılan ayarlarla CacheManager döndürür (süreç kapsamlı örnek)"""
+    return get_default_cache_manager()
 
 def create_parallel_downloader(max_workers: int = 4) -> ParallelDownloader:
     """ParallelDownloader oluşturur"""
     return ParallelDownloader(max_workers)
 
-def get_cache_stats() -> Dict[str, Any]:
-    """Cache istatistiklerini alır"""
+def get_cache_stats(verify: bool = False) -> Dict[str, Any]:
+    """Cache istatistiklerini alır (verify: defteri dosya sistemiyle eşitle)"""
     cache_manager = create_cache_manager()
-    return cache_manager.get_stats()
+    return cache_manager.get_stats(verify=verify)
 
 def clear_all_caches() -> int:
     """Tüm cache'leri temizler"""
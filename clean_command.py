@@ -7,10 +7,14 @@ logları ve eski dosyaları temizler.
 """
 
 import os
+import time
 import shutil
 import glob
 from pathlib import Path
 
+# Bu süreden uzun süredir devam ettirilmeyen yarım indirmeler silinir
+PARTIAL_DOWNLOAD_MAX_AGE = 7 * 24 * 60 * 60
+
 def format_size(size_bytes):
     """Dosya boyutunu formatlar"""
     if size_bytes == 0:
@@ -23,8 +27,8 @@ def format_size(size_bytes):
     
     return f"{size_bytes:.1f} TB"
 
-def clean_temp_files():
-    """Geçici dosyaları temizler"""
+def clean_temp_files(dry_run=False):
+    """Geçici dosyaları temizler (dry_run ise sadece listeler)"""
     temp_patterns = [
         "*.tmp",
         "*.temp",
@@ -51,7 +55,8 @@ def clean_temp_files():
                 if pycache_dir.is_dir():
                     try:
                         dir_size = sum(f.stat().st_size for f in pycache_dir.rglob("*") if f.is_file())
-                        shutil.rmtree(pycache_dir)
+                        if not dry_run:
+                            shutil.rmtree(pycache_dir)
                         cleaned_files.append(str(pycache_dir))
                         total_size += dir_size
                     except Exception as e:
@@ -62,7 +67,8 @@ def clean_temp_files():
                 if file_path.is_file():
                     try:
                         file_size = file_path.stat().st_size
-                        file_path.unlink()
+                        if not dry_run:
+                            file_path.unlink()
                         cleaned_files.append(str(file_path))
                         total_size += file_size
                     except Exception as e:
@@ -70,8 +76,8 @@ def clean_temp_files():
     
     return cleaned_files, total_size
 
-def clean_apps_directory():
-    """apps/ dizinindeki geçici dosyaları temizler"""
+def clean_apps_directory(dry_run=False):
+    """apps/ dizinindeki geçici dosyaları temizler (dry_run ise sadece listeler)"""
     apps_dir = Path("apps")
     if not apps_dir.exists():
         return [], 0
@@ -86,7 +92,8 @@ def clean_apps_directory():
             for zip_file in app_dir.glob("*.zip"):
                 try:
                     file_size = zip_file.stat().st_size
-                    zip_file.unlink()
+                    if not dry_run:
+                        zip_file.unlink()
                     cleaned_files.append(str(zip_file))
                     total_size += file_size
                 except Exception as e:
@@ -96,7 +103,8 @@ def clean_apps_directory():
             for old_file in app_dir.glob("*.old"):
                 try:
                     file_size = old_file.stat().st_size
-                    old_file.unlink()
+                    if not dry_run:
+                        old_file.unlink()
                     cleaned_files.append(str(old_file))
                     total_size += file_size
                 except Exception as e:
@@ -104,8 +112,8 @@ def clean_apps_directory():
     
     return cleaned_files, total_size
 
-def clean_clapp_config():
-    """~/.clapp dizinindeki geçici dosyaları temizler"""
+def clean_clapp_config(dry_run=False):
+    """~/.clapp dizinindeki geçici dosyaları temizler (dry_run ise sadece listeler)"""
     home = Path.home()
     clapp_dir = home / ".clapp"
     
@@ -120,7 +128,8 @@ def clean_clapp_config():
     if temp_dir.exists():
         try:
             dir_size = sum(f.stat().st_size for f in temp_dir.rglob("*") if f.is_file())
-            shutil.rmtree(temp_dir)
+            if not dry_run:
+                shutil.rmtree(temp_dir)
             cleaned_files.append(str(temp_dir))
             total_size += dir_size
         except Exception as e:
@@ -133,12 +142,39 @@ def clean_clapp_config():
             # Sadece .log dosyalarını sil, dizini koru
             for log_file in logs_dir.glob("*.log"):
                 file_size = log_file.stat().st_size
-                log_file.unlink()
+                if not dry_run:
+                    log_file.unlink()
                 cleaned_files.append(str(log_file))
                 total_size += file_size
         except Exception as e:
             print(f"⚠️  Log dosyaları silinemedi: {e}")
     
+    # Yarım kalmış indirmeler: bir haftadır devam ettirilmeyenler
+    partial_dir = clapp_dir / "cache" / "partial"
+    if partial_dir.exists():
+        cutoff = time.time() - PARTIAL_DOWNLOAD_MAX_AGE
+        for part_file in partial_dir.iterdir():
+            try:
+                if part_file.stat().st_mtime < cutoff:
+                    file_size = part_file.stat().st_size
+                    if not dry_run:
+                        part_file.unlink()
+                    cleaned_files.append(str(part_file))
+                    total_size += file_size
+            except Exception as e:
+                print(f"⚠️  {part_file} silinemedi: {e}")
+    
+    # cache: bütçeyi aşan kayıtlar (boyutlar cache defterinden okunur)
+    if (clapp_dir / "cache").exists():
+        try:
+            from cache_manager import get_default_cache_manager
+            evicted, evicted_size = get_default_cache_manager().prune(dry_run=dry_run)
+            if evicted:
+                cleaned_files.append(f"{clapp_dir / 'cache'} ({evicted} kayıt)")
+                total_size += evicted_size
+        except Exception as e:
+            print(f"⚠️  Cache temizlenemedi: {e}")
+    
     return cleaned_files, total_size
 
 def run_clean(dry_run=False):
@@ -150,14 +186,16 @@ def run_clean(dry_run=False):
         print("🔍 Kuru çalıştırma modu - Dosyalar silinmeyecek")
         print()
     
+    # Kuru çalıştırmada bulunanlar "temizlenecek" olarak raporlanır
+    done = "temizlenecek" if dry_run else "temizlendi"
     total_cleaned = 0
     total_size = 0
     
     # 1. Geçici dosyaları temizle
     print("🗑️  Geçici dosyalar temizleniyor...")
-    temp_files, temp_size = clean_temp_files()
+    temp_files, temp_size = clean_temp_files(dry_run)
     if temp_files:
-        print(f"   ✅ {len(temp_files)} geçici dosya temizlendi")
+        print(f"   ✅ {len(temp_files)} geçici dosya {done}")
         total_cleaned += len(temp_files)
         total_size += temp_size
     else:
@@ -165,9 +203,9 @@ def run_clean(dry_run=False):
     
     # 2. apps/ dizinini temizle
     print("📦 apps/ dizini temizleniyor...")
-    apps_files, apps_size = clean_apps_directory()
+    apps_files, apps_size = clean_apps_directory(dry_run)
     if apps_files:
-        print(f"   ✅ {len(apps_files)} dosya temizlendi")
+        print(f"   ✅ {len(apps_files)} dosya {done}")
         total_cleaned += len(apps_files)
         total_size += apps_size
     else:
@@ -175,9 +213,9 @@ def run_clean(dry_run=False):
     
     # 3. ~/.clapp dizinini temizle
     print("🏠 ~/.clapp dizini temizleniyor...")
-    config_files, config_size = clean_clapp_config()
+    config_files, config_size = clean_clapp_config(dry_run)
     if config_files:
-        print(f"   ✅ {len(config_files)} öğe temizlendi")
+        print(f"   ✅ {len(config_files)} öğe {done}")
         total_cleaned += len(config_files)
         total_size += config_size
     else:
@@ -186,16 +224,23 @@ def run_clean(dry_run=False):
     # Özet
     print("\n" + "=" * 50)
     print("📊 Temizleme Özeti:")
-    print(f"🗑️  Toplam temizlenen: {total_cleaned} öğe")
-    print(f"💾 Kazanılan alan: {format_size(total_size)}")
+    if dry_run:
+        print(f"🗑️  Toplam temizlenecek: {total_cleaned} öğe")
+        print(f"💾 Kazanılacak alan: {format_size(total_size)}")
+    else:
+        print(f"🗑️  Toplam temizlenen: {total_cleaned} öğe")
+        print(f"💾 Kazanılan alan: {format_size(total_size)}")
     
     if total_cleaned > 0:
-        print("\n✨ Temizlik tamamlandı!")
+        if dry_run:
+            print("\n🔍 Kuru çalıştırma: hiçbir dosya silinmedi")
+        else:
+            print("\n✨ Temizlik tamamlandı!")
         
         # Detaylı liste (ilk 10 dosya)
         all_files = temp_files + apps_files + config_files
         if len(all_files) > 0:
-            print("\n📋 Temizlenen dosyalar:")
+            print("\n📋 Temizlenecek dosyalar:" if dry_run else "\n📋 Temizlenen dosyalar:")
             for i, file_path in enumerate(all_files[:10]):
                 print(f"   • {file_path}")
             
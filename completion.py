@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+completion.py - Arama Önerileri ve Kabuk Tamamlaması
+
+Bu modül paket adları, arama geçmişi ve category:/language: ifadeleri
+üzerinde önek (prefix) tamamlaması yapar:
+- Girdiler anahtara göre sıralı satırlar halinde tutulur; önek araması
+  ikili arama (bisect) ile yapılır, sonuçlar ağırlığa (kurulu olma,
+  arama sayısı, dildeki paket sayısı) göre sıralanır
+- Çok sayıda girdiye uyan kısa öneklerin sonuçları indeks üretilirken
+  hesaplanır; her sorgu sınırlı sayıda satır okur
+- Kabuk tamamlaması için indeks ~/.clapp/cache/completion.idx dosyasına
+  yazılır ve mmap ile okunur
+- `clapp __complete` bu modülü CLI'ın geri kalanını yüklemeden çalıştırır;
+  indeks eskimişse eldeki sonuçlar döndürülür ve yenileme arka planda yapılır
+
+Kabuk kurulumu:
+    eval "$(clapp __complete --script bash)"   # ~/.bashrc
+    eval "$(clapp __complete --script zsh)"    # ~/.zshrc
+
+Bu modül sadece standart kütüphaneyi import eder; indeksi üreten
+kod (registry, kurulu uygulamalar, arama geçmişi) yalnızca yeniden
+oluşturma sırasında yüklenir.
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+COMPLETE_COMMAND = "__complete"
+COMPLETION_FORMAT = 2
+COMPLETION_HEADER = b"#clapp-completion"
+
+# Girdi türleri
+KIND_INSTALLED = "i"
+KIND_PACKAGE = "p"
+KIND_HISTORY = "h"
+KIND_CATEGORY = "c"
+KIND_LANGUAGE = "l"
+
+SEARCH_KINDS = frozenset((KIND_INSTALLED, KIND_PACKAGE, KIND_HISTORY, KIND_CATEGORY, KIND_LANGUAGE))
+PACKAGE_KINDS = frozenset((KIND_INSTALLED, KIND_PACKAGE))
+INSTALLED_KINDS = frozenset((KIND_INSTALLED,))
+
+# Türlerin taban ağırlıkları; geçmiş sorguları arama sayısıyla, diller paket sayısıyla çarpılır
+KIND_WEIGHTS = {
+    KIND_INSTALLED: 3.0,
+    KIND_PACKAGE: 1.0,
+    KIND_HISTORY: 2.0,
+    KIND_CATEGORY: 1.0,
+    KIND_LANGUAGE: 0.5,
+}
+
+# Bir önek için taranacak en fazla satır
+MAX_SCAN_LINES = 4000
+
+# Bu sayıdan fazla satıra uyan önekler için en iyi HOT_LIMIT sonuç indeks
+# üretilirken hesaplanıp ayrı satırlarda saklanır; böylece "c" gibi önekler
+# de taramasız cevaplanır. Uzunluk sınırı yoktur: MAX_SCAN_LINES'tan fazla
+# satıra uyan her önek (uzun ortak önekler dahil) önceden hesaplanmış olur
+HOT_PREFIX_MIN_LINES = 256
+HOT_LIMIT = 50
+HOT_MARKER = b"\x00"
+
+# Aynı anda birden fazla arka plan yenilemesi başlatılmaz
+REBUILD_GRACE_SECONDS = 30
+
+# clapp alt komutları ve argümanlarının tamamlandığı kaynak
+COMMANDS = (
+    "run", "list", "install", "uninstall", "update-apps", "search", "info",
+    "validate", "publish", "remote", "health", "doctor", "clean", "where",
+    "version", "security", "update", "cache", "dependency", "new",
+)
+DEPENDENCY_COMMANDS = ("check", "install", "engine", "tree", "rdeps")
+COMMAND_KINDS = {
+    "run": INSTALLED_KINDS,
+    "uninstall": INSTALLED_KINDS,
+    "update-apps": INSTALLED_KINDS,
+    "info": INSTALLED_KINDS,
+    "where": INSTALLED_KINDS,
+    "install": PACKAGE_KINDS,
+    "search": SEARCH_KINDS,
+}
+MULTI_VALUE_COMMANDS = frozenset(("install",))
+
+# Önceden hesaplanan sonuçların tutulduğu tür kümeleri
+HOT_KIND_SETS = {SEARCH_KINDS: b"s", PACKAGE_KINDS: b"p", INSTALLED_KINDS: b"i"}
+
+BASH_SCRIPT = """_clapp_complete() {
+    local IFS=$'\\n'
+    COMPREPLY=( $(clapp __complete -- "${COMP_WORDS[@]:1:COMP_CWORD}" 2>/dev/null) )
+}
+complete -o default -F _clapp_complete clapp
+"""
+
+ZSH_SCRIPT = """_clapp_complete() {
+    local -a suggestions
+    suggestions=( ${(f)"$(clapp __complete -- "${(@)words[2,CURRENT]}" 2>/dev/null)"} )
+    compadd -Q -- $suggestions
+}
+compdef _clapp_complete clapp
+"""
+
+
+def get_completion_path() -> str:
+    """Kalıcı tamamlama indeksinin yolunu döndürür"""
+    return os.path.join(os.path.expanduser("~"), ".clapp", "cache", "completion.idx")
+
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _clean(text: Any) -> str:
+    # str.split() sekme ve \x1f dahil tüm boşluk karakterlerini ayırır
+    return " ".join(str(text).split())
+
+
+def _rank(weights: Dict[str, float], limit: int) -> List[str]:
+    ranked = sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+    return [display for display, _ in ranked[:limit]]
+
+
+def _hot_lines(records: List[Tuple[bytes, str, float, str]]) -> List[bytes]:
+    """
+    Çok satıra uyan önekler için önceden sıralanmış sonuç satırları
+
+    Önek bir karakter uzatılarak ilerlenir; sadece bir önceki uzunlukta
+    çok satıra uyan grupların içine bakılır (alt önek ancak üst önek
+    yaygınsa yaygın olabilir), bu yüzden uzun ortak önekler de tam taramaya
+    gerek kalmadan kapsanır.
+    """
+    lines = []
+    groups = [records]
+    length = 0
+    while groups:
+        next_groups = []
+        for parent in groups:
+            candidates = [record for record in parent if len(record[0]) >= length]
+            for prefix, group in groupby(candidates, key=lambda record: record[0][:length]):
+                group = list(group)
+                if len(group) < HOT_PREFIX_MIN_LINES:
+                    continue
+                next_groups.append(group)
+                for kinds, set_name in HOT_KIND_SETS.items():
+                    weights: Dict[str, float] = {}
+                    for _, kind, weight, display in group:
+                        if kind in kinds:
+                            weights[display] = max(weight, weights.get(display, weight))
+                    top = "\x1f".join(_rank(weights, HOT_LIMIT)).encode('utf-8')
+                    lines.append(HOT_MARKER + set_name + prefix + b"\t" + top + b"\n")
+        groups = next_groups
+        length += 1
+    return sorted(lines)
+
+
+def build_completion_bytes(entries: Iterable[Tuple[str, str, str, float]],
+                           sources: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Girdilerden sıralı tamamlama indeksi üretir
+
+    Args:
+        entries: (anahtar, tür, gösterilecek metin, ağırlık); anahtar küçük harfe çevrilir
+        sources: İndeksin üretildiği dosyaların stat bilgileri (tazelik kontrolü için)
+
+    Returns:
+        Başlık satırı ve "anahtar<TAB>tür<TAB>ağırlık<TAB>metin" satırları
+    """
+    best: Dict[Tuple[str, str, str], float] = {}
+    for key, kind, display, weight in entries:
+        key, display = _clean(key).lower(), _clean(display)
+        if key and display:
+            best[(key, kind, display)] = max(weight, best.get((key, kind, display), weight))
+
+    records = sorted((key.encode('utf-8'), kind, weight, display)
+                     for (key, kind, display), weight in best.items())
+    lines = [f"{key.decode('utf-8')}\t{kind}\t{weight:g}\t{display}\n".encode('utf-8')
+             for key, kind, weight, display in records]
+
+    header = f"{COMPLETION_HEADER.decode()} {COMPLETION_FORMAT} {json.dumps(sources or {}, sort_keys=True)}\n"
+    return header.encode('utf-8') + b"".join(_hot_lines(records)) + b"".join(lines)
+
+
+class CompletionIndex:
+    """
+    Sıralı satırlar üzerinde önek araması
+
+    Tampon (bytes veya mmap) ayrıştırılmaz; her sorguda yalnızca ikili
+    aramanın dokunduğu ve önekle eşleşen satırlar okunur.
+    """
+
+    def __init__(self, buffer):
+        header_end = buffer.find(b"\n")
+        if header_end < 0 or not buffer[:header_end].startswith(COMPLETION_HEADER):
+            raise ValueError("Tamamlama indeksi tanınmadı")
+
+        _, file_format, sources = bytes(buffer[:header_end]).decode('utf-8').split(" ", 2)
+        if int(file_format) != COMPLETION_FORMAT:
+            raise ValueError(f"Desteklenmeyen tamamlama indeksi biçimi: {file_format}")
+
+        self._buffer = buffer
+        self._data_start = header_end + 1
+        self.sources: Dict[str, Any] = json.loads(sources)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Tuple[str, str, str, float]]) -> "CompletionIndex":
+        """Bellekte tamamlama indeksi oluşturur"""
+        return cls(build_completion_bytes(entries))
+
+    def is_stale(self) -> bool:
+        """İndeksin üretildiği dosyalardan biri değişti mi"""
+        return any(_stat_key(path) != key for path, key in self.sources.items())
+
+    def _line_end(self, start: int) -> int:
+        end = self._buffer.find(b"\n", start)
+        return len(self._buffer) if end < 0 else end
+
+    def _lower_bound(self, prefix: bytes) -> int:
+        """Anahtarı prefix'ten küçük olmayan ilk satırın başlangıcı"""
+        buffer = self._buffer
+        low, high = self._data_start, len(buffer)
+        while low < high:
+            middle = (low + high) // 2
+            start = max(low, buffer.rfind(b"\n", low, middle) + 1)
+            end = self._line_end(start)
+            key_end = buffer.find(b"\t", start, end)
+            if buffer[start:key_end if key_end >= 0 else end] < prefix:
+                low = end + 1
+            else:
+                high = start
+        return low
+
+    def complete(self, prefix: str, limit: int = 10,
+                 kinds: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Önekle başlayan girdileri ağırlığa göre sıralı döndürür
+
+        Args:
+            prefix: Yazılmış kısım (büyük/küçük harf duyarsız)
+            limit: En fazla sonuç sayısı
+            kinds: Sadece bu türlerdeki girdiler (varsayılan: tümü)
+
+        Returns:
+            Gösterilecek metinler (tekrarsız)
+        """
+        allowed = SEARCH_KINDS if kinds is None else frozenset(kinds)
+        key_prefix = _clean(prefix).lower().encode('utf-8')
+        buffer = self._buffer
+
+        # Kısa ve yaygın önekler: önceden hesaplanmış sonuç satırı
+        set_name = HOT_KIND_SETS.get(allowed)
+        if set_name is not None and limit <= HOT_LIMIT:
+            hot_key = HOT_MARKER + set_name + key_prefix
+            position = self._lower_bound(hot_key)
+            end = self._line_end(position)
+            line = bytes(buffer[position:end])
+            if line.startswith(hot_key + b"\t"):
+                top = line[len(hot_key) + 1:].decode('utf-8')
+                return top.split("\x1f")[:limit] if top else []
+
+        position = self._lower_bound(key_prefix)
+        weights: Dict[str, float] = {}
+        scanned = 0
+        while position < len(buffer) and scanned < MAX_SCAN_LINES:
+            end = self._line_end(position)
+            line = bytes(buffer[position:end])
+            position = end + 1
+            scanned += 1
+            if line.startswith(HOT_MARKER):
+                continue
+            if not line.startswith(key_prefix):
+                break
+            _, kind, weight, display = line.decode('utf-8').split("\t", 3)
+            if kind in allowed:
+                weights[display] = max(weights.get(display, 0.0), float(weight))
+
+        return _rank(weights, limit)
+
+
+def open_completion_index(path: Optional[str] = None) -> Optional[CompletionIndex]:
+    """Kalıcı indeksi mmap ile açar; yoksa veya okunamazsa None"""
+    try:
+        with open(path or get_completion_path(), 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+    try:
+        return CompletionIndex(mapped)
+    except ValueError:
+        mapped.close()
+        return None
+
+
+def suggestion_entries(packages: Iterable[Tuple[str, Dict[str, Any]]],
+                       history: Dict[str, int],
+                       categories: Iterable[str]) -> List[Tuple[str, str, str, float]]:
+    """
+    Tamamlama girdilerini üretir
+
+    Args:
+        packages: (tür, paket) çiftleri; tür KIND_INSTALLED veya KIND_PACKAGE
+        history: sorgu -> arama sayısı
+        categories: Kategori adları
+
+    Returns:
+        build_completion_bytes için (anahtar, tür, metin, ağırlık) listesi
+    """
+    entries: List[Tuple[str, str, str, float]] = []
+    language_counts: Dict[str, int] = {}
+
+    for kind, package in packages:
+        name = package.get('name')
+        if not name:
+            continue
+        entries.append((name, kind, name, KIND_WEIGHTS[kind]))
+        language = str(package.get('language', '')).lower()
+        if language:
+            language_counts[language] = language_counts.get(language, 0) + 1
+
+    for query, count in history.items():
+        entries.append((query, KIND_HISTORY, query, KIND_WEIGHTS[KIND_HISTORY] * count))
+
+    # category:/language: ifadeleri hem tam haliyle hem de sadece adıyla bulunur
+    for category in categories:
+        token = f"category:{category}"
+        entries.append((token, KIND_CATEGORY, token, KIND_WEIGHTS[KIND_CATEGORY]))
+        entries.append((category, KIND_CATEGORY, token, KIND_WEIGHTS[KIND_CATEGORY]))
+
+    for language, count in language_counts.items():
+        token = f"language:{language}"
+        weight = KIND_WEIGHTS[KIND_LANGUAGE] * count
+        entries.append((token, KIND_LANGUAGE, token, weight))
+        entries.append((language, KIND_LANGUAGE, token, weight))
+
+    return entries
+
+
+def collect_completion_entries() -> Tuple[List[Tuple[str, str, str, float]], Dict[str, Any]]:
+    """
+    Kurulu uygulamalar, registry snapshot'ları ve arama geçmişinden girdileri toplar
+
+    Ağa çıkılmaz; registry için sadece disk snapshot'ları okunur.
+
+    Returns:
+        (girdiler, kaynak dosyaların stat bilgileri)
+    """
+    from registry_client import DEFAULT_INDEX_URL, RegistryClient, RegistryError
+    from remote_registry import REMOTE_PACKAGES_URL
+    from installed_index import get_apps_directory, get_index_path, get_installed_index
+    from smart_search import SEARCH_CATEGORIES, SearchHistory, get_history_file
+
+    packages: List[Tuple[str, Dict[str, Any]]] = []
+    source_paths = [get_index_path(), get_apps_directory()]
+
+    for entry in get_installed_index().entries().values():
+        if entry.get('valid'):
+            packages.append((KIND_INSTALLED, entry['manifest']))
+
+    for url in (DEFAULT_INDEX_URL, REMOTE_PACKAGES_URL):
+        client = RegistryClient(url, offline=True)
+        source_paths.append(str(client.body_file))
+        try:
+            data, _ = client.fetch()
+        except RegistryError:
+            continue
+        if isinstance(data, list):
+            packages.extend((KIND_PACKAGE, package) for package in data if isinstance(package, dict))
+
+    history = SearchHistory(get_history_file())
+    source_paths += [str(history.summary_file), str(history.log_file)]
+    counts = {query: record["count"] for query, record in history.queries.items()}
+
+    entries = suggestion_entries(packages, counts, SEARCH_CATEGORIES)
+    sources = {path: _stat_key(path) for path in source_paths}
+    return entries, sources
+
+
+def rebuild_completion_index(path: Optional[str] = None) -> int:
+    """
+    Kalıcı tamamlama indeksini yeniden oluşturur (atomik yazma)
+
+    Returns:
+        Yazılan bayt sayısı
+    """
+    path = path or get_completion_path()
+    entries, sources = collect_completion_entries()
+    data = build_completion_bytes(entries, sources)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return len(data)
+
+
+def _spawn_rebuild(path: str):
+    """İndeksi arka planda yeniden oluşturan süreç başlatır (zaten çalışıyorsa başlatmaz)"""
+    marker = f"{path}.rebuilding"
+    try:
+        if time.time() - os.stat(marker).st_mtime < REBUILD_GRACE_SECONDS:
+            return
+    except OSError:
+        pass
+
+    try:
+        import subprocess
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(marker, 'w'):
+            pass
+        options = {}
+        if os.name == 'nt':
+            options['creationflags'] = getattr(subprocess, 'DETACHED_PROCESS', 0)
+        else:
+            options['start_new_session'] = True
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "rebuild"],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, **options)
+    except OSError:
+        pass
+
+
+def complete_words(words: List[str], index: Optional[CompletionIndex], limit: int = 50) -> List[str]:
+    """
+    Komut satırındaki kelimelere göre tamamlama adaylarını döndürür
+
+    Args:
+        words: 'clapp'ten sonraki kelimeler; sonuncusu tamamlanmakta olan kısımdır
+        index: Tamamlama indeksi (None ise sadece komut adları tamamlanır)
+        limit: En fazla aday sayısı
+    """
+    if not words:
+        words = [""]
+    current = words[-1]
+    previous = [word for word in words[:-1] if not word.startswith("-")]
+
+    if not previous:
+        return [command for command in COMMANDS if command.startswith(current)]
+
+    command, arguments = previous[0], previous[1:]
+    if command == "dependency":
+        if not arguments:
+            return [sub for sub in DEPENDENCY_COMMANDS if sub.startswith(current)]
+        kinds, arguments = INSTALLED_KINDS, arguments[1:]
+    else:
+        kinds = COMMAND_KINDS.get(command)
+
+    if kinds is None or index is None or current.startswith("-"):
+        return []
+    # Tek değer alan komutlarda ilk argümandan sonra tamamlama yapılmaz
+    if arguments and command not in MULTI_VALUE_COMMANDS:
+        return []
+    return index.complete(current, limit, kinds)
+
+
+def complete_main(argv: List[str]) -> int:
+    """
+    `clapp __complete` giriş noktası
+
+    Kullanım:
+        clapp __complete -- <kelimeler...>   Adayları satır satır yazar
+        clapp __complete --script bash|zsh   Kabuk tamamlama betiğini yazar
+        clapp __complete --rebuild           İndeksi hemen yeniden oluşturur
+    """
+    if argv[:1] == ["--script"]:
+        shell = argv[1] if len(argv) > 1 else "bash"
+        sys.stdout.write(ZSH_SCRIPT if shell == "zsh" else BASH_SCRIPT)
+        return 0
+
+    if argv[:1] == ["--rebuild"]:
+        size = rebuild_completion_index()
+        print(f"✅ Tamamlama indeksi oluşturuldu ({size} bayt)")
+        return 0
+
+    if argv[:1] == ["--"]:
+        argv = argv[1:]
+
+    path = get_completion_path()
+    index = open_completion_index(path)
+    if index is None or index.is_stale():
+        _spawn_rebuild(path)
+
+    candidates = complete_words(argv, index)
+    if candidates:
+        sys.stdout.write("\n".join(candidates) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["rebuild"]:
+        path = get_completion_path()
+        try:
+            rebuild_completion_index(path)
+        finally:
+            try:
+                os.remove(f"{path}.rebuilding")
+            except OSError:
+                pass
+    else:
+        sys.exit(complete_main(sys.argv[1:]))
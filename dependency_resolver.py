@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 import json
 import subprocess
@@ -63,52 +64,347 @@ def check_app_dependencies(app_name):
     
     return missing_dependencies, dependency_info
 
+# find_cycles varsayılan üst sınırı; yoğun graflarda döngü sayısı üstel büyür
+MAX_REPORTED_CYCLES = 1000
+
+class DependencyGraph:
+    """
+    Uygulama bağımlılık grafı
+    
+    Her düğüm bir kez, önbellekteki manifest'lerden oluşturulur. Topolojik
+    sıra Kahn algoritmasıyla, döngüler güçlü bağlı bileşenler (Tarjan) içinde
+    Johnson algoritmasıyla bulunur. Ağaçlar düğüm başına bir kez hesaplanıp
+    paylaşılır; böylece elmas bağımlılıklar tekrar tekrar açılmaz.
+    """
+    
+    def __init__(self, manifests):
+        """
+        Args:
+            manifests (dict): Uygulama adı -> manifest
+        """
+        self.manifests = manifests
+        self.edges = {}
+        self.missing = {}
+        
+        for name, manifest in manifests.items():
+            present, absent = [], []
+            for dep in manifest.get('dependencies', []) or []:
+                if not isinstance(dep, str):
+                    continue
+                (present if dep in manifests else absent).append(dep)
+            self.edges[name] = list(dict.fromkeys(present))
+            self.missing[name] = list(dict.fromkeys(absent))
+        
+        self._reverse = None
+        self._cycle_nodes = None
+        self._trees = {}
+    
+    @classmethod
+    def from_installed(cls):
+        """Kurulu uygulama indeksinden graf oluşturur (manifest'ler yeniden okunmaz)"""
+        from installed_index import get_installed_index
+        
+        get_apps_directory()
+        manifests = {
+            name: entry['manifest']
+            for name, entry in get_installed_index().entries().items()
+            if entry.get('valid')
+        }
+        return cls(manifests)
+    
+    def __contains__(self, name):
+        return name in self.manifests
+    
+    def reverse_edges(self):
+        """Uygulama adı -> ona doğrudan bağımlı uygulamalar"""
+        if self._reverse is None:
+            reverse = {name: [] for name in self.manifests}
+            for name, deps in self.edges.items():
+                for dep in deps:
+                    reverse[dep].append(name)
+            self._reverse = reverse
+        return self._reverse
+    
+    def _walk(self, roots, edges):
+        """roots'tan edges üzerinden erişilebilen tüm düğümler (roots dahil)"""
+        seen = set()
+        stack = [root for root in roots if root in self.manifests]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(dep for dep in edges[node] if dep not in seen)
+        return seen
+    
+    def closure(self, name):
+        """Uygulamanın tüm (dolaylı) bağımlılıkları, kendisi hariç"""
+        return self._walk([name], self.edges) - {name}
+    
+    def reverse_dependencies(self, name, transitive=False):
+        """
+        Uygulamaya bağımlı olan uygulamaları döndürür
+        
+        Args:
+            name (str): Uygulama adı
+            transitive (bool): Dolaylı bağımlıları da dahil et
+            
+        Returns:
+            list: Bağımlı uygulamalar (alfabetik)
+        """
+        reverse = self.reverse_edges()
+        if name not in reverse:
+            return []
+        if not transitive:
+            return sorted(reverse[name])
+        return sorted(self._walk([name], reverse) - {name})
+    
+    def topological_order(self, nodes=None):
+        """
+        Kahn algoritmasıyla bağımlılıklar önce gelecek şekilde sıralar
+        
+        Args:
+            nodes (iterable): Sıralanacak düğümler (varsayılan: tümü)
+            
+        Returns:
+            tuple: (order: list, cyclic: list) - döngüdeki düğümler sıraya girmez
+        """
+        nodes = set(self.manifests) if nodes is None else set(nodes) & set(self.manifests)
+        indegree = {node: 0 for node in nodes}
+        dependents = {node: [] for node in nodes}
+        for node in nodes:
+            for dep in self.edges[node]:
+                if dep in nodes:
+                    indegree[node] += 1
+                    dependents[dep].append(node)
+        
+        # Aynı seviyedeki düğümler alfabetik (deterministik çıktı)
+        import heapq
+        ready = [node for node, count in indegree.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            node = heapq.heappop(ready)
+            order.append(node)
+            for dependent in dependents[node]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+        
+        cyclic = sorted(node for node, count in indegree.items() if count > 0)
+        return order, cyclic
+    
+    def find_cycles(self, nodes=None, limit=MAX_REPORTED_CYCLES):
+        """
+        Döngüsel bağımlılıkları tam yollarıyla döndürür
+        
+        Her güçlü bağlı bileşendeki tüm temel döngüler (Johnson algoritması)
+        ve kendine bağımlı uygulamalar verilir. Her yol döngünün alfabetik
+        olarak en küçük düğümüyle başlar ve biter, ör. ['a', 'b', 'c', 'a'].
+        Yoğun bileşenlerde döngü sayısı üstel büyüyebildiği için en fazla
+        limit döngü döndürülür.
+        
+        Args:
+            nodes (iterable): İncelenecek düğümler (varsayılan: tümü)
+            limit (int): En fazla döndürülecek döngü sayısı (None: sınırsız)
+            
+        Returns:
+            list: Döngü yollarının listesi
+        """
+        nodes = set(self.manifests) if nodes is None else set(nodes) & set(self.manifests)
+        
+        cycles = []
+        components = self._components(nodes)
+        while components and (limit is None or len(cycles) < limit):
+            component = set(components.pop())
+            start = min(component)
+            if len(component) == 1:
+                if start in self.edges[start]:
+                    cycles.append([start, start])
+                continue
+            for cycle in self._cycles_through(start, component):
+                cycles.append(cycle)
+                if limit is not None and len(cycles) >= limit:
+                    break
+            # start'tan geçen döngüler bitti; kalan düğümlerin bileşenleri
+            component.discard(start)
+            components.extend(self._components(component))
+        
+        return sorted(cycles)
+    
+    def _components(self, nodes):
+        """nodes ile sınırlı alt grafın güçlü bağlı bileşenleri (Tarjan)"""
+        # Yinelemeli: özyineleme sınırına takılmadan binlerce düğüm
+        index_of, lowlink = {}, {}
+        on_stack, stack, components = set(), [], []
+        counter = 0
+        
+        for root in sorted(nodes):
+            if root in index_of:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child_index = work.pop()
+                if child_index == 0:
+                    index_of[node] = lowlink[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack.add(node)
+                
+                children = [dep for dep in self.edges[node] if dep in nodes]
+                for i in range(child_index, len(children)):
+                    dep = children[i]
+                    if dep not in index_of:
+                        work.append((node, i + 1))
+                        work.append((dep, 0))
+                        break
+                    if dep in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[dep])
+                else:
+                    if lowlink[node] == index_of[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+        
+        return components
+    
+    def _cycles_through(self, start, members):
+        """Bileşen içinde start'tan geçen tüm temel döngüler (Johnson devresi)"""
+        def neighbours(node):
+            return [dep for dep in self.edges[node] if dep in members]
+        
+        path = [start]
+        blocked = {start}
+        blocked_by = {}
+        closed = set()
+        stack = [(start, neighbours(start))]
+        while stack:
+            node, pending = stack[-1]
+            if pending:
+                dep = pending.pop()
+                if dep == start:
+                    yield path + [start]
+                    closed.update(path)
+                elif dep not in blocked:
+                    path.append(dep)
+                    stack.append((dep, neighbours(dep)))
+                    closed.discard(dep)
+                    blocked.add(dep)
+                continue
+            
+            if node in closed:
+                # Döngüye ulaşan düğüm ve onu bekleyenler yeniden açılır
+                unblock = [node]
+                while unblock:
+                    member = unblock.pop()
+                    if member in blocked:
+                        blocked.discard(member)
+                        unblock.extend(blocked_by.pop(member, ()))
+            else:
+                for dep in neighbours(node):
+                    blocked_by.setdefault(dep, set()).add(node)
+            stack.pop()
+            path.pop()
+    
+    def _in_cycle(self, name):
+        if self._cycle_nodes is None:
+            cycle_nodes = set()
+            for component in self._components(set(self.manifests)):
+                if len(component) > 1 or component[0] in self.edges[component[0]]:
+                    cycle_nodes.update(component)
+            self._cycle_nodes = cycle_nodes
+        return name in self._cycle_nodes
+    
+    def tree(self, name):
+        """
+        Uygulamanın bağımlılık ağacını döndürür
+        
+        Döngüsüz düğümlerin alt ağaçları bir kez oluşturulup paylaşılır.
+        Döngüye geri dönen kenarlar {"name", "cycle": True} düğümüyle gösterilir.
+        
+        Returns:
+            dict: Bağımlılık ağacı veya {"error": ...}
+        """
+        if name not in self.manifests:
+            return {"error": f"Uygulama '{name}' bulunamadı"}
+        
+        # Uzun zincirlerde özyineleme derinliğini aşmamak için alt ağaçları
+        # yapraklardan başlayarak (topolojik sırayla) önbelleğe al
+        order, _ = self.topological_order(self.closure(name))
+        for dep in order:
+            if not self._in_cycle(dep):
+                self._build_tree(dep, ())
+        
+        return self._build_tree(name, ())
+    
+    def _build_tree(self, name, path):
+        if name in self._trees:
+            return self._trees[name]
+        
+        manifest = self.manifests[name]
+        node = {
+            "name": name,
+            "version": manifest.get('version', '0.0.0'),
+            "language": manifest.get('language', 'unknown'),
+            "dependencies": [],
+            "missing_dependencies": list(self.missing[name])
+        }
+        path = path + (name,)
+        
+        for dep in self.edges[name]:
+            if dep in path:
+                node["dependencies"].append({
+                    "name": dep,
+                    "version": self.manifests[dep].get('version', '0.0.0'),
+                    "language": self.manifests[dep].get('language', 'unknown'),
+                    "dependencies": [],
+                    "missing_dependencies": [],
+                    "cycle": True
+                })
+            else:
+                node["dependencies"].append(self._build_tree(dep, path))
+        
+        if not self._in_cycle(name):
+            self._trees[name] = node
+        return node
+
+def get_dependency_graph():
+    """Kurulu uygulamalar için bağımlılık grafı döndürür"""
+    return DependencyGraph.from_installed()
+
 def get_dependency_tree(app_name, visited=None):
     """
     Uygulamanın bağımlılık ağacını oluşturur.
     
     Args:
         app_name (str): Uygulama adı
-        visited (set): Ziyaret edilen uygulamalar (döngüsel bağımlılık kontrolü için)
+        visited (set): Geriye dönük uyumluluk için; kullanılmaz
         
     Returns:
         dict: Bağımlılık ağacı
     """
-    if visited is None:
-        visited = set()
-    
-    # Döngüsel bağımlılık kontrolü
-    if app_name in visited:
-        return {"error": f"Döngüsel bağımlılık tespit edildi: {app_name}"}
-    
-    visited.add(app_name)
-    
-    # Uygulama manifest'ini al
-    manifest = get_manifest(app_name)
-    
-    if not manifest:
-        return {"error": f"Uygulama '{app_name}' bulunamadı"}
-    
-    # Bağımlılık ağacını oluştur
-    tree = {
-        "name": app_name,
-        "version": manifest.get('version', '0.0.0'),
-        "language": manifest.get('language', 'unknown'),
-        "dependencies": [],
-        "missing_dependencies": []
-    }
-    
-    dependencies = manifest.get('dependencies', [])
-    
-    for dep in dependencies:
-        if app_exists(dep):
-            # Bağımlılığın kendi ağacını al
-            dep_tree = get_dependency_tree(dep, visited.copy())
-            tree["dependencies"].append(dep_tree)
-        else:
-            tree["missing_dependencies"].append(dep)
+    return get_dependency_graph().tree(app_name)
+
+def get_reverse_dependencies(app_name, transitive=False):
+    """
+    Uygulamaya bağımlı olan kurulu uygulamaları döndürür.
     
-    return tree
+    Args:
+        app_name (str): Uygulama adı
+        transitive (bool): Dolaylı bağımlıları da dahil et
+        
+    Returns:
+        list: Bağımlı uygulama adları
+    """
+    return get_dependency_graph().reverse_dependencies(app_name, transitive)
 
 def resolve_all_dependencies(app_name):
     """
@@ -130,8 +426,10 @@ def resolve_all_dependencies(app_name):
         "resolution_order": []
     }
     
+    graph = get_dependency_graph()
+    
     # Bağımlılık ağacını al
-    tree = get_dependency_tree(app_name)
+    tree = graph.tree(app_name)
     result["dependency_tree"] = tree
     
     if "error" in tree:
@@ -139,26 +437,24 @@ def resolve_all_dependencies(app_name):
         return result
     
     # Tüm bağımlılıkları topla
-    def collect_dependencies(node, all_deps, missing_deps):
-        if "dependencies" in node:
-            for dep in node["dependencies"]:
-                all_deps.add(dep["name"])
-                collect_dependencies(dep, all_deps, missing_deps)
-        
-        if "missing_dependencies" in node:
-            for missing in node["missing_dependencies"]:
-                missing_deps.add(missing)
+    closure = graph.closure(app_name)
+    result["all_dependencies"] = closure
+    for node in closure | {app_name}:
+        result["missing_dependencies"].update(graph.missing[node])
     
-    collect_dependencies(tree, result["all_dependencies"], result["missing_dependencies"])
+    result["circular_dependencies"] = graph.find_cycles(closure | {app_name})
     
     # Durum belirleme
-    if result["missing_dependencies"]:
+    if result["circular_dependencies"]:
+        result["status"] = "circular_dependencies"
+    elif result["missing_dependencies"]:
         result["status"] = "missing_dependencies"
     else:
         result["status"] = "resolved"
     
-    # Çözümleme sırası (topological sort benzeri)
-    result["resolution_order"] = list(result["all_dependencies"])
+    # Çözümleme sırası: bağımlılıklar kendilerine bağımlı olanlardan önce
+    order, _ = graph.topological_order(closure)
+    result["resolution_order"] = order
     
     return result
 
@@ -272,10 +568,83 @@ def get_system_dependency_report():
     
     return report
 
+REQUIREMENT_PATTERN = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*([^;]*?)\s*(;.*)?$")
+
+def parse_requirement(spec):
+    """
+    pip gereksinim ifadesini ayrıştırır (ör. 'PyQt6==6.6.1', 'requests>=2; python_version>"3.8"').
+    
+    packaging kuruluysa onu, değilse basit bir düzenli ifadeyi kullanır.
+    
+    Args:
+        spec (str): Gereksinim ifadesi
+        
+    Returns:
+        dict or None: {'name', 'specifier', 'applies'} veya None (geçersizse)
+    """
+    try:
+        from packaging.requirements import Requirement, InvalidRequirement
+    except ImportError:
+        Requirement = None
+    
+    if Requirement is not None:
+        try:
+            requirement = Requirement(spec)
+        except InvalidRequirement:
+            return None
+        applies = requirement.marker.evaluate() if requirement.marker else True
+        return {'name': requirement.name, 'specifier': str(requirement.specifier), 'applies': applies}
+    
+    match = REQUIREMENT_PATTERN.match(spec)
+    if not match:
+        return None
+    return {'name': match.group(1), 'specifier': match.group(3).replace(' ', ''), 'applies': True}
+
+def is_requirement_satisfied(requirement):
+    """
+    Gereksinimin kurulu olup olmadığını paketi import etmeden kontrol eder.
+    
+    Dağıtım adı importlib.metadata ile aranır; sürüm kısıtı varsa
+    packaging ile (yoksa sadece '==' için) karşılaştırılır.
+    
+    Args:
+        requirement (dict): parse_requirement çıktısı
+        
+    Returns:
+        bool: Kurulu ve sürüm kısıtını sağlıyorsa True
+    """
+    from importlib import metadata
+    
+    try:
+        installed_version = metadata.version(requirement['name'])
+    except metadata.PackageNotFoundError:
+        return False
+    
+    specifier = requirement['specifier']
+    if not specifier:
+        return True
+    
+    try:
+        from packaging.specifiers import SpecifierSet
+        return SpecifierSet(specifier).contains(installed_version, prereleases=True)
+    except ImportError:
+        if specifier.startswith('==') and ',' not in specifier:
+            return installed_version == specifier[2:]
+        return True
+    except Exception:
+        return True
+
 def check_and_install_python_dependencies(app_path):
     """
     Python uygulamasının bağımlılıklarını kontrol eder ve eksik olanları kurar.
     
+    Kurulu olma durumu paket import edilmeden importlib.metadata ile
+    kontrol edilir; eksik gereksinimlerin tümü tek bir pip çağrısıyla kurulur.
+    Gereksinimler clapp uygulama adlarıyla filtrelenmez: aynı adlı bir
+    uygulamanın kurulu olması Python paketinin kurulu olduğu anlamına gelmez.
+    Uygulama bağımlılıkları ayrıca check_dependencies ve kurulum sırasında
+    index üzerinden (install_command.resolve_install_order) ele alınır.
+    
     Args:
         app_path (str): Uygulama dizini
         
@@ -302,39 +671,38 @@ def check_and_install_python_dependencies(app_path):
     # 1. İlk olarak inline dependencies kontrol et
     dependencies = manifest.get('dependencies', [])
     for pkg in dependencies:
-        try:
-            importlib.import_module(pkg)
-        except ImportError:
+        if not isinstance(pkg, str):
+            continue
+        
+        requirement = parse_requirement(pkg)
+        if requirement is None:
+            print(f"⚠️  Geçersiz bağımlılık ifadesi atlandı: {pkg}")
+            continue
+        
+        if requirement['applies'] and not is_requirement_satisfied(requirement):
             missing_packages.append(pkg)
-            try:
-                print(f"📦 {pkg} kuruluyor...")
-                result = run_command_safely([sys.executable, "-m", "pip", "install", pkg], 
-                                      capture_output=True, text=True, timeout=60)
-                if result.returncode == 0:
-                    print(f"✅ {pkg} başarıyla kuruldu")
-                else:
-                    print(f"❌ {pkg} kurulumu başarısız: {result.stderr}")
-            except Exception as e:
-                print(f"❌ {pkg} kurulum hatası: {e}")
     
-    # 2. requirements.txt dosyasını kontrol et (fallback)
+    if not missing_packages:
+        return True, "Tüm bağımlılıklar zaten kurulu", []
+    
+    # 2. Eksiklerin tümü (ve varsa requirements.txt) tek pip çağrısıyla kurulur
+    command = [sys.executable, "-m", "pip", "install"] + missing_packages
     req_txt_path = Path(app_path) / "requirements.txt"
-    if req_txt_path.exists() and missing_packages:
-        try:
-            print(f"📦 requirements.txt dosyasından bağımlılıklar kuruluyor...")
-            result = run_command_safely([sys.executable, "-m", "pip", "install", "-r", str(req_txt_path)], 
-                                      capture_output=True, text=True, timeout=120)
-            if result.returncode == 0:
-                print("✅ requirements.txt bağımlılıkları kuruldu")
-            else:
-                print(f"❌ requirements.txt kurulum hatası: {result.stderr}")
-        except Exception as e:
-            print(f"❌ requirements.txt kurulum hatası: {e}")
+    if req_txt_path.exists():
+        command += ["-r", str(req_txt_path)]
     
-    if missing_packages:
-        return True, f"{len(missing_packages)} bağımlılık kuruldu", missing_packages
-    else:
-        return True, "Tüm bağımlılıklar zaten kurulu", []
+    print(f"📦 {len(missing_packages)} bağımlılık kuruluyor: {', '.join(missing_packages)}")
+    try:
+        result = run_command_safely(command, capture_output=True, text=True,
+                                    timeout=120 + 30 * len(missing_packages))
+    except Exception as e:
+        return False, f"pip çalıştırılamadı: {e}", missing_packages
+    
+    if result.returncode != 0:
+        error_lines = (result.stderr or result.stdout or "").strip().splitlines()
+        return False, f"pip kurulumu başarısız: {' '.join(error_lines[-3:])}", missing_packages
+    
+    return True, f"{len(missing_packages)} bağımlılık kuruldu", missing_packages
 
 def check_and_install_lua_dependencies(app_path):
     """
@@ -684,9 +1052,22 @@ def handle_dependency_tree(args):
     
     tree = resolution["dependency_tree"]
     
+    printed = set()
+    
     def print_tree(node, level=0):
         indent = "  " * level
+        if node.get("cycle"):
+            print(f"{indent}🔁 {node['name']} (döngüsel bağımlılık)")
+            return
+        
         status = "✅" if node.get("missing_dependencies") == [] else "❌"
+        
+        # Paylaşılan alt ağaçlar (elmas bağımlılıklar) bir kez açılır
+        if node['name'] in printed and node.get("dependencies"):
+            print(f"{indent}{status} {node['name']} (v{node['version']}) [{node['language']}] (yukarıda gösterildi)")
+            return
+        printed.add(node['name'])
+        
         print(f"{indent}{status} {node['name']} (v{node['version']}) [{node['language']}]")
         
         if node.get("missing_dependencies"):
@@ -703,8 +1084,44 @@ def handle_dependency_tree(args):
     print(f"  - Toplam Bağımlılık: {len(resolution['all_dependencies'])}")
     print(f"  - Eksik: {len(resolution['missing_dependencies'])}")
     
+    if resolution["resolution_order"]:
+        print(f"  - Kurulum sırası: {' → '.join(resolution['resolution_order'])}")
+    
+    for cycle in resolution["circular_dependencies"]:
+        print(f"  - 🔁 Döngü: {' → '.join(cycle)}")
+    
     return True, "Bağımlılık ağacı gösterildi"
 
+def handle_dependency_rdeps(args):
+    """Ters bağımlılık (kim bu uygulamaya bağımlı) komutunu işler"""
+    app_name = args.app_name
+    
+    graph = get_dependency_graph()
+    if app_name not in graph:
+        print(f"❌ Uygulama '{app_name}' bulunamadı")
+        return False, "Uygulama bulunamadı"
+    
+    direct = graph.reverse_dependencies(app_name)
+    transitive = graph.reverse_dependencies(app_name, transitive=True)
+    
+    print(f"🔗 {app_name} uygulamasına bağımlı olanlar")
+    print("=" * 50)
+    
+    if not transitive:
+        print("✅ Hiçbir uygulama bu uygulamaya bağımlı değil")
+        return True, "Ters bağımlılık yok"
+    
+    for name in direct:
+        print(f"  📦 {name}")
+    
+    indirect = [name for name in transitive if name not in direct]
+    if indirect:
+        print("\n  Dolaylı:")
+        for name in indirect:
+            print(f"  📦 {name}")
+    
+    return True, "Ters bağımlılıklar gösterildi"
+
 if __name__ == "__main__":
     # Test için örnek kullanım
     print("Sistem bağımlılık raporu:")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+file_hasher.py - Ortak Dosya Hash Servisi
+
+Bu modül clapp'te dosya hash'i hesaplayan tüm yolların (cache checksum,
+index üretimi, wheel deposu) kullandığı tek servistir:
+- Sonuçlar CacheManager "checksum" türünde saklanır ve (boyut, mtime_ns,
+  inode) ile doğrulanır; dosya değişmediyse yeniden okunmaz
+- Büyük dosyalar mmap ile, küçükler büyük tamponla okunur
+- Çok sayıda dosya thread havuzunda hash'lenir (hashlib büyük bloklarda
+  GIL'i bırakır)
+
+Stat imzası mtime geri alınarak (os.utime) taklit edilebilir. Bu yüzden
+indirilen arşivlerin, imzaların ve yeniden kullanılan kurulu dosyaların
+doğrulaması hash_file yerine compute_file_hash ile yapılır.
+"""
+
+import os
+import mmap
+import hashlib
+import threading
+import concurrent.futures
+from typing import Dict, Iterable, Optional, Tuple
+
+# Bu boyuttan büyük dosyalar mmap ile okunur
+MMAP_THRESHOLD = 8 * 1024 * 1024
+READ_BUFFER_SIZE = 1024 * 1024
+MMAP_BLOCK_SIZE = 64 * 1024 * 1024
+
+# Kullanılmayan kayıtlar bu süreden sonra düşer (geçerlilik stat ile kontrol edilir)
+CHECKSUM_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def _stat_signature(st: os.stat_result) -> Tuple[int, int, int]:
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def compute_file_hash(file_path: str, algorithm: str = "sha256") -> str:
+    """
+    Dosyanın hash'ini cache kullanmadan hesaplar
+
+    Args:
+        file_path: Dosya yolu
+        algorithm: hashlib algoritma adı
+
+    Returns:
+        Hex formatında hash
+    """
+    hasher = hashlib.new(algorithm)
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, MMAP_BLOCK_SIZE):
+                        hasher.update(view[offset:offset + MMAP_BLOCK_SIZE])
+                finally:
+                    view.release()
+        else:
+            for chunk in iter(lambda: f.read(READ_BUFFER_SIZE), b""):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class FileHasher:
+    """Stat ile doğrulanan kalıcı cache'e sahip dosya hash servisi"""
+
+    def __init__(self, cache_manager=None, algorithm: str = "sha256"):
+        """
+        FileHasher başlatıcısı
+
+        Args:
+            cache_manager: Kullanılacak CacheManager (varsayılan: süreç kapsamlı örnek)
+            algorithm: hashlib algoritma adı
+        """
+        if cache_manager is None:
+            from cache_manager import get_default_cache_manager
+            cache_manager = get_default_cache_manager()
+
+        self.cache_manager = cache_manager
+        self.algorithm = algorithm
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def _cache_key(self, real_path: str) -> str:
+        return hashlib.blake2b(f"{self.algorithm}\n{real_path}".encode('utf-8'),
+                               digest_size=16).hexdigest()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def hash_file(self, file_path: str) -> str:
+        """
+        Dosyanın hash'ini döndürür; dosya değişmediyse cache'ten
+
+        Raises:
+            OSError: Dosya okunamazsa
+        """
+        real_path = os.path.realpath(file_path)
+        st = os.stat(real_path)
+        signature = _stat_signature(st)
+        cache_key = self._cache_key(real_path)
+
+        # Kayıt biçimi: "<boyut> <mtime_ns> <inode> <hash>"
+        cached = self.cache_manager.get(cache_key, "checksum", max_age=CHECKSUM_MAX_AGE)
+        if cached:
+            parts = cached.split()
+            if len(parts) == 4 and tuple(int(part) for part in parts[:3]) == signature:
+                self._count("hits")
+                return parts[3]
+
+        self._count("misses")
+        digest = compute_file_hash(real_path, self.algorithm)
+
+        # Okuma sırasında değişen dosyanın sonucu saklanmaz
+        if _stat_signature(os.stat(real_path)) == signature:
+            self.cache_manager.set(cache_key, f"{signature[0]} {signature[1]} {signature[2]} {digest}",
+                                   "checksum")
+        return digest
+
+    def hash_files(self, file_paths: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, str]:
+        """
+        Birden fazla dosyayı thread havuzunda hash'ler
+
+        Args:
+            file_paths: Dosya yolları
+            max_workers: İşçi sayısı (varsayılan: min(8, CPU sayısı))
+
+        Returns:
+            Dict[yol, hash]; okunamayan dosyalar sonuçta yer almaz
+        """
+        paths = list(dict.fromkeys(file_paths))
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 1)
+
+        results = {}
+        if len(paths) <= 1 or max_workers <= 1:
+            for path in paths:
+                try:
+                    results[path] = self.hash_file(path)
+                except OSError:
+                    continue
+            return results
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.hash_file, path): path for path in paths}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except OSError:
+                    continue
+        return results
+
+
+_hashers: Dict[str, FileHasher] = {}
+_hashers_lock = threading.Lock()
+
+
+def get_file_hasher(algorithm: str = "sha256") -> FileHasher:
+    """Algoritma için süreç kapsamlı FileHasher döndürür"""
+    hasher = _hashers.get(algorithm)
+    if hasher is None:
+        with _hashers_lock:
+            hasher = _hashers.get(algorithm)
+            if hasher is None:
+                hasher = FileHasher(algorithm=algorithm)
+                _hashers[algorithm] = hasher
+    return hasher
+
+
+def hash_file(file_path: str, algorithm: str = "sha256") -> str:
+    """Dosyanın hash'ini döndürür (bkz. FileHasher.hash_file)"""
+    return get_file_hasher(algorithm).hash_file(file_path)
+
+
+def hash_files(file_paths: Iterable[str], algorithm: str = "sha256",
+               max_workers: Optional[int] = None) -> Dict[str, str]:
+    """Dosyaları paralel hash'ler (bkz. FileHasher.hash_files)"""
+    return get_file_hasher(algorithm).hash_files(file_paths, max_workers)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+file_lock.py - Dosya Tabanlı Danışma Kilidi
+
+Tek bir kilit dosyası üzerinde süreçler ve thread'ler arası özel kilit
+sağlar (fcntl.flock / msvcrt.locking). Kilit dosyası korunan dosyanın
+yanında tutulur, ör. installed.json için installed.json.lock.
+
+Aynı süreçteki thread'ler için kilit dosyası yolu başına ayrıca bir
+threading.Lock kullanılır. Kilit yeniden girilebilir değildir; aynı
+thread içinde iç içe alınmamalıdır.
+"""
+
+import os
+import threading
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path: str) -> threading.Lock:
+    with _thread_locks_guard:
+        lock = _thread_locks.get(path)
+        if lock is None:
+            lock = _thread_locks[path] = threading.Lock()
+        return lock
+
+
+class FileLock:
+    """Kilit dosyası üzerinde özel danışma kilidi"""
+
+    def __init__(self, path: str):
+        """
+        FileLock başlatıcısı
+
+        Args:
+            path: Kilit dosyası yolu (yoksa oluşturulur)
+        """
+        self.path = os.path.abspath(str(path))
+        self.thread_lock = _thread_lock(self.path)
+        self._file = None
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, 'a+b')
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            else:
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+        except Exception:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+            self.thread_lock.release()
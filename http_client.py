@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+http_client.py - Ortak HTTP İstemcisi
+
+Bu modül clapp'in tüm ağ erişimini tek bir requests.Session üzerinden yapar:
+- Keep-alive bağlantı havuzu (registry ve arşiv indirmeleri aynı TLS
+  bağlantısını kullanır)
+- gzip aktarım kodlaması (requests tarafından otomatik çözülür)
+- Ortak zaman aşımı, tekrar deneme ve geri çekilme (backoff) politikası
+- Sunucu başına eşzamanlı istek sınırı
+- file:// URL'leri için yerel dosya adaptörü (test ve yansı dizinleri)
+
+Ayarlar:
+    CLAPP_HTTP_TIMEOUT    Okuma zaman aşımı (saniye, varsayılan 30)
+    CLAPP_HTTP_RETRIES    Bağlantı/5xx hatalarında tekrar sayısı (varsayılan 3)
+    CLAPP_HTTP_PER_HOST   Sunucu başına eşzamanlı istek (varsayılan 6)
+
+requests modülü ilk istekte yüklenir; böylece ağa çıkmayan komutların
+başlangıç süresi etkilenmez.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from typing import Dict, Optional, Iterator
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_RETRIES = 3
+DEFAULT_PER_HOST = 6
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _env_int(name: str, default: int, minimum: int = 0) -> int:
+    try:
+        return max(minimum, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def get_user_agent() -> str:
+    """clapp sürümünü içeren User-Agent değerini döndürür"""
+    try:
+        from version import __version__
+    except Exception:
+        __version__ = "unknown"
+    return f"clapp/{__version__}"
+
+
+def _make_file_adapter():
+    """file:// URL'lerini okuyan requests adaptörünü oluşturur"""
+    from requests.adapters import BaseAdapter
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+    from urllib.request import url2pathname
+
+    class LocalFileAdapter(BaseAdapter):
+        """file:// URL'lerini yerel dosyadan okur (Range desteklenmez, hep 200)"""
+
+        def send(self, request, **kwargs):
+            response = Response()
+            response.request = request
+            response.url = request.url
+            response.headers = CaseInsensitiveDict()
+            path = url2pathname(urlparse(request.url).path)
+            try:
+                size = os.path.getsize(path)
+                response.status_code = 200
+                response.headers['Content-Length'] = str(size)
+                response.raw = open(path, 'rb') if request.method != 'HEAD' else None
+            except OSError as e:
+                response.status_code = 404
+                response.reason = str(e)
+                response.raw = None
+            if response.raw is None:
+                response._content = b""
+            response.connection = self
+            return response
+
+        def close(self):
+            pass
+
+    return LocalFileAdapter()
+
+
+class HttpClient:
+    """Havuzlu, tekrar denemeli ve sunucu başına sınırlı HTTP istemcisi"""
+
+    def __init__(self, timeout: Optional[int] = None, retries: Optional[int] = None,
+                 per_host: Optional[int] = None, pool_size: int = 16):
+        """
+        HttpClient başlatıcısı
+
+        Args:
+            timeout: Okuma zaman aşımı (saniye)
+            retries: Bağlantı ve 429/5xx hatalarında tekrar sayısı
+            per_host: Sunucu başına en fazla eşzamanlı istek
+            pool_size: Sunucu başına açık tutulan bağlantı sayısı
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.timeout = _env_int("CLAPP_HTTP_TIMEOUT", DEFAULT_TIMEOUT, 1) if timeout is None else timeout
+        self.retries = _env_int("CLAPP_HTTP_RETRIES", DEFAULT_RETRIES) if retries is None else retries
+        self.per_host = _env_int("CLAPP_HTTP_PER_HOST", DEFAULT_PER_HOST, 1) if per_host is None else per_host
+
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(("GET", "HEAD")),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.mount("file://", _make_file_adapter())
+        self.session.headers.update({
+            'User-Agent': get_user_agent(),
+            'Accept-Encoding': 'gzip, deflate',
+        })
+
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _timeout(self, timeout: Optional[float]):
+        return (DEFAULT_CONNECT_TIMEOUT, timeout or self.timeout)
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None, **kwargs):
+        """
+        İsteği gönderir ve gövdeyi tamamen okur
+
+        Returns:
+            requests.Response (bağlantı havuza geri verilmiş olarak)
+
+        Raises:
+            requests.RequestException: Tekrar denemelere rağmen bağlantı kurulamazsa
+        """
+        with self._host_slot(url):
+            response = self.session.request(method, url, headers=headers,
+                                            timeout=self._timeout(timeout), **kwargs)
+            response.content
+            return response
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[float] = None, **kwargs):
+        """GET isteği (bkz. request)"""
+        return self.request("GET", url, headers=headers, timeout=timeout, **kwargs)
+
+    def head(self, url: str, headers: Optional[Dict[str, str]] = None,
+             timeout: Optional[float] = None, **kwargs):
+        """HEAD isteği (yönlendirmeler izlenir)"""
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("HEAD", url, headers=headers, timeout=timeout, **kwargs)
+
+    @contextmanager
+    def stream(self, url: str, headers: Optional[Dict[str, str]] = None,
+               timeout: Optional[float] = None) -> Iterator:
+        """
+        Gövdesi parça parça okunacak GET isteği
+
+        Sunucu başına kontenjan, yanıt kapanana kadar tutulur.
+
+        Örnek:
+            with client.stream(url) as response:
+                for chunk in response.iter_content(65536): ...
+        """
+        with self._host_slot(url):
+            response = self.session.get(url, headers=headers, stream=True,
+                                        timeout=self._timeout(timeout))
+            try:
+                yield response
+            finally:
+                response.close()
+
+    def close(self):
+        """Havuzdaki bağlantıları kapatır"""
+        self.session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Süreç kapsamlı ortak HttpClient döndürür"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def reset_http_client():
+    """Ortak istemciyi kapatıp atar (ayarlar değiştiğinde veya testlerde)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
@@ -9,16 +9,18 @@ yerel apps/ klasörüne kurar.
 
 import os
 import json
+import contextlib
 import shutil
-import urllib.request
 import zipfile
 import tempfile
 import sys
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, List
 
 from manifest_validator import validate_manifest_verbose
-from progress_utils import download_with_progress, extract_with_progress, show_success_message, show_error_message
+from installed_index import record_install, snapshot_apps_dir
+from app_staging import swap_in_app, staging_workspace
+from progress_utils import resumable_download, get_partial_download_path, extract_tar_with_progress, extract_subtree_with_progress, find_app_in_zip, show_success_message, show_error_message
 
 def get_apps_directory() -> str:
     """Uygulamaların kurulacağı dizini döndürür"""
@@ -36,28 +38,26 @@ def load_index(index_path: str = "index.json") -> Tuple[bool, str, Optional[list
     """
     Index.json dosyasını yükler
     
+    Index süreç kapsamlı registry oturumundan alınır: TTL içinde snapshot
+    kullanılır, sonrasında koşullu istek (ETag / If-Modified-Since) gönderilir.
+    
     Returns:
         (success, message, apps_list)
     """
+    from registry_client import RegistryError, SOURCE_MESSAGES, get_registry_session
+    
     try:
-        # Her zaman GitHub'dan güncel index.json'u indir
-        print("🔄 GitHub'dan index.json indiriliyor...")
-        url = "https://raw.githubusercontent.com/mburakmmm/clapp-packages/main/index.json"
-        
-        with urllib.request.urlopen(url, timeout=10) as response:
-            apps = json.loads(response.read().decode('utf-8'))
-            # Yerel kopyasını kaydet
-            with open(index_path, 'w', encoding='utf-8') as f:
-                json.dump(apps, f, indent=2, ensure_ascii=False)
-            return True, "GitHub'dan index indirildi", apps
-            
-    except urllib.error.URLError as e:
-        # Network hatası durumunda yerel dosyayı dene
+        session = get_registry_session()
+        apps = session.load()
+        return True, SOURCE_MESSAGES[session.source], apps
+    except RegistryError as e:
+        # Ne ağ ne snapshot: yerel dosyayı dene
         if os.path.exists(index_path):
             with open(index_path, 'r', encoding='utf-8') as f:
                 apps = json.load(f)
             return True, "Yerel index yüklendi (network hatası)", apps
-        else:return False, f"Network hatası: {e}", None
+        else:
+            return False, str(e), None
     except json.JSONDecodeError as e:
         return False, f"JSON parse hatası: {e}", None
     except Exception as e:
@@ -70,13 +70,173 @@ def find_app_in_index(app_name: str, apps: list) -> Optional[Dict[str, Any]]:
             return app
     return None
 
-def download_app_from_github(app_info: Dict[str, Any], temp_dir: str) -> Tuple[bool, str]:
+def verify_artifact(file_path: str, expected_size: Optional[int], expected_sha256: Optional[str]) -> Tuple[bool, str]:
+    """
+    İndirilen arşivin boyutunu ve sha256 değerini index ile karşılaştırır
+    
+    Returns:
+        (success, message)
+    """
+    if expected_size is not None:
+        actual_size = os.path.getsize(file_path)
+        if actual_size != expected_size:
+            return False, f"Boyut uyuşmuyor: beklenen {expected_size}, gelen {actual_size}"
+    
+    if expected_sha256:
+        # Doğrulama stat cache'ine güvenmez; mtime geri alınarak kandırılabilir
+        from file_hasher import compute_file_hash
+        if compute_file_hash(file_path) != expected_sha256.lower():
+            return False, "sha256 doğrulaması başarısız"
+    
+    return True, "Arşiv doğrulandı"
+
+def get_archive_etag(url: str) -> Optional[str]:
+    """Arşivin ETag değerini HEAD isteğiyle alır (yoksa None)"""
+    if not url.startswith(('http://', 'https://')):
+        return None
+    try:
+        from http_client import get_http_client
+        response = get_http_client().head(url, timeout=10)
+        return response.headers.get('ETag') if response.ok else None
+    except Exception:
+        return None
+
+def fetch_archive(url: str, temp_dir: str, description: str,
+                  expected_size: Optional[int] = None,
+                  expected_sha256: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Arşivi download cache üzerinden getirir
+    
+    sha256 biliniyorsa cache içerik adreslidir; bilinmiyorsa URL + ETag
+    ile anahtarlanır. Cache'teki arşiv boyut ve sha256 ile doğrulanırsa
+    ağa hiç çıkılmaz (hash her seferinde dosya içeriğinden hesaplanır);
+    doğrulanamazsa cache'ten silinir ve yeniden indirilir.
+    
+    Returns:
+        (success, archive_path veya hata mesajı)
+    """
+    from cache_manager import get_default_cache_manager
+    
+    # Süreç kapsamlı örnek: paralel kurulumlar tek SQLite defter bağlantısını paylaşır
+    cache_manager = get_default_cache_manager()
+    etag = None if expected_sha256 else get_archive_etag(url)
+    
+    cached_path = cache_manager.get_download(url, sha256=expected_sha256, etag=etag)
+    if cached_path:
+        try:
+            verified, verify_message = verify_artifact(cached_path, expected_size, expected_sha256)
+        except OSError as e:
+            verified, verify_message = False, str(e)
+        if verified:
+            print(f"♻️  {description}: önbellekten kullanılıyor")
+            return True, cached_path
+        print(f"⚠️  {description}: önbellekteki arşiv geçersiz ({verify_message}), yeniden indirilecek")
+        cache_manager.evict_download(url, sha256=expected_sha256, etag=etag)
+    
+    archive_name = os.path.basename(url.split('?', 1)[0]) or "archive"
+    archive_path = os.path.join(temp_dir, archive_name)
+    
+    # Yarım veri ~/.clapp/cache/partial altında kalır; kesilen indirme bir
+    # sonraki çalıştırmada devam eder. Aynı parçaya tek süreç yazar; kilit
+    # parçaya özel dosyadır, diğer cache yazmalarını bekletmez.
+    from file_lock import FileLock
+    part_path = get_partial_download_path(url, expected_sha256)
+    with FileLock(f"{part_path}.lock"):
+        # Boyut ve sha256 indirme sırasında doğrulanır; ikinci okuma yapılmaz
+        success, result = resumable_download(url, archive_path, description,
+                                             expected_size=expected_size,
+                                             expected_sha256=expected_sha256,
+                                             part_path=part_path)
+    if not success:
+        return False, result
+    
+    stored_path = cache_manager.store_download(url, archive_path, sha256=expected_sha256, etag=etag)
+    return True, stored_path or archive_path
+
+def download_app_artifact(app_info: Dict[str, Any], temp_dir: str) -> Tuple[bool, str]:
+    """
+    Index'te kayıtlı per-app arşivi (artifact_url) indirir ve çıkarır
+    
+    Returns:
+        (success, app_source_path veya hata mesajı)
+    """
+    try:
+        app_name = app_info['name']
+        
+        success, archive_path = fetch_archive(
+            app_info['artifact_url'], temp_dir, f"📦 {app_name} indiriliyor",
+            app_info.get('artifact_size'), app_info.get('artifact_sha256')
+        )
+        if not success:
+            return False, archive_path
+        
+        extract_dir = os.path.join(temp_dir, f"artifact-{app_name}")
+        success = extract_tar_with_progress(archive_path, extract_dir, f"📦 {app_name} çıkarılıyor")
+        if not success:
+            return False, "Çıkarma başarısız"
+        
+        app_source_path = os.path.join(extract_dir, app_name)
+        if not os.path.isdir(app_source_path):
+            return False, f"Arşivde uygulama klasörü bulunamadı: {app_name}/"
+        
+        return True, app_source_path
+        
+    except Exception as e:
+        return False, f"İndirme hatası: {e}"
+
+def fetch_repo_archive(zip_url: str, temp_dir: str, description: str,
+                       extractions: Optional[Dict[str, str]] = None,
+                       extractions_lock: Optional[Any] = None) -> Tuple[bool, str]:
+    """
+    Depo zip'ini getirir; aynı çalıştırmada her zip_url bir kez indirilir
+    
+    Kilit sadece extractions[zip_url] doldurulurken tutulur: aynı depoyu
+    isteyen iş parçacıkları ilk indirmeyi bekler, çıkarma kilit dışında yapılır.
+    
+    Returns:
+        (success, zip yolu veya hata mesajı)
+    """
+    if extractions is None:
+        return fetch_archive(zip_url, temp_dir, description)
+    
+    with extractions_lock or contextlib.nullcontext():
+        if zip_url in extractions:
+            return True, extractions[zip_url]
+        success, zip_path = fetch_archive(zip_url, temp_dir, description)
+        if success:
+            extractions[zip_url] = zip_path
+        return success, zip_path
+
+def download_app_from_github(app_info: Dict[str, Any], temp_dir: str,
+                             extractions: Optional[Dict[str, str]] = None,
+                             extractions_lock: Optional[Any] = None) -> Tuple[bool, str]:
     """
     GitHub'dan uygulama dosyalarını indirir
     
+    Index'te per-app arşiv varsa sadece o arşiv indirilir; yoksa tüm
+    paket deposunun zip'i indirilir ve sadece packages/{app_name} klasörü çıkarılır.
+    
+    Args:
+        app_info: Index'teki uygulama kaydı
+        temp_dir: Geçici çalışma dizini
+        extractions: Aynı çalıştırmada daha önce indirilmiş depo arşivleri
+            (zip_url -> zip yolu). Verilirse aynı arşiv bir kez indirilir.
+        extractions_lock: extractions eşzamanlı doldurulacaksa kullanılacak kilit
+    
+    İndirilen klasöre index'teki dosya listesi .clapp-files.json olarak
+    yazılır; sonraki güncellemeler bununla sadece değişen dosyaları indirir.
+    
     Returns:
         (success, message)
     """
+    from app_delta import record_file_manifest
+    
+    if app_info.get('artifact_url'):
+        success, result = download_app_artifact(app_info, temp_dir)
+        if success:
+            record_file_manifest(result, app_info)
+        return success, result
+    
     try:
         repo_url = app_info.get('repo_url', 'https://github.com/mburakmmm/clapp-packages')
         app_name = app_info['name']
@@ -88,42 +248,38 @@ def download_app_from_github(app_info: Dict[str, Any], temp_dir: str) -> Tuple[b
         else:
             return False, f"Desteklenmeyen repo URL: {repo_url}"
         
-        # Progress bar ile indir
-        zip_path = os.path.join(temp_dir, "repo.zip")
-        success = download_with_progress(zip_url, zip_path, f"📦 {app_name} indiriliyor")
-        
+        # Depo arşivi aynı çalıştırmada bir kez indirilir (cache üzerinden)
+        success, zip_path = fetch_repo_archive(zip_url, temp_dir, f"📦 {app_name} indiriliyor",
+                                               extractions, extractions_lock)
         if not success:
-            return False, "İndirme başarısız"
+            return False, zip_path
         
-        # Progress bar ile çıkar
-        success = extract_with_progress(zip_path, temp_dir, f"📦 {app_name} çıkarılıyor")
+        # Merkezi dizinden packages/{app_name} klasörünü bul, sadece onu çıkar
+        found = find_app_in_zip(zip_path, app_name)
+        if not found:
+            return False, f"Uygulama klasörü bulunamadı: packages/{app_name}"
         
+        app_prefix, _ = found
+        app_source_path = os.path.join(temp_dir, f"app-{app_name}")
+        success = extract_subtree_with_progress(zip_path, app_prefix, app_source_path, f"📦 {app_name} çıkarılıyor")
         if not success:
             return False, "Çıkarma başarısız"
         
-        # Çıkarılan klasörü bul (genellikle repo-main formatında)
-        extracted_folders = [d for d in os.listdir(temp_dir) if os.path.isdir(os.path.join(temp_dir, d))]
-        if not extracted_folders:
-            return False, "Çıkarılan klasör bulunamadı"
-        
-        extracted_folder = extracted_folders[0]
-        
-        # YENİ: packages/{app_name} klasörünü bul
-        packages_path = os.path.join(temp_dir, extracted_folder, "packages")
-        app_source_path = os.path.join(packages_path, app_name)
-        
-        if not os.path.exists(app_source_path):
-            return False, f"Uygulama klasörü bulunamadı: packages/{app_name}"
-        
+        record_file_manifest(app_source_path, app_info)
         return True, app_source_path
         
     except Exception as e:
         return False, f"İndirme hatası: {e}"
 
-def install_app_locally(app_name: str, source_path: str) -> Tuple[bool, str]:
+def install_app_locally(app_name: str, source_path: str, isolated: bool = False) -> Tuple[bool, str]:
     """
     Uygulamayı yerel apps klasörüne kurar
     
+    Args:
+        app_name: Uygulama adı
+        source_path: İndirilen uygulama klasörü
+        isolated: Python bağımlılıklarını ~/.clapp/envs/<app> altındaki izole ortama kur
+    
     Returns:
         (success, message)
     """
@@ -131,25 +287,26 @@ def install_app_locally(app_name: str, source_path: str) -> Tuple[bool, str]:
         apps_dir = get_apps_directory()
         target_path = os.path.join(apps_dir, app_name)
         
-        # Hedef klasör varsa sil
-        if os.path.exists(target_path):
-            shutil.rmtree(target_path)
-            print(f"⚠️  Mevcut {app_name} kaldırıldı")
-        
-        # Kopyala
-        shutil.copytree(source_path, target_path)
-        
-        # Manifest'i doğrula
-        manifest_path = os.path.join(target_path, "manifest.json")
+        # Manifest'i yerine koymadan önce doğrula
+        manifest = {}
+        manifest_path = os.path.join(source_path, "manifest.json")
         if os.path.exists(manifest_path):
             with open(manifest_path, 'r', encoding='utf-8') as f:
                 manifest = json.load(f)
             
             is_valid, errors = validate_manifest_verbose(manifest)
             if not is_valid:
-                shutil.rmtree(target_path)
                 return False, f"Manifest doğrulama hatası: {errors}"
         
+        # Staging'den rename ile yerine koy; eski sürüm arka planda silinir
+        apps_dir_mtime = snapshot_apps_dir()
+        swap_success, swap_message = swap_in_app(app_name, source_path)
+        if not swap_success:
+            return False, swap_message
+        if swap_message.startswith("Mevcut"):
+            print(f"♻️  {swap_message}")
+        
+        record_install(app_name, apps_dir_mtime)
         show_success_message(f"'{app_name}' başarıyla yüklendi!")
         
         # Bağımlılık çözümleme entegrasyonu
@@ -163,7 +320,15 @@ def install_app_locally(app_name: str, source_path: str) -> Tuple[bool, str]:
         
         # Dil bazlı bağımlılık kontrolü
         language = manifest.get('language', 'unknown')
-        if language == 'python':
+        if language == 'python' and isolated:
+            from app_env import create_app_env
+            success, message = create_app_env(app_name, target_path)
+            if success:
+                print(f"✅ {message}")
+            else:
+                print(f"⚠️  {message}")
+        
+        elif language == 'python':
             success, message, missing_packages = check_and_install_python_dependencies(target_path)
             if success:
                 if missing_packages:
@@ -188,12 +353,13 @@ def install_app_locally(app_name: str, source_path: str) -> Tuple[bool, str]:
     except Exception as e:
         return False, f"Kurulum hatası: {e}"
 
-def install_app(app_name: str) -> Tuple[bool, str]:
+def install_app(app_name: str, isolated: bool = False) -> Tuple[bool, str]:
     """
     Ana install fonksiyonu
     
     Args:
         app_name: Kurulacak uygulamanın adı
+        isolated: Python bağımlılıklarını izole ortama kur
         
     Returns:
         (success, message)
@@ -211,7 +377,7 @@ def install_app(app_name: str) -> Tuple[bool, str]:
     if apps is None:
         return False, "Index yüklendi ama uygulama listesi boş"
     
-    print(f"✅ {len(apps)} uygulama listelendi")
+    print(f"✅ {index_message}: {len(apps)} uygulama listelendi")
     
     # 2. Uygulamayı index'te ara
     print("2️⃣ Uygulama aranıyor...")
@@ -224,7 +390,7 @@ def install_app(app_name: str) -> Tuple[bool, str]:
     print(f"✅ {app_name} v{app_info['version']} bulundu")
     
     # 3. Geçici klasör oluştur
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with staging_workspace() as temp_dir:
         print("3️⃣ Uygulama indiriliyor...")
         
         # GitHub'dan indir
@@ -238,23 +404,195 @@ def install_app(app_name: str) -> Tuple[bool, str]:
         
         # 4. Yerel kurulum
         print("4️⃣ Uygulama kuruluyor...")
-        install_success, install_message = install_app_locally(app_name, source_path)
+        install_success, install_message = install_app_locally(app_name, source_path, isolated)
         
         if not install_success:
             return False, install_message
     
     return True, f"🎉 '{app_name}' başarıyla kuruldu!"
 
+def resolve_install_order(app_names: List[str], index_by_name: Dict[str, Dict[str, Any]],
+                          skip_installed: bool = True) -> Tuple[List[str], List[str], Dict[str, List[str]]]:
+    """
+    İstenen uygulamaları ve index'teki uygulama bağımlılıklarını topolojik sıraya dizer
+    
+    Manifest'teki dependencies listesinde index'te bulunan uygulama adları
+    uygulama bağımlılığı sayılır; diğerleri (ör. pip paketleri) yok sayılır.
+    Zaten kurulu bağımlılıklar (istenmedikçe) yeniden kurulmaz.
+    
+    Args:
+        app_names: Kurulacak uygulamalar
+        index_by_name: Index'teki uygulamalar (ad -> kayıt)
+        skip_installed: Kurulu bağımlılıkları atla
+    
+    Returns:
+        (kurulum_sırası, bulunamayan_uygulamalar, bağımlılık_grafı)
+    
+    Raises:
+        ValueError: Bağımlılık döngüsü varsa
+    """
+    from installed_index import get_installed_index
+    
+    requested = set(app_names)
+    missing = [name for name in app_names if name not in index_by_name]
+    graph: Dict[str, List[str]] = {}
+    queue = [name for name in app_names if name in index_by_name]
+    
+    # İstenen uygulamalardan başlayarak bağımlılık kapanışını çıkar
+    while queue:
+        name = queue.pop()
+        if name in graph:
+            continue
+        deps = []
+        for dep in index_by_name[name].get('dependencies', []) or []:
+            if dep not in index_by_name or dep == name:
+                continue
+            if skip_installed and dep not in requested and get_installed_index().get_manifest(dep):
+                continue
+            deps.append(dep)
+        graph[name] = deps
+        queue.extend(dep for dep in deps if dep not in graph)
+    
+    # Kahn algoritması; aynı seviyede alfabetik sıra (deterministik çıktı)
+    indegree = {name: len(deps) for name, deps in graph.items()}
+    dependents: Dict[str, List[str]] = {name: [] for name in graph}
+    for name, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(name)
+    
+    ready = sorted(name for name, count in indegree.items() if count == 0)
+    order = []
+    while ready:
+        name = ready.pop(0)
+        order.append(name)
+        for dependent in dependents[name]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
+        ready.sort()
+    
+    if len(order) != len(graph):
+        cyclic = sorted(name for name, count in indegree.items() if count > 0)
+        raise ValueError(f"Bağımlılık döngüsü tespit edildi: {', '.join(cyclic)}")
+    
+    return order, missing, graph
+
+def install_apps(app_names: List[str], jobs: int = 4, isolated: bool = False) -> Tuple[bool, str]:
+    """
+    Birden fazla uygulamayı bağımlılık sırasına göre kurar
+    
+    İndirme ve çıkarma işlemleri en fazla `jobs` iş parçacığında eşzamanlı
+    yürütülür; kurulum (kopyalama ve dil bağımlılıkları) topolojik sırada
+    tek tek yapılır. Bağımlılığı başarısız olan uygulama atlanır.
+    
+    Args:
+        app_names: Kurulacak uygulama adları
+        jobs: Eşzamanlı indirme sayısı
+        isolated: Python bağımlılıklarını izole ortamlara kur
+        
+    Returns:
+        (success, message)
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # Tekrarları at, sırayı koru
+    app_names = list(dict.fromkeys(app_names))
+    jobs = max(1, jobs)
+    
+    print(f"🚀 Toplu kurulum başlatılıyor: {', '.join(app_names)}")
+    print("=" * 50)
+    
+    # 1. Index'i yükle
+    print("1️⃣ Index yükleniyor...")
+    index_success, index_message, apps = load_index()
+    
+    if not index_success:
+        return False, f"Index yükleme hatası: {index_message}"
+    
+    if apps is None:
+        return False, "Index yüklendi ama uygulama listesi boş"
+    
+    print(f"✅ {index_message}: {len(apps)} uygulama listelendi")
+    
+    # 2. Bağımlılık sırasını çöz
+    print("2️⃣ Bağımlılıklar çözümleniyor...")
+    index_by_name = {app['name']: app for app in apps if isinstance(app, dict) and 'name' in app}
+    try:
+        order, missing, graph = resolve_install_order(app_names, index_by_name)
+    except ValueError as e:
+        return False, str(e)
+    
+    results: Dict[str, Tuple[bool, str]] = {}
+    for name in missing:
+        results[name] = (False, "Index'te bulunamadı")
+    
+    if order:
+        print(f"✅ Kurulum sırası: {' → '.join(order)}")
+    
+    # 3. Eşzamanlı indir, topolojik sırada kur
+    with staging_workspace() as temp_dir:
+        extractions: Dict[str, str] = {}
+        # Depo arşivi (artifact_url olmayan uygulamalar) tek seferde indirilsin;
+        # kilit sadece arşiv indirilirken tutulur, çıkarmalar eşzamanlı yapılır
+        repo_lock = threading.Lock()
+        
+        def fetch(name: str) -> Tuple[bool, str]:
+            return download_app_from_github(index_by_name[name], temp_dir, extractions, repo_lock)
+        
+        print(f"3️⃣ {len(order)} uygulama indiriliyor ({jobs} eşzamanlı)...")
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {name: executor.submit(fetch, name) for name in order}
+            
+            print("4️⃣ Uygulamalar kuruluyor...")
+            for name in order:
+                failed_deps = [dep for dep in graph[name] if not results.get(dep, (False,))[0]]
+                if failed_deps:
+                    futures[name].cancel()
+                    results[name] = (False, f"Bağımlılık kurulamadı: {', '.join(failed_deps)}")
+                    continue
+                
+                try:
+                    download_success, download_result = futures[name].result()
+                except Exception as e:
+                    download_success, download_result = False, str(e)
+                
+                if not download_success:
+                    results[name] = (False, f"İndirme hatası: {download_result}")
+                    continue
+                
+                print(f"📦 {name} v{index_by_name[name]['version']} kuruluyor...")
+                results[name] = install_app_locally(name, download_result, isolated)
+    
+    # 5. Özet
+    print("\n📋 Kurulum özeti")
+    print("=" * 50)
+    for name in order + missing:
+        success, message = results[name]
+        if success:
+            print(f"✅ {name} v{index_by_name[name]['version']}")
+        else:
+            print(f"❌ {name}: {message}")
+    
+    failed = [name for name, (success, _) in results.items() if not success]
+    if failed:
+        return False, f"{len(failed)}/{len(results)} uygulama kurulamadı: {', '.join(failed)}"
+    
+    return True, f"🎉 {len(results)} uygulama başarıyla kuruldu!"
+
 def main():
     """CLI entry point"""
     if len(sys.argv) < 2:
-        print("Kullanım: python install_command.py <app_name>")
+        print("Kullanım: python install_command.py <app_name> [app_name ...]")
         print("Örnek: python install_command.py hello-python")
         sys.exit(1)
     
-    app_name = sys.argv[1]
+    app_names = sys.argv[1:]
     
-    success, message = install_app(app_name)
+    if len(app_names) == 1:
+        success, message = install_app(app_names[0])
+    else:
+        success, message = install_apps(app_names)
     
     print("\n" + "=" * 50)
     if success:
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+installed_index.py - Kurulu Uygulama Indeksi
+
+Bu modül ~/.clapp/installed.json dosyasında kurulu uygulamaların
+manifest'lerini, yollarını ve boyutlarını tutar. Böylece list, where ve
+dependency komutları her çalıştırmada tüm manifest.json dosyalarını
+yeniden okumak zorunda kalmaz.
+
+Doğrulama:
+- Tüm liste: apps dizininin mtime değeri ve kayıtlı her manifest.json
+  dosyasının mtime/boyut değeri (uygulama başına tek stat çağrısı)
+- Tek uygulama: ilgili manifest.json dosyasının mtime/boyut değeri
+
+install, uninstall ve update komutları record_install / record_uninstall
+ile indeksi güncel tutar. Dışarıdan yapılan değişiklikler mtime farkından
+algılanır ve sadece değişen manifest'ler yeniden okunur.
+
+record_* çağrıları apps dizininin değişiklikten önceki mtime değerini
+(snapshot_apps_dir) alır; kayıtlı değer bununla eşleşmiyorsa araya başka
+bir değişiklik girmiştir ve dizin yeniden taranır. Güncellemeler
+installed.json.lock kilidi altında dosya yeniden okunarak yapılır; eş
+zamanlı süreçler birbirinin girişlerini ezmez.
+"""
+
+import os
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from file_lock import FileLock
+
+INDEX_VERSION = 1
+
+
+def get_apps_directory() -> str:
+    """Uygulamaların kurulu olduğu dizini döndürür"""
+    return str(Path.home() / ".clapp" / "apps")
+
+
+def get_index_path() -> str:
+    """Kurulu uygulama indeks dosyasının yolunu döndürür"""
+    return str(Path.home() / ".clapp" / "installed.json")
+
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    """Dosyanın (mtime_ns, size) değerini döndürür, yoksa None"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _dir_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _directory_size(directory: str) -> int:
+    """Dizin boyutunu byte cinsinden hesaplar"""
+    total_size = 0
+    for dirpath, dirnames, filenames in os.walk(directory):
+        for filename in filenames:
+            try:
+                total_size += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total_size
+
+
+class InstalledIndex:
+    """Kurulu uygulamaların kalıcı indeksi"""
+
+    def __init__(self, apps_dir: Optional[str] = None, index_path: Optional[str] = None):
+        """
+        InstalledIndex başlatıcısı
+
+        Args:
+            apps_dir: Uygulama dizini (varsayılan: ~/.clapp/apps)
+            index_path: İndeks dosyası (varsayılan: ~/.clapp/installed.json)
+        """
+        self.apps_dir = apps_dir or get_apps_directory()
+        self.index_path = index_path or get_index_path()
+        self._data: Optional[Dict[str, Any]] = None
+
+    # --- Dosya işlemleri -------------------------------------------------
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            data = None
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception:
+                pass
+
+            if (not isinstance(data, dict) or data.get("version") != INDEX_VERSION
+                    or data.get("apps_dir") != self.apps_dir):
+                data = {"version": INDEX_VERSION, "apps_dir": self.apps_dir,
+                        "apps_dir_mtime": None, "apps": {}}
+            self._data = data
+        return self._data
+
+    def _save(self):
+        """İndeksi geçici dosyaya yazıp os.replace ile yerine koyar"""
+        data = self._load()
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # İndeks sadece hızlandırma amaçlı; yazılamazsa tarama ile devam edilir
+            pass
+
+    # --- Giriş oluşturma -------------------------------------------------
+
+    def _build_entry(self, folder: str, compute_size: bool = False) -> Optional[Dict[str, Any]]:
+        """Uygulama klasörü için indeks girişi oluşturur (manifest'i okur)"""
+        from manifest_schema import validate_manifest
+
+        app_path = os.path.join(self.apps_dir, folder)
+        if not os.path.isdir(app_path):
+            return None
+
+        manifest_path = os.path.join(app_path, "manifest.json")
+        manifest_stat = _stat_key(manifest_path)
+        manifest = None
+        valid = False
+
+        if manifest_stat is not None:
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                valid = isinstance(manifest, dict) and bool(validate_manifest(manifest))
+            except Exception:
+                manifest = None
+
+        return {
+            "path": app_path,
+            "manifest": manifest if isinstance(manifest, dict) else None,
+            "manifest_stat": manifest_stat,
+            "valid": valid,
+            "size": _directory_size(app_path) if compute_size else None,
+        }
+
+    def _rescan(self):
+        """apps dizinini tarar; sadece manifest'i değişen uygulamaları yeniden okur"""
+        data = self._load()
+        old_apps = data["apps"]
+        new_apps = {}
+
+        if os.path.isdir(self.apps_dir):
+            for folder in os.listdir(self.apps_dir):
+                if folder.startswith('.'):
+                    continue
+                app_path = os.path.join(self.apps_dir, folder)
+                if not os.path.isdir(app_path):
+                    continue
+
+                entry = old_apps.get(folder)
+                manifest_stat = _stat_key(os.path.join(app_path, "manifest.json"))
+                if entry is None or entry.get("manifest_stat") != manifest_stat:
+                    entry = self._build_entry(folder)
+                if entry is not None:
+                    new_apps[folder] = entry
+
+        data["apps"] = new_apps
+        data["apps_dir_mtime"] = _dir_mtime(self.apps_dir)
+        self._save()
+
+    def _ensure_fresh(self):
+        """
+        İndeksi güncel tutar
+
+        apps dizini değiştiyse (uygulama eklendi/silindi) tamamı taranır.
+        Değişmediyse kayıtlı manifest'ler stat ile doğrulanır; yerinde
+        düzenlenen manifest dizin mtime'ını değiştirmediği için sadece
+        değişen girişler yeniden okunur.
+        """
+        data = self._load()
+        if data.get("apps_dir_mtime") != _dir_mtime(self.apps_dir):
+            self._rescan()
+            return
+
+        changed = False
+        for folder, entry in list(data["apps"].items()):
+            manifest_stat = _stat_key(os.path.join(self.apps_dir, folder, "manifest.json"))
+            if entry.get("manifest_stat") == manifest_stat:
+                continue
+            new_entry = self._build_entry(folder)
+            if new_entry is None:
+                data["apps"].pop(folder, None)
+            else:
+                data["apps"][folder] = new_entry
+            changed = True
+
+        if changed:
+            self._save()
+
+    # --- Sorgular --------------------------------------------------------
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Tüm kurulu uygulama girişlerini döndürür
+
+        Returns:
+            Dict[klasör_adı, giriş] - giriş: path, manifest, valid, size
+        """
+        self._ensure_fresh()
+        return dict(self._load()["apps"])
+
+    def get(self, app_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Tek bir uygulamanın girişini döndürür (manifest stat ile doğrulanır)
+
+        Args:
+            app_name: Uygulama klasör adı
+
+        Returns:
+            Giriş sözlüğü veya None (kurulu değilse)
+        """
+        if not app_name or app_name.startswith('.') or os.sep in app_name:
+            return None
+
+        data = self._load()
+        entry = data["apps"].get(app_name)
+        app_path = os.path.join(self.apps_dir, app_name)
+
+        if entry is not None:
+            manifest_stat = _stat_key(os.path.join(app_path, "manifest.json"))
+            if manifest_stat is not None and entry.get("manifest_stat") == manifest_stat:
+                return entry
+            if not os.path.isdir(app_path):
+                self._ensure_fresh()
+                return None
+        elif data.get("apps_dir_mtime") == _dir_mtime(self.apps_dir):
+            # apps dizini değişmediyse bu uygulama kurulu değildir
+            return None
+
+        # Giriş eski veya indekste yok: sadece bu uygulamayı yeniden oku
+        entry = self._build_entry(app_name)
+        if entry is None:
+            data["apps"].pop(app_name, None)
+        else:
+            data["apps"][app_name] = entry
+        self._save()
+        return entry
+
+    def get_manifest(self, app_name: str) -> Optional[Dict[str, Any]]:
+        """Geçerli manifest'i döndürür (geçersiz veya yoksa None)"""
+        entry = self.get(app_name)
+        if entry is None or not entry.get("valid"):
+            return None
+        return dict(entry["manifest"])
+
+    def get_size(self, app_name: str) -> int:
+        """Uygulama dizin boyutunu döndürür; ilk istekte hesaplanıp saklanır"""
+        entry = self.get(app_name)
+        if entry is None:
+            return 0
+        if entry.get("size") is None:
+            entry["size"] = _directory_size(entry["path"])
+            self._save()
+        return entry["size"]
+
+    # --- Güncelleme ------------------------------------------------------
+
+    def _record(self, app_name: str, entry: Optional[Dict[str, Any]],
+                apps_dir_mtime_before: Optional[int]):
+        """Tek uygulamanın girişini kilit altında, dosyayı yeniden okuyarak yazar"""
+        with FileLock(f"{self.index_path}.lock"):
+            # Başka süreçlerin yazdığı girişleri kaybetmemek için diskten oku
+            self._data = None
+            data = self._load()
+            in_sync = (apps_dir_mtime_before is not None
+                       and data.get("apps_dir_mtime") == apps_dir_mtime_before)
+
+            if entry is None:
+                data["apps"].pop(app_name, None)
+            else:
+                data["apps"][app_name] = entry
+
+            if in_sync:
+                # İndeks değişiklikten önce dizinle eşleşiyordu; tek fark bu uygulama
+                data["apps_dir_mtime"] = _dir_mtime(self.apps_dir)
+                self._save()
+            else:
+                # Dışarıdan eklenen/silinen klasörler de indekse girsin
+                self._rescan()
+
+    def record_install(self, app_name: str, apps_dir_mtime_before: Optional[int] = None):
+        """
+        Kurulan veya güncellenen uygulamayı indekse yazar
+
+        Args:
+            app_name: Uygulama klasör adı
+            apps_dir_mtime_before: Değişiklikten önce snapshot_apps_dir() değeri
+                (verilmezse dizin yeniden taranır)
+        """
+        entry = self._build_entry(app_name, compute_size=True)
+        self._record(app_name, entry, apps_dir_mtime_before)
+
+    def record_uninstall(self, app_name: str, apps_dir_mtime_before: Optional[int] = None):
+        """
+        Kaldırılan uygulamayı indeksten siler
+
+        Args:
+            app_name: Uygulama klasör adı
+            apps_dir_mtime_before: Değişiklikten önce snapshot_apps_dir() değeri
+                (verilmezse dizin yeniden taranır)
+        """
+        self._record(app_name, None, apps_dir_mtime_before)
+
+    def rebuild(self):
+        """İndeksi sıfırdan oluşturur"""
+        data = self._load()
+        data["apps"] = {}
+        self._rescan()
+
+
+# Süreç boyunca apps dizini başına tek indeks
+_indexes: Dict[str, InstalledIndex] = {}
+
+
+def get_installed_index() -> InstalledIndex:
+    """Geçerli apps dizini için süreç kapsamlı InstalledIndex döndürür"""
+    apps_dir = get_apps_directory()
+    index = _indexes.get(apps_dir)
+    if index is None:
+        index = InstalledIndex(apps_dir)
+        _indexes[apps_dir] = index
+    return index
+
+
+def snapshot_apps_dir() -> Optional[int]:
+    """apps dizininin mtime değerini döndürür; değişiklikten önce alınıp record_* çağrılarına verilir"""
+    return _dir_mtime(get_apps_directory())
+
+
+def record_install(app_name: str, apps_dir_mtime_before: Optional[int] = None):
+    """Kurulum sonrası indeksi günceller (hatalar kurulumu etkilemez)"""
+    try:
+        get_installed_index().record_install(app_name, apps_dir_mtime_before)
+    except Exception:
+        pass
+
+
+def record_uninstall(app_name: str, apps_dir_mtime_before: Optional[int] = None):
+    """Kaldırma sonrası indeksi günceller (hatalar kaldırmayı etkilemez)"""
+    try:
+        get_installed_index().record_uninstall(app_name, apps_dir_mtime_before)
+    except Exception:
+        pass
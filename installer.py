@@ -6,7 +6,7 @@ import shutil
 import json
 from manifest_validator import validate_manifest_verbose
 from package_registry import app_exists
-from progress_utils import download_with_progress, extract_with_progress, copy_with_progress, show_success_message, show_error_message
+from progress_utils import download_with_progress, extract_with_progress, extract_subtree_with_progress, find_app_in_zip, copy_with_progress, show_success_message, show_error_message
 
 def find_app_folder(extract_path, app_name):
     """
@@ -33,37 +33,20 @@ def install_package(source, force=False):
             if not os.path.exists(source):
                 return False, f"Dosya bulunamadı: {source}"
             zip_path = source
-        extract_path = os.path.join(temp_dir, "extracted")
-        success, message = extract_package(zip_path, extract_path)
-        if not success:
-            return False, message
-
-        # --- YENİ: Doğru app klasörünü bul ---
-        # Önce manifesti bulmak için tüm app klasörlerini tara
-        app_folder = None
-        manifest = None
-        manifest_path = None
-        # Tüm packages altındaki app klasörlerini bul
-        for root, dirs, files in os.walk(extract_path):
-            if "manifest.json" in files:
-                with open(os.path.join(root, "manifest.json"), 'r', encoding='utf-8') as f:
-                    try:
-                        m = json.load(f)
-                        if 'name' in m:
-                            app_folder = root
-                            manifest = m
-                            manifest_path = os.path.join(root, "manifest.json")
-                            break
-                    except Exception:
-                        continue
-        if not app_folder or not manifest:
+        # Merkezi dizinden manifesti ve uygulama klasörünü bul (diske yazmadan)
+        try:
+            found = find_app_in_zip(zip_path)
+        except zipfile.BadZipFile:
+            return False, "Geçersiz zip dosyası"
+        if not found:
             return False, "Uygulama klasörü bulunamadı: manifest.json"
+        app_prefix, manifest = found
         app_name = manifest['name']
 
-        # --- YENİ: Sadece packages/{app_name} klasörünü bul ve kopyala ---
-        app_real_folder = find_app_folder(extract_path, app_name)
-        if not app_real_folder:
-            return False, f"Uygulama klasörü bulunamadı: packages/{app_name}"
+        # Sadece uygulama klasörünü çıkar
+        app_real_folder = os.path.join(temp_dir, "app")
+        if not extract_subtree_with_progress(zip_path, app_prefix, app_real_folder, f"📦 {app_name} çıkarılıyor"):
+            return False, "Çıkarma hatası"
 
         # Manifesti doğrula
         is_valid, errors = validate_manifest_file(os.path.join(app_real_folder, "manifest.json"))
@@ -294,12 +277,16 @@ def install_from_directory(source_dir, force=False):
         apps_dir = get_apps_directory()
         target_dir = os.path.join(apps_dir, app_name)
         
-        # Mevcut dizini sil (eğer varsa)
-        if os.path.exists(target_dir):
-            shutil.rmtree(target_dir)
+        # Staging alanına bir kez kopyala ve rename ile yerine koy
+        from app_staging import swap_in_app, cleanup_stale_staging
+        cleanup_stale_staging()
+        from installed_index import record_install, snapshot_apps_dir
+        apps_dir_mtime = snapshot_apps_dir()
+        success, message = swap_in_app(app_name, source_dir, move_source=False)
+        if not success:
+            return False, message
         
-        # Dosyaları kopyala
-        shutil.copytree(source_dir, target_dir)
+        record_install(app_name, apps_dir_mtime)
         
         show_success_message(f"'{app_name}' başarıyla yüklendi!")
         return True, f"✅ '{app_name}' başarıyla yüklendi!"
@@ -36,19 +36,17 @@ def load_app_manifest(app_path: str) -> Optional[Dict[str, Any]]:
 
 def get_installed_apps_with_info() -> List[Dict[str, Any]]:
     """Kurulu uygulamaların detaylı bilgilerini döndürür"""
+    from installed_index import get_installed_index
+    
     apps_dir = get_apps_directory()
     apps = []
     
     if not os.path.exists(apps_dir):
         return apps
     
-    for item in os.listdir(apps_dir):
-        item_path = os.path.join(apps_dir, item)
-        
-        if not os.path.isdir(item_path) or item.startswith('.'):
-            continue
-        
-        manifest = load_app_manifest(item_path)
+    for item, entry in get_installed_index().entries().items():
+        item_path = entry['path']
+        manifest = entry.get('manifest')
         
         if manifest:
             app_info = {
@@ -11,56 +11,71 @@ import sys
 import os
 from pathlib import Path
 
-# Mevcut modülleri import et
-from clapp_core import run_app
-from cli_commands import (
-    install_from_remote, publish_package,
-    search_remote_packages, show_package_info, list_all_packages,
-    check_system_health, handle_publish_command, handle_install_command,
-    handle_uninstall_command, handle_list_command, publish_to_repository
-)
-from installer import install_package, uninstall_package, install_from_directory
-from remote_registry import list_remote_packages
+# Komut modülleri burada import edilmez: her alt komut kendi modülünü
+# sadece çalıştırıldığında yükler (bkz. main() içindeki dallar). Böylece
+# `clapp run` veya `clapp version` requests/cryptography/tqdm gibi ağır
+# bağımlılıkların import maliyetini ödemez.
+from post_install_hint import check_first_run
 
-# Yeni komut modüllerini import et
-from post_install_hint import check_first_run, show_post_install_hint
+STARTUP_PROFILE_FLAG = '--startup-profile'
 
-from info_command import show_app_info
-from validate_command import validate_app_folder
-from doctor_command import run_doctor
-from clean_command import run_clean
-from where_command import locate_app_path, list_all_app_locations, handle_where_command
-from version_command import print_version, print_detailed_version
-
-# Yeni güvenlik ve performans modülleri
-from package_signing import check_package_security
-from version_manager import check_app_updates, get_app_latest_version, increment_app_version
-from cache_manager import get_cache_stats, clear_all_caches, download_packages_parallel
-from smart_search import search_packages, get_search_suggestions, get_search_analytics, clear_search_history
-
-# Yeni publish.cursorrules komutları
-from publish_command import publish_app
-from install_command import install_app
-from uninstall_command import uninstall_app
-from list_command import list_apps as list_apps_new
-
-# Dependency yönetimi komutları
-from dependency_resolver import (
-    handle_dependency_check,
-    handle_dependency_install,
-    handle_engine_check,
-    handle_dependency_tree
-)
-
-# Yeni uygulama oluşturma komutu
-from new_command import handle_new_command
-
-# Update komutu
-from update_command import handle_update_command
+def enable_startup_profile():
+    """
+    Modül başına import süresini ölçen import kancasını kurar.
+    
+    Süreç sonunda (sys.exit dahil) kümülatif ve kendi import süreleri
+    en yavaştan en hızlıya doğru yazdırılır.
+    """
+    import atexit
+    import builtins
+    import time
+    
+    original_import = builtins.__import__
+    timings = {}
+    stack = []
+    started_at = time.perf_counter()
+    
+    def profiled_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return original_import(name, globals, locals, fromlist, level)
+        
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            if name not in timings:
+                timings[name] = (elapsed, elapsed - children)
+    
+    def report():
+        builtins.__import__ = original_import
+        total = (time.perf_counter() - started_at) * 1000
+        print(f"\n⏱️  Başlangıç profili ({len(timings)} modül, toplam {total:.1f} ms)", file=sys.stderr)
+        print(f"{'Kümülatif':>10} {'Kendi':>10}  Modül", file=sys.stderr)
+        ranked = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (cumulative, own) in ranked[:30]:
+            print(f"{cumulative * 1000:>8.1f}ms {own * 1000:>8.1f}ms  {name}", file=sys.stderr)
+    
+    builtins.__import__ = profiled_import
+    atexit.register(report)
 
 def main():
     """Ana CLI fonksiyonu"""
     
+    # Kabuk tamamlaması: CLI'ın geri kalanı yüklenmeden cevaplanır
+    if sys.argv[1:2] == ['__complete']:
+        from completion import complete_main
+        sys.exit(complete_main(sys.argv[2:]))
+    
+    # --startup-profile her komutla birlikte kullanılabilir
+    if STARTUP_PROFILE_FLAG in sys.argv[1:]:
+        sys.argv = [arg for arg in sys.argv if arg != STARTUP_PROFILE_FLAG]
+        enable_startup_profile()
+    
     # İlk çalıştırma kontrolü
     first_run = check_first_run()
     if first_run:
@@ -94,6 +109,7 @@ def main():
 
 🔧 Yönetim Komutları:
   clapp install app-name        # Uygulama adından yükle
+  clapp install a b c --jobs 8  # Birden fazla uygulamayı paralel yükle
   clapp uninstall hello-python  # Uygulamayı kaldır
   clapp update-apps hello-python  # Uygulamayı güncelle
   clapp update-apps [app-name]  # Uygulamaları güncelle (tümü veya belirli)
@@ -106,12 +122,14 @@ def main():
   clapp dependency install app  # Uygulama bağımlılıklarını kur
   clapp dependency engine app   # Engine kontrolü
   clapp dependency tree app     # Bağımlılık ağacı
+  clapp dependency rdeps app    # Bu uygulamaya bağımlı olanlar
 
 🛠️  Sistem Komutları:
   clapp doctor                  # Kapsamlı sistem tanılaması
   clapp clean                   # Geçici dosyaları temizle
   clapp where hello-python      # Uygulama konumunu göster
   clapp version                 # Sürüm bilgilerini göster
+  clapp --startup-profile list  # Modül import sürelerini göster
 
 🌐 Uzak Komutlar:
   clapp search calculator       # Uzak depoda ara
@@ -143,9 +161,11 @@ def main():
     
     # install komutu
     install_parser = subparsers.add_parser('install', help='Uygulama yükle')
-    install_parser.add_argument('source', help='Uygulama adı (GitHub index.json\'dan)')
+    install_parser.add_argument('source', nargs='+', help='Uygulama adı/adları (GitHub index.json\'dan)')
     install_parser.add_argument('--force', action='store_true', help='Mevcut uygulamanın üzerine yaz')
     install_parser.add_argument('--local', action='store_true', help='Yerel dizinden yükle')
+    install_parser.add_argument('--isolated', action='store_true', help='Python bağımlılıklarını uygulamaya özel ortama (~/.clapp/envs) kur')
+    install_parser.add_argument('--jobs', '-j', type=int, default=4, help='Eşzamanlı indirme sayısı (çoklu kurulum için)')
     
     # uninstall komutu
     uninstall_parser = subparsers.add_parser('uninstall', help='Uygulama kaldır')
@@ -223,6 +243,7 @@ def main():
     cache_parser.add_argument('action', choices=['stats', 'clear', 'download'], help='Cache işlemi')
     cache_parser.add_argument('--urls', nargs='+', help='İndirilecek URL\'ler (download için)')
     cache_parser.add_argument('--dest', help='Hedef dizin (download için)')
+    cache_parser.add_argument('--verify', action='store_true', help='Cache defterini dosya sistemiyle karşılaştırıp düzelt (stats için)')
     
 
     
@@ -247,6 +268,10 @@ def main():
     dep_tree_parser = dependency_subparsers.add_parser('tree', help='Bağımlılık ağacı')
     dep_tree_parser.add_argument('app_name', help='Uygulama adı')
     
+    # dependency rdeps
+    dep_rdeps_parser = dependency_subparsers.add_parser('rdeps', help='Bu uygulamaya bağımlı uygulamalar')
+    dep_rdeps_parser.add_argument('app_name', help='Uygulama adı')
+    
     # new komutu (yeni)
     new_parser = subparsers.add_parser('new', help='Yeni uygulama oluştur (desteklenen dilleri görmek için: clapp new --list)')
     new_parser.add_argument('language', nargs='?', help='Programlama dili (python, lua, dart, go, rust, node, bash, multi, universal)')
@@ -265,15 +290,18 @@ def main():
     try:
         # Komutları işle
         if args.command == 'run':
+            from clapp_core import run_app
             success = run_app(args.app_name)
             sys.exit(0 if success else 1)
         
         elif args.command == 'list':
             if args.all:
+                from cli_commands import list_all_packages
                 list_all_packages()
             else:
                 # Yeni gelişmiş list komutu
                 try:
+                    from list_command import list_apps as list_apps_new
                     output = list_apps_new(args.format, args.language, args.search)
                     print(output)
                 except Exception as e:
@@ -283,13 +311,26 @@ def main():
         elif args.command == 'install':
             if args.local:
                 # Yerel dizinden yükle
-                success, message = install_from_directory(args.source, args.force)
-            elif args.source.endswith('.zip') or '/' in args.source:
+                from installer import install_from_directory
+                for source in args.source:
+                    success, message = install_from_directory(source, args.force)
+                    if not success:
+                        break
+            elif any(source.endswith('.zip') or '/' in source for source in args.source):
                 # Zip dosyası veya URL
-                success, message = install_package(args.source, args.force)
+                from installer import install_package
+                for source in args.source:
+                    success, message = install_package(source, args.force)
+                    if not success:
+                        break
+            elif len(args.source) > 1:
+                # Çoklu kurulum: bağımlılık sırasına göre, eşzamanlı indirme ile
+                from install_command import install_apps
+                success, message = install_apps(args.source, args.jobs, args.isolated)
             else:
                 # Yeni install komutu (GitHub'dan index.json ile)
-                success, message = install_app(args.source)
+                from install_command import install_app
+                success, message = install_app(args.source[0], args.isolated)
             
             if not success:
                 print(f"❌ {message}")
@@ -297,6 +338,7 @@ def main():
         
         elif args.command == 'uninstall':
             # Yeni uninstall komutu
+            from uninstall_command import uninstall_app
             success, message = uninstall_app(args.app_name, args.yes)
             print(message)
             sys.exit(0 if success else 1)
@@ -305,10 +347,12 @@ def main():
         
         elif args.command == 'update-apps':
             # Yeni update-apps komutu
+            from update_command import handle_update_command
             success = handle_update_command(args)
             sys.exit(0 if success else 1)
         
         elif args.command == 'search':
+            from cli_commands import search_remote_packages
             success, message = search_remote_packages(args.query)
             if not success:
                 print(f"❌ {message}")
@@ -317,16 +361,19 @@ def main():
         elif args.command == 'info':
             if args.remote:
                 # Eski remote info fonksiyonu
+                from cli_commands import show_package_info
                 success, message = show_package_info(args.app_name, args.remote)
                 if not success:
                     print(f"❌ {message}")
                     sys.exit(1)
             else:
                 # Yeni detaylı info komutu
+                from info_command import show_app_info
                 success = show_app_info(args.app_name)
                 sys.exit(0 if success else 1)
         
         elif args.command == 'validate':
+            from validate_command import validate_app_folder
             success = validate_app_folder(args.folder)
             sys.exit(0 if success else 1)
         
@@ -334,29 +381,35 @@ def main():
             # Yeni publish komutu
             # app_path artık bir liste, boşlukları birleştir
             app_path = ' '.join(args.app_path)
+            from publish_command import publish_app
             success, message = publish_app(app_path, push_to_github=args.push)
             if not success:
                 print(f"❌ {message}")
                 sys.exit(1)
         
         elif args.command == 'remote':
+            from remote_registry import list_remote_packages
             output = list_remote_packages(args.details)
             print(output)
         
         elif args.command == 'health':
+            from cli_commands import check_system_health
             check_system_health()
         
 
         
         elif args.command == 'doctor':
+            from doctor_command import run_doctor
             success = run_doctor()
             sys.exit(0 if success else 1)
         
         elif args.command == 'clean':
+            from clean_command import run_clean
             success = run_clean(args.dry_run)
             sys.exit(0 if success else 1)
         
         elif args.command == 'where':
+            from where_command import handle_where_command
             success, message = handle_where_command(args)
             if not success:
                 print(f"❌ {message}")
@@ -365,6 +418,7 @@ def main():
 
         
         elif args.command == 'version':
+            from version_command import print_version, print_detailed_version
             if args.short:
                 print_version("short")
             elif args.json:
@@ -376,6 +430,13 @@ def main():
         
         elif args.command == 'dependency':
             # Dependency komutlarını işle
+            from dependency_resolver import (
+                handle_dependency_check,
+                handle_dependency_install,
+                handle_engine_check,
+                handle_dependency_tree,
+                handle_dependency_rdeps
+            )
             if args.dependency_command == 'check':
                 handle_dependency_check(args)
             elif args.dependency_command == 'install':
@@ -393,12 +454,17 @@ def main():
                 if not success:
                     print(f"❌ {message}")
                     sys.exit(1)
+            elif args.dependency_command == 'rdeps':
+                success, message = handle_dependency_rdeps(args)
+                if not success:
+                    sys.exit(1)
             else:
                 print("❌ Geçersiz dependency komutu")
                 sys.exit(1)
         
         elif args.command == 'new':
             # Yeni uygulama oluşturma komutu
+            from new_command import handle_new_command
             if not args.language and not args.app_name and not args.list:
                 # Sadece 'clapp new' çalıştırıldıysa şablonları listele
                 success, message = handle_new_command(type('Args', (), {'list': True})())
@@ -417,6 +483,7 @@ def main():
             
         elif args.command == 'security':
             if args.action == 'check':
+                from package_signing import check_package_security
                 results = check_package_security(args.package_path)
                 print("🔒 Paket Güvenlik Kontrolü")
                 print("=" * 40)
@@ -432,6 +499,7 @@ def main():
                 sys.exit(1)
         
         elif args.command == 'update':
+            from version_manager import check_app_updates, increment_app_version
             if args.action == 'check':
                 if not args.app:
                     print("❌ --app parametresi gerekli")
@@ -472,14 +540,27 @@ def main():
                 print(f"Eski: {current_version} → Yeni: {new_version}")
         
         elif args.command == 'cache':
+            from cache_manager import get_cache_stats, clear_all_caches, download_packages_parallel
             if args.action == 'stats':
-                stats = get_cache_stats()
+                stats = get_cache_stats(verify=args.verify)
                 print("📊 Cache İstatistikleri")
                 print("=" * 30)
+                if 'verify' in stats:
+                    fixes = stats['verify']
+                    print(f"🔍 Doğrulama: {fixes['added']} eklendi, {fixes['removed']} silindi, "
+                          f"{fixes['resized']} boyut düzeltildi")
                 print(f"Hit: {stats['hits']}")
                 print(f"Miss: {stats['misses']}")
                 print(f"Hit Rate: {stats['hit_rate']}%")
                 print(f"Boyut: {stats['size_mb']} MB")
+                print(f"Tahliye: {stats['evictions']}")
+                print()
+                for cache_type, info in stats['types'].items():
+                    used_mb = info['size_bytes'] / (1024 * 1024)
+                    budget_mb = info['budget_bytes'] / (1024 * 1024)
+                    print(f"  {cache_type:<10} {info['files']:>5} dosya  "
+                          f"{used_mb:>8.2f} / {budget_mb:.0f} MB  "
+                          f"tahliye: {info['evictions']}")
             
             elif args.action == 'clear':
                 deleted_count = clear_all_caches()
@@ -499,6 +580,7 @@ def main():
                     print(f"{'✅' if success else '❌'} {message}")
         
         elif args.command == 'search':
+            from smart_search import search_packages, get_search_suggestions, get_search_analytics, clear_search_history
             if args.suggestions:
                 from package_registry import list_packages
                 packages = list_packages()
@@ -536,7 +618,7 @@ def main():
                 if args.sort:
                     filters['sort_by'] = args.sort
                 
-                results = search_packages(args.query, packages, filters)
+                results = search_packages(args.query, packages, filters, source="installed")
                 
                 print(f"🔍 '{args.query}' için {len(results)} sonuç bulundu")
                 print("=" * 50)
@@ -1,6 +1,5 @@
 import os
 import json
-from manifest_schema import validate_manifest
 
 def get_apps_directory():
     """Uygulamaların kurulacağı dizini döndürür"""
@@ -19,39 +18,30 @@ def list_packages():
     """
     Yüklü paketlerin listesini döndürür.
     
+    Kurulu uygulama indeksini kullanır; manifest'ler sadece değiştiklerinde okunur.
+    
     Returns:
         list: Yüklü paketlerin listesi (dict formatında)
     """
+    from installed_index import get_installed_index
+    
+    get_apps_directory()
     packages = []
-    apps_dir = get_apps_directory()
     
-    # apps dizinindeki her klasörü kontrol et
-    for app_name in os.listdir(apps_dir):
-        app_path = os.path.join(apps_dir, app_name)
+    for entry in get_installed_index().entries().values():
+        # Sadece geçerli manifest'e sahip uygulamalar
+        if not entry.get('valid'):
+            continue
         
-        # Sadece dizinleri kontrol et
-        if os.path.isdir(app_path):
-            manifest_path = os.path.join(app_path, "manifest.json")
-            
-            # Manifest dosyası varsa
-            if os.path.exists(manifest_path):
-                try:
-                    with open(manifest_path, 'r', encoding='utf-8') as f:
-                        manifest = json.load(f)
-                    
-                    # Manifest geçerliyse listeye ekle
-                    if validate_manifest(manifest):
-                        packages.append({
-                            'name': manifest['name'],
-                            'version': manifest.get('version', '0.0.0'),
-                            'language': manifest.get('language', 'unknown'),
-                            'description': manifest.get('description', 'Açıklama yok'),
-                            'entry': manifest.get('entry', 'main.py'),
-                            'dependencies': manifest.get('dependencies', [])
-                        })
-                except (json.JSONDecodeError, KeyError):
-                    # Geçersiz manifest dosyası, atla
-                    continue
+        manifest = entry['manifest']
+        packages.append({
+            'name': manifest['name'],
+            'version': manifest.get('version', '0.0.0'),
+            'language': manifest.get('language', 'unknown'),
+            'description': manifest.get('description', 'Açıklama yok'),
+            'entry': manifest.get('entry', 'main.py'),
+            'dependencies': manifest.get('dependencies', [])
+        })
     
     return packages
 
@@ -65,25 +55,10 @@ def get_manifest(app_name):
     Returns:
         dict or None: Manifest bilgileri veya None (bulunamazsa)
     """
-    apps_dir = get_apps_directory()
-    app_path = os.path.join(apps_dir, app_name)
-    manifest_path = os.path.join(app_path, "manifest.json")
-    
-    if not os.path.exists(manifest_path):
-        return None
+    from installed_index import get_installed_index
     
-    try:
-        with open(manifest_path, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
-        
-        # Manifest geçerliyse döndür
-        if validate_manifest(manifest):
-            return manifest
-        else:
-            return None
-            
-    except (json.JSONDecodeError, FileNotFoundError):
-        return None
+    get_apps_directory()
+    return get_installed_index().get_manifest(app_name)
 
 def app_exists(app_name):
     """
@@ -104,28 +79,7 @@ def list_app_names():
     Returns:
         list: Uygulama isimlerinin listesi (string formatında)
     """
-    app_names = []
-    apps_dir = get_apps_directory()
-    
-    # apps dizinindeki her klasörü kontrol et
-    for app_name in os.listdir(apps_dir):
-        app_path = os.path.join(apps_dir, app_name)
-        
-        # Sadece dizinleri kontrol et
-        if os.path.isdir(app_path):
-            manifest_path = os.path.join(app_path, "manifest.json")
-            
-            # Manifest dosyası varsa
-            if os.path.exists(manifest_path):
-                try:
-                    with open(manifest_path, 'r', encoding='utf-8') as f:
-                        manifest = json.load(f)
-                    
-                    # Manifest geçerliyse listeye ekle
-                    if validate_manifest(manifest):
-                        app_names.append(app_name)
-                except (json.JSONDecodeError, KeyError):
-                    # Geçersiz manifest dosyası, atla
-                    continue
+    from installed_index import get_installed_index
     
-    return app_names 
\ No newline at end of file
+    get_apps_directory()
+    return [folder for folder, entry in get_installed_index().entries().items() if entry.get('valid')]
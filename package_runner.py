@@ -361,6 +361,13 @@ def run_app(app_name: str) -> bool:
     language = manifest['language'].lower()
     runner = get_runner_for_language(language)
     
+    # İzole ortamı olan Python uygulamaları kendi yorumlayıcısıyla çalışır
+    if language == 'python':
+        from app_env import get_app_python
+        env_python = get_app_python(app_name)
+        if env_python:
+            runner = LanguageRunner('Python', env_python, '.py')
+    
     if not runner:
         # Eğer özel runner bulunamazsa, evrensel runner'ı dene
         print(f"⚠️  '{language}' için özel runner bulunamadı, evrensel runner deneniyor...")
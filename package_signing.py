@@ -30,19 +30,17 @@ class PackageSigner:
         """
         Dosyanın SHA-256 checksum'unu hesaplar
 
+        İmza doğrulamasında kullanıldığı için cache'e bakmadan dosya
+        içeriğinden hesaplanır.
+
         Args:
             file_path: Dosya yolu
 
         Returns:
             SHA-256 hash (hex formatında)
         """
-        sha256_hash = hashlib.sha256()
-
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
-
-        return sha256_hash.hexdigest()
+        from file_hasher import compute_file_hash
+        return compute_file_hash(file_path)
 
     def calculate_package_checksum(self, package_path: str) -> Dict[str, str]:
         """
@@ -8,9 +8,7 @@ Bu modül indirme ve yükleme işlemleri için progress bar ve hız göstergesi
 import sys
 import time
 import threading
-from typing import Optional, Callable
-from urllib.request import urlopen
-from urllib.error import URLError
+from typing import Optional, Callable, Tuple
 from tqdm import tqdm
 
 
@@ -89,31 +87,203 @@ class ProgressBar:
             return f"{size/(1024*1024*1024):.1f} GB"
 
 
-def download_with_progress(url: str, filename: str, description: str = "İndiriliyor") -> bool:
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+def _load_part_meta(meta_path: str) -> dict:
+    import json
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+def _save_part_meta(meta_path: str, meta: dict):
+    import json
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+def _parse_content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """'bytes 100-199/1000' -> (100, 1000); toplam bilinmiyorsa (100, None)"""
+    try:
+        unit, _, spec = value.partition(' ')
+        byte_range, _, total = spec.partition('/')
+        start = int(byte_range.split('-')[0])
+        return start, (int(total) if total and total != '*' else None)
+    except Exception:
+        return None, None
+
+def get_partial_download_path(url: str, sha256: Optional[str] = None) -> str:
     """
-    tqdm ile dosya indirir
+    Yarım kalan indirmenin kalıcı .part yolunu döndürür
+    
+    Parçalar ~/.clapp/cache/partial altında tutulur; komut geçici dizini
+    silinse de (Ctrl-C, çökme) sonraki çalıştırma kaldığı yerden devam eder.
+    Anahtar sha256 biliniyorsa içerik, bilinmiyorsa URL'dir.
     """
-    try:
-        response = urlopen(url)
-        total_size = int(response.headers.get('content-length', 0))
-        response.close()
-        with urlopen(url) as response, open(filename, 'wb') as file, tqdm(
-            total=total_size, unit='B', unit_scale=True, desc=description, ncols=80
-        ) as bar:
-            downloaded = 0
-            chunk_size = 8192
-            while True:
-                chunk = response.read(chunk_size)
-                if not chunk:
-                    break
-                file.write(chunk)
-                downloaded += len(chunk)
-                bar.update(len(chunk))
+    import os
+    import hashlib
+    from pathlib import Path
+    
+    partial_dir = Path.home() / ".clapp" / "cache" / "partial"
+    partial_dir.mkdir(parents=True, exist_ok=True)
+    key = f"sha256-{sha256.lower()}" if sha256 else "url-" + hashlib.sha256(url.encode()).hexdigest()
+    return os.path.join(str(partial_dir), f"{key}.part")
+
+def _remove_part_files(part_path: str, meta_path: str):
+    import os
+    for path in (part_path, meta_path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def _hash_file_into(path: str, hasher):
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+
+def resumable_download(url: str, filename: str, description: str = "İndiriliyor",
+                       expected_size: Optional[int] = None, expected_sha256: Optional[str] = None,
+                       retries: int = 3, timeout: Optional[int] = None,
+                       part_path: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Kaldığı yerden devam edebilen, tek istekli indirme
+    
+    Gövde ve uzunluk aynı yanıttan alınır; veri önce '<dosya>.part' dosyasına
+    yazılır. Bağlantı koparsa tekrar denemede 'Range' + 'If-Range' (ETag veya
+    Last-Modified) ile devam edilir; sunucu dosyanın değiştiğini bildirirse
+    (200 yanıtı) baştan indirilir. sha256 akış sırasında hesaplanır, ayrıca
+    bir doğrulama okuması yapılmaz.
+    
+    Args:
+        url: İndirilecek URL
+        filename: Hedef dosya
+        description: Progress bar açıklaması
+        expected_size: Beklenen boyut (byte)
+        expected_sha256: Beklenen sha256
+        retries: Aktarım yarıda kesilirse kaç kez kaldığı yerden devam edileceği
+        timeout: Okuma zaman aşımı (saniye, varsayılan: ortak istemci ayarı)
+        part_path: Yarım verinin tutulacağı dosya (varsayılan: '<dosya>.part');
+            kalıcı bir yol verilirse sonraki çalıştırmalar da devam edebilir
+    
+    Returns:
+        (success, sha256 veya hata mesajı)
+    """
+    import os
+    import hashlib
+    from http_client import get_http_client
+    
+    client = get_http_client()
+    if part_path is None:
+        part_path = filename + ".part"
+    meta_path = part_path + ".json"
+    last_error = "bilinmeyen hata"
+    
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(min(2 ** (attempt - 1), 8))
+        
+        meta = _load_part_meta(meta_path)
+        validator = meta.get('etag') or meta.get('last_modified')
+        offset = 0
+        if os.path.exists(part_path) and meta.get('url') == url and validator:
+            offset = os.path.getsize(part_path)
+        
+        headers = {'Accept-Encoding': 'identity'}
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = validator
+        
+        hasher = hashlib.sha256()
+        try:
+            with client.stream(url, headers=headers, timeout=timeout) as response:
+                status = response.status_code
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                
+                if status == 416 and offset:
+                    # Aralık geçersiz: parça ya zaten tam ya da bozuk
+                    total = _parse_content_range(response.headers.get('Content-Range'))[1]
+                    if total is None or total != offset:
+                        os.remove(part_path)
+                        last_error = "Geçersiz aralık, indirme baştan başlatılacak"
+                        continue
+                    _hash_file_into(part_path, hasher)
+                elif status >= 400:
+                    last_error = f"HTTP {status}"
+                    if status < 500 and status != 429:
+                        break
+                    continue
+                else:
+                    if status == 206:
+                        start, total = _parse_content_range(response.headers.get('Content-Range'))
+                        if start != offset or (meta.get('etag') and etag and etag != meta['etag']):
+                            # Beklenmeyen aralık veya değişmiş dosya: baştan başla
+                            os.remove(part_path)
+                            last_error = "Sunucu beklenmeyen aralık döndürdü"
+                            continue
+                        # Mevcut parçanın hash'i (sadece eksik kısım ağdan gelir)
+                        _hash_file_into(part_path, hasher)
+                        mode = 'ab'
+                    else:
+                        offset = 0
+                        length = response.headers.get('Content-Length')
+                        total = int(length) if length and length.isdigit() else None
+                        mode = 'wb'
+                    
+                    if total is None:
+                        total = expected_size
+                    _save_part_meta(meta_path, {'url': url, 'etag': etag or (meta.get('etag') if status == 206 else None),
+                                                'last_modified': last_modified, 'total': total})
+                    
+                    downloaded = offset
+                    with open(part_path, mode) as file, tqdm(
+                        total=total, initial=offset, unit='B', unit_scale=True, desc=description, ncols=80
+                    ) as bar:
+                        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            file.write(chunk)
+                            hasher.update(chunk)
+                            downloaded += len(chunk)
+                            bar.update(len(chunk))
+                    
+                    if total is not None and downloaded < total:
+                        last_error = f"Bağlantı erken kapandı ({downloaded}/{total} byte)"
+                        continue
+        except Exception as e:
+            # Kısmi veri .part dosyasında kalır, sonraki denemede devam edilir
+            last_error = str(e)
+            continue
+        
+        actual_size = os.path.getsize(part_path)
+        if expected_size is not None and actual_size != expected_size:
+            _remove_part_files(part_path, meta_path)
+            return False, f"Boyut uyuşmuyor: beklenen {expected_size}, gelen {actual_size}"
+        
+        digest = hasher.hexdigest()
+        if expected_sha256 and digest != expected_sha256.lower():
+            _remove_part_files(part_path, meta_path)
+            return False, "sha256 doğrulaması başarısız"
+        
+        try:
+            os.replace(part_path, filename)
+        except OSError:
+            # Kalıcı parça dizini farklı bir dosya sisteminde olabilir
+            import shutil
+            shutil.move(part_path, filename)
+        _remove_part_files(part_path, meta_path)
         print(f"✅ {description} tamamlandı!")
-        return True
-    except Exception as e:
-        print(f"❌ İndirme hatası: {e}")
-        return False
+        return True, digest
+    
+    print(f"❌ İndirme hatası: {last_error}")
+    return False, f"İndirme hatası: {last_error}"
+
+def download_with_progress(url: str, filename: str, description: str = "İndiriliyor") -> bool:
+    """
+    tqdm ile dosya indirir (kesilirse kaldığı yerden devam eder)
+    """
+    success, _ = resumable_download(url, filename, description)
+    return success
 
 def copy_with_progress(src: str, dst: str, description: str = "Kopyalanıyor") -> bool:
     import os
@@ -160,6 +330,135 @@ def extract_with_progress(zip_path: str, extract_path: str, description: str = "
         print(f"❌ Çıkarma hatası: {e}")
         return False
 
+def extract_tar_with_progress(tar_path: str, extract_path: str, description: str = "Çıkarılıyor") -> bool:
+    """
+    tqdm ile .tar.gz arşivi çıkarır
+
+    Arşiv dışına yazmaya çalışan (mutlak yol, '..' veya link) üyeler reddedilir.
+    """
+    import tarfile
+    import os
+    try:
+        with tarfile.open(tar_path, 'r:*') as tar_ref:
+            members = tar_ref.getmembers()
+            if not members:
+                print(f"❌ Arşiv boş: {tar_path}")
+                return False
+            base_path = os.path.realpath(extract_path)
+            for member in members:
+                target = os.path.realpath(os.path.join(extract_path, member.name))
+                if member.issym() or member.islnk() or os.path.commonpath([base_path, target]) != base_path:
+                    print(f"❌ Güvenli olmayan arşiv üyesi: {member.name}")
+                    return False
+            with tqdm(total=len(members), desc=description, ncols=80, unit='dosya') as bar:
+                for member in members:
+                    tar_ref.extract(member, extract_path)
+                    bar.update(1)
+        print(f"✅ {description} tamamlandı!")
+        return True
+    except Exception as e:
+        print(f"❌ Çıkarma hatası: {e}")
+        return False
+
+def find_app_in_zip(zip_path: str, app_name: Optional[str] = None) -> Optional[Tuple[str, dict]]:
+    """
+    ZIP'in merkezi dizininden uygulama klasörünü bulur (diske hiçbir şey yazmaz)
+    
+    app_name verilirse '**/packages/{app_name}/manifest.json' aranır. Verilmezse
+    'name' alanı olan ilk (en sığ) manifest.json okunur ve varsa onun
+    packages/{name} klasörü, yoksa manifest'in bulunduğu klasör seçilir.
+    
+    Returns:
+        (klasör_öneki, manifest) veya None - önek '/' ile biter ya da boştur
+    """
+    import zipfile
+    import json
+    
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        names = zip_ref.namelist()
+        manifests = sorted((name for name in names if name.rsplit('/', 1)[-1] == "manifest.json"),
+                           key=lambda name: (name.count('/'), name))
+        
+        def read_manifest(member: str) -> Optional[dict]:
+            try:
+                data = json.loads(zip_ref.read(member).decode('utf-8'))
+            except Exception:
+                return None
+            return data if isinstance(data, dict) else None
+        
+        def packages_manifest(name: str) -> Optional[str]:
+            suffix = f"packages/{name}/manifest.json"
+            for member in manifests:
+                if member == suffix or member.endswith("/" + suffix):
+                    return member
+            return None
+        
+        if app_name:
+            member = packages_manifest(app_name)
+            if member is None:
+                return None
+            manifest = read_manifest(member)
+            return (member[:-len("manifest.json")], manifest) if manifest is not None else None
+        
+        for member in manifests:
+            manifest = read_manifest(member)
+            if manifest is None or 'name' not in manifest:
+                continue
+            packaged = packages_manifest(str(manifest['name']))
+            if packaged and packaged != member:
+                packaged_manifest = read_manifest(packaged)
+                if packaged_manifest is not None:
+                    return packaged[:-len("manifest.json")], packaged_manifest
+            return member[:-len("manifest.json")], manifest
+    
+    return None
+
+def extract_subtree_with_progress(zip_path: str, prefix: str, extract_path: str,
+                                  description: str = "Çıkarılıyor") -> bool:
+    """
+    ZIP'ten sadece prefix altındaki üyeleri, öneki atarak extract_path'e çıkarır
+    
+    Arşivin geri kalanı diske yazılmaz; G/Ç uygulamanın boyutuyla orantılıdır.
+    Arşiv dışına yazmaya çalışan üyeler reddedilir.
+    """
+    import zipfile
+    import shutil
+    import os
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            members = [info for info in zip_ref.infolist()
+                       if info.filename.startswith(prefix) and info.filename != prefix]
+            if not members:
+                print(f"❌ Arşivde klasör bulunamadı: {prefix or '/'}")
+                return False
+            
+            base_path = os.path.realpath(extract_path)
+            os.makedirs(base_path, exist_ok=True)
+            total_size = sum(info.file_size for info in members)
+            
+            with tqdm(total=total_size, desc=description, ncols=80, unit='B', unit_scale=True) as bar:
+                for info in members:
+                    relative = info.filename[len(prefix):]
+                    target = os.path.realpath(os.path.join(base_path, relative))
+                    if os.path.commonpath([base_path, target]) != base_path:
+                        print(f"❌ Güvenli olmayan arşiv üyesi: {info.filename}")
+                        return False
+                    
+                    if info.is_dir():
+                        os.makedirs(target, exist_ok=True)
+                        continue
+                    
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with zip_ref.open(info) as source, open(target, 'wb') as destination:
+                        shutil.copyfileobj(source, destination, 1024 * 1024)
+                    bar.update(info.file_size)
+        
+        print(f"✅ {description} tamamlandı!")
+        return True
+    except Exception as e:
+        print(f"❌ Çıkarma hatası: {e}")
+        return False
+
 def show_success_message(message: str):
     print(f"✅ {message}")
 
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+registry_client.py - Paket Registry İstemcisi
+
+Bu modül index.json'u tek bir yerden yönetir:
+- Koşullu HTTP istekleri (ETag / If-Modified-Since)
+- ~/.clapp/cache/index altında disk snapshot'ı (CacheManager türlerinin
+  dışında; bütçe tahliyesi ve cache clear snapshot'a dokunmaz)
+- TTL süresi içinde ağa hiç çıkmadan snapshot'tan okuma
+- Çevrimdışı modda veya ağ hatasında snapshot'a geri dönme
+- Süreç kapsamlı oturum: bir çalıştırmada index en fazla bir kez yüklenir
+
+Ayarlar:
+    CLAPP_REGISTRY_TTL  Snapshot'ın tazelik süresi (saniye, varsayılan 300)
+    CLAPP_OFFLINE       1/true ise hiç ağ isteği yapılmaz
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_INDEX_URL = "https://raw.githubusercontent.com/mburakmmm/clapp-packages/main/index.json"
+DEFAULT_TTL = 300
+
+# fetch() tarafından döndürülen veri kaynakları
+SOURCE_SNAPSHOT = "snapshot"          # TTL içinde, ağa çıkılmadı
+SOURCE_NOT_MODIFIED = "not_modified"  # 304, saklanan gövde kullanıldı
+SOURCE_NETWORK = "network"            # Yeni gövde indirildi
+SOURCE_OFFLINE = "offline"            # Çevrimdışı mod veya ağ hatası, snapshot kullanıldı
+
+SOURCE_MESSAGES = {
+    SOURCE_SNAPSHOT: "Index önbellekten yüklendi",
+    SOURCE_NOT_MODIFIED: "Index güncel (304), önbellekten yüklendi",
+    SOURCE_NETWORK: "GitHub'dan index indirildi",
+    SOURCE_OFFLINE: "Yerel index snapshot'ı yüklendi (çevrimdışı)",
+}
+
+
+def get_registry_ttl() -> int:
+    """CLAPP_REGISTRY_TTL ortam değişkeninden TTL değerini okur"""
+    try:
+        return max(0, int(os.environ.get("CLAPP_REGISTRY_TTL", DEFAULT_TTL)))
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def is_offline() -> bool:
+    """CLAPP_OFFLINE ortam değişkeni açık mı kontrol eder"""
+    return os.environ.get("CLAPP_OFFLINE", "").lower() in ("1", "true", "yes", "on")
+
+
+class RegistryError(Exception):
+    """Index ne ağdan ne de snapshot'tan alınabildiğinde fırlatılır"""
+
+
+class RegistryClient:
+    """Koşullu istek ve disk snapshot'ı kullanan index istemcisi"""
+
+    def __init__(self, url: str = DEFAULT_INDEX_URL, cache_dir: Optional[str] = None,
+                 ttl: Optional[int] = None, offline: Optional[bool] = None):
+        """
+        RegistryClient başlatıcısı
+
+        Args:
+            url: Index URL'si
+            cache_dir: Snapshot dizini (varsayılan: ~/.clapp/cache/index)
+            ttl: Snapshot tazelik süresi (saniye)
+            offline: True ise hiç ağ isteği yapılmaz
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".clapp", "cache", "index")
+
+        self.url = url
+        self.cache_dir = Path(cache_dir)
+        self.ttl = get_registry_ttl() if ttl is None else ttl
+        self.offline = is_offline() if offline is None else offline
+
+        key = hashlib.md5(url.encode()).hexdigest()
+        self.body_file = self.cache_dir / f"index-{key}.json"
+        self.meta_file = self.cache_dir / f"index-{key}.meta.json"
+
+    def _load_meta(self) -> Dict[str, Any]:
+        """Snapshot meta verilerini (ETag, Last-Modified, fetched_at) yükler"""
+        try:
+            with open(self.meta_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _load_body(self) -> Optional[Any]:
+        """Saklanan index gövdesini parse eder"""
+        try:
+            with open(self.body_file, 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        except Exception:
+            return None
+
+    def _write_atomic(self, path: Path, data: bytes):
+        """Dosyayı önce geçici dosyaya yazıp os.replace ile yerine koyar"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _save_meta(self, meta: Dict[str, Any]):
+        self._write_atomic(self.meta_file, json.dumps(meta, indent=2).encode('utf-8'))
+
+    def snapshot_age(self) -> Optional[float]:
+        """Snapshot'ın son doğrulanmasından bu yana geçen süre (yoksa None)"""
+        meta = self._load_meta()
+        if "fetched_at" not in meta or not self.body_file.exists():
+            return None
+        return time.time() - meta["fetched_at"]
+
+    def fetch(self, force: bool = False, timeout: int = 10) -> Tuple[Any, str]:
+        """
+        Index'i döndürür, gerekirse koşullu istekle tazeler
+
+        Args:
+            force: TTL'i yok sayıp sunucuya koşullu istek gönder
+            timeout: İstek zaman aşımı (saniye)
+
+        Returns:
+            (index_data, source)
+
+        Raises:
+            RegistryError: Index hiçbir kaynaktan alınamazsa
+        """
+        meta = self._load_meta()
+        age = self.snapshot_age()
+
+        # 1. Çevrimdışı mod veya taze snapshot: ağa çıkma
+        if age is not None and (self.offline or (not force and age < self.ttl)):
+            data = self._load_body()
+            if data is not None:
+                return data, SOURCE_OFFLINE if self.offline else SOURCE_SNAPSHOT
+
+        if self.offline:
+            raise RegistryError("Çevrimdışı mod açık ve yerel index snapshot'ı yok")
+
+        # 2. Koşullu istek
+        headers = {'Accept': 'application/json'}
+        if self.body_file.exists():
+            if meta.get("etag"):
+                headers['If-None-Match'] = meta["etag"]
+            if meta.get("last_modified"):
+                headers['If-Modified-Since'] = meta["last_modified"]
+
+        try:
+            from http_client import get_http_client
+            response = get_http_client().get(self.url, headers=headers, timeout=timeout)
+            if response.status_code == 304:
+                data = self._load_body()
+                if data is not None:
+                    meta["fetched_at"] = time.time()
+                    self._save_meta(meta)
+                    return data, SOURCE_NOT_MODIFIED
+            response.raise_for_status()
+
+            body = response.content
+            data = json.loads(body.decode('utf-8'))
+            new_meta = {
+                "url": self.url,
+                "etag": response.headers.get('ETag'),
+                "last_modified": response.headers.get('Last-Modified'),
+                "fetched_at": time.time(),
+            }
+            self._write_atomic(self.body_file, body)
+            self._save_meta(new_meta)
+            return data, SOURCE_NETWORK
+
+        except (OSError, ValueError) as e:
+            # requests hataları OSError alt sınıfıdır; ValueError bozuk JSON içindir
+            fallback_error = e
+
+        # 3. Ağ hatası: eski de olsa snapshot'ı kullan
+        data = self._load_body()
+        if data is not None:
+            return data, SOURCE_OFFLINE
+
+        raise RegistryError(f"Network hatası: {fallback_error}")
+
+    def clear(self):
+        """Bu URL'ye ait snapshot'ı siler"""
+        for path in (self.body_file, self.meta_file):
+            if path.exists():
+                path.unlink()
+
+
+def fetch_index(url: str = DEFAULT_INDEX_URL, force: bool = False) -> Tuple[Any, str]:
+    """Varsayılan ayarlarla index'i getirir (bkz. RegistryClient.fetch)"""
+    return RegistryClient(url).fetch(force=force)
+
+
+class RegistrySession:
+    """
+    Tek bir CLI çalıştırması boyunca index'i en fazla bir kez yükleyen oturum
+
+    Paketler ad -> paket sözlüğünde tutulur; get() O(1) arama yapar.
+    fetch_count, bu oturumun RegistryClient.fetch() çağrı sayısıdır.
+    """
+
+    def __init__(self, url: str = DEFAULT_INDEX_URL, client: Optional[RegistryClient] = None):
+        self.url = url
+        self.client = client or RegistryClient(url)
+        self.fetch_count = 0
+        self.source: Optional[str] = None
+        self._packages: Optional[List[Dict[str, Any]]] = None
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._by_language: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._error: Optional[RegistryError] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Index bu oturumda yüklenmeye çalışıldı mı"""
+        return self._packages is not None or self._error is not None
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Paket listesini döndürür; ilk çağrıda index'i getirir
+
+        Raises:
+            RegistryError: Index alınamadıysa (hata da oturumda saklanır)
+        """
+        if self._error is not None:
+            raise self._error
+
+        if self._packages is None:
+            self.fetch_count += 1
+            try:
+                data, self.source = self.client.fetch()
+            except RegistryError as e:
+                self._error = e
+                raise
+            except Exception as e:
+                self._error = RegistryError(f"Index yükleme hatası: {e}")
+                raise self._error
+            self._packages = data if isinstance(data, list) else []
+            self._by_name = {
+                package.get('name'): package
+                for package in self._packages
+                if isinstance(package, dict)
+            }
+
+        return self._packages
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Paketi adıyla döndürür (yoksa None)"""
+        self.load()
+        return self._by_name.get(name)
+
+    def by_language(self, language: str) -> List[Dict[str, Any]]:
+        """Belirtilen dildeki paketleri döndürür (dil indeksi ilk çağrıda kurulur)"""
+        packages = self.load()
+        if self._by_language is None:
+            self._by_language = {}
+            for package in packages:
+                if isinstance(package, dict):
+                    key = str(package.get('language', '')).lower()
+                    self._by_language.setdefault(key, []).append(package)
+        return list(self._by_language.get(language.lower(), []))
+
+    def snapshot_version(self) -> Optional[str]:
+        """Yüklenen index snapshot'ının sha256 özeti (snapshot yoksa None)"""
+        self.load()
+        try:
+            from file_hasher import hash_file
+            return hash_file(str(self.client.body_file))
+        except OSError:
+            return None
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """Index'te BM25 sıralı arama yapar (bkz. search_index.search_registry)"""
+        from search_index import search_registry
+        return search_registry(self, query, limit)
+
+    def names(self) -> List[str]:
+        """Index'teki paket adlarını döndürür"""
+        self.load()
+        return list(self._by_name.keys())
+
+    def invalidate(self):
+        """Oturumu sıfırlar; bir sonraki load() index'i yeniden getirir"""
+        self._packages = None
+        self._by_name = {}
+        self._by_language = None
+        self._error = None
+        self.source = None
+
+
+# Süreç boyunca URL başına tek oturum
+_sessions: Dict[str, RegistrySession] = {}
+
+
+def get_registry_session(url: str = DEFAULT_INDEX_URL) -> RegistrySession:
+    """URL için süreç kapsamlı RegistrySession döndürür"""
+    session = _sessions.get(url)
+    if session is None:
+        session = RegistrySession(url)
+        _sessions[url] = session
+    return session
+
+
+def reset_registry_sessions():
+    """Tüm süreç kapsamlı oturumları atar (testler ve uzun süreli süreçler için)"""
+    _sessions.clear()
@@ -1,33 +1,41 @@
 import json
-import urllib.request
 import urllib.parse
 from typing import List, Dict, Optional
+from registry_client import RegistryError, RegistrySession, get_registry_session
 
 # Uzak paket deposu URL'si
 REMOTE_PACKAGES_URL = "https://raw.githubusercontent.com/mburakmmm/clapp-packages/main/packages.json"
 
+def get_remote_session() -> RegistrySession:
+    """Uzak paket deposu için süreç kapsamlı registry oturumunu döndürür"""
+    return get_registry_session(REMOTE_PACKAGES_URL)
+
 def fetch_remote_packages() -> List[Dict]:
     """
     Uzak paket deposundan paket listesini indirir.
     
+    Liste süreç kapsamlı registry oturumundan alınır; bir çalıştırmada
+    index en fazla bir kez getirilir (TTL içinde ağa hiç çıkılmaz).
+    
     Returns:
         list: Paket listesi (dict formatında)
     """
+    session = get_remote_session()
+    first_load = not session.loaded
+    
     try:
-        print("Uzak paket deposu kontrol ediliyor...")
-        
-        # HTTP isteği gönder
-        with urllib.request.urlopen(REMOTE_PACKAGES_URL) as response:
-            data = response.read().decode('utf-8')
+        if first_load:
+            print("Uzak paket deposu kontrol ediliyor...")
         
-        # JSON'u parse et
-        packages = json.loads(data)
+        packages = session.load()
         
-        print(f"✅ {len(packages)} paket bulundu")
+        if first_load:
+            print(f"✅ {len(packages)} paket bulundu")
         return packages
         
-    except urllib.error.URLError as e:
-        print(f"❌ Ağ hatası: {e}")
+    except RegistryError as e:
+        if first_load:
+            print(f"❌ Ağ hatası: {e}")
         return []
     except json.JSONDecodeError as e:
         print(f"❌ JSON parse hatası: {e}")
@@ -46,18 +54,19 @@ def get_package_info(app_name: str) -> Optional[Dict]:
     Returns:
         dict or None: Paket bilgileri veya None
     """
-    packages = fetch_remote_packages()
-    
-    for package in packages:
-        if package.get('name') == app_name:
-            return package
+    if not fetch_remote_packages():
+        return None
     
-    return None
+    return get_remote_session().get(app_name)
 
 def search_packages(query: str) -> List[Dict]:
     """
     Paket deposunda arama yapar.
     
+    Sonuçlar BM25 skoruna göre sıralıdır (ad, açıklama ve dil alanları).
+    Kelime içinde geçen eşleşmeler (ör. "pad" -> "cloud-notepad") eski alt
+    dize taramasıyla bulunur ve sıralı sonuçların arkasına eklenir.
+    
     Args:
         query (str): Arama terimi
         
@@ -65,11 +74,17 @@ def search_packages(query: str) -> List[Dict]:
         list: Eşleşen paketler
     """
     packages = fetch_remote_packages()
-    results = []
+    if not packages:
+        return []
     
+    results = [package for package, _ in get_remote_session().search(query)]
+    seen = {id(package) for package in results}
     query_lower = query.lower()
     
     for package in packages:
+        if id(package) in seen:
+            continue
+        
         # İsim, açıklama ve dilde arama yap
         name = package.get('name', '').lower()
         description = package.get('description', '').lower()
@@ -92,14 +107,10 @@ def get_packages_by_language(language: str) -> List[Dict]:
     Returns:
         list: Belirtilen dildeki paketler
     """
-    packages = fetch_remote_packages()
-    filtered_packages = []
-    
-    for package in packages:
-        if package.get('language', '').lower() == language.lower():
-            filtered_packages.append(package)
+    if not fetch_remote_packages():
+        return []
     
-    return filtered_packages
+    return get_remote_session().by_language(language)
 
 def list_remote_packages(show_details=False) -> str:
     """
@@ -164,9 +175,8 @@ def validate_package_url(url: str) -> bool:
             return False
         
         # HTTP HEAD isteği gönder
-        request = urllib.request.Request(url, method='HEAD')
-        with urllib.request.urlopen(request) as response:
-            return response.status == 200
+        from http_client import get_http_client
+        return get_http_client().head(url).status_code == 200
             
     except Exception:
         return False
@@ -239,9 +249,8 @@ def check_remote_connectivity() -> bool:
         bool: Bağlantı varsa True
     """
     try:
-        request = urllib.request.Request(REMOTE_PACKAGES_URL, method='HEAD')
-        with urllib.request.urlopen(request, timeout=5) as response:
-            return response.status == 200
+        from http_client import get_http_client
+        return get_http_client().head(REMOTE_PACKAGES_URL, timeout=5).status_code == 200
     except Exception:
         return False
 
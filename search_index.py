@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+search_index.py - Kalıcı BM25 Arama İndeksi
+
+Bu modül index.json yayınlanırken yanına yazılan ikili arama indeksini
+(search_index.bin) üretir ve okur:
+- Ad, açıklama ve dil alanları için ayrı terim frekansları ve doküman
+  uzunlukları (BM25F)
+- Sıralı terim tablosu: terim araması ikili arama ile yapılır, indeks
+  belleğe kopyalanmadan mmap üzerinden okunur
+- İndeks, ait olduğu index.json'un sha256 özetini taşır; istemci indeksi
+  index sürümü başına bir kez indirir (veya yoksa bir kez kendisi üretir)
+  ve ~/.clapp/cache/index altında saklar
+
+Dosya biçimi (little-endian):
+    başlık | sürüm (utf-8) | doküman tablosu | terim tablosu | postings | metinler
+"""
+
+import os
+import re
+import math
+import mmap
+import heapq
+import struct
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SEARCH_INDEX_FILE = "search_index.bin"
+SEARCH_INDEX_MAGIC = b"CLSI"
+SEARCH_INDEX_FORMAT = 1
+
+# Alan sırası dosya biçiminin parçasıdır; değiştirmek SEARCH_INDEX_FORMAT artırmayı gerektirir
+FIELDS = ("name", "description", "language")
+DEFAULT_FIELD_WEIGHTS = (3.0, 1.0, 2.0)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Tam eşleşmeyen ama sorgu kelimesiyle başlayan terimlerin ağırlığı
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_TERMS = 32
+MIN_PREFIX_LENGTH = 2
+
+# magic, format, alan sayısı, doküman sayısı, terim sayısı, alan ağırlıkları,
+# ortalama alan uzunlukları, sürüm uzunluğu, bölüm ofsetleri (doküman, terim, posting, metin)
+_HEADER = struct.Struct("<4sHHII3f3fIIIII")
+# ad ofseti, ad uzunluğu, alan uzunlukları
+_DOC = struct.Struct("<IH3H")
+# terim ofseti, terim uzunluğu, ilk posting, posting sayısı
+_TERM = struct.Struct("<IHII")
+# doküman no, alan terim frekansları
+_POSTING = struct.Struct("<I3H")
+
+_U16_MAX = 0xFFFF
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+class SearchIndexError(Exception):
+    """Arama indeksi okunamadığında veya biçimi tanınmadığında fırlatılır"""
+
+
+def tokenize(text: Any) -> List[str]:
+    """Metni küçük harfli kelimelere ayırır ('my-app_cli' -> ['my', 'app', 'cli'])"""
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+def index_version_of(data: bytes) -> str:
+    """index.json gövdesinin indeks sürümü olarak kullanılan sha256 özeti"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def build_search_index(packages: Iterable[Dict[str, Any]], version: str = "",
+                       field_weights: Tuple[float, float, float] = DEFAULT_FIELD_WEIGHTS) -> bytes:
+    """
+    Paket listesinden ikili arama indeksi üretir
+
+    Aynı girdi her zaman aynı baytları üretir (terimler sıralıdır,
+    dokümanlar paket sırasını korur).
+
+    Args:
+        packages: index.json paketleri
+        version: Gömülecek indeks sürümü (bkz. index_version_of)
+        field_weights: Ad, açıklama ve dil alanlarının ağırlıkları
+
+    Returns:
+        İndeks dosyasının içeriği
+    """
+    strings = bytearray()
+    docs = bytearray()
+    postings_by_term: Dict[str, List[Tuple[int, int, int, int]]] = {}
+    length_totals = [0, 0, 0]
+    doc_count = 0
+
+    for package in packages:
+        if not isinstance(package, dict) or not package.get('name'):
+            continue
+
+        doc_id = doc_count
+        doc_count += 1
+
+        frequencies: Dict[str, List[int]] = {}
+        lengths = []
+        for field_no, field in enumerate(FIELDS):
+            tokens = tokenize(package.get(field, ''))
+            lengths.append(min(len(tokens), _U16_MAX))
+            length_totals[field_no] += lengths[-1]
+            for token in tokens:
+                counts = frequencies.setdefault(token, [0, 0, 0])
+                counts[field_no] = min(counts[field_no] + 1, _U16_MAX)
+
+        for token, counts in frequencies.items():
+            postings_by_term.setdefault(token, []).append((doc_id, counts[0], counts[1], counts[2]))
+
+        name = str(package['name']).encode('utf-8')[:_U16_MAX]
+        docs += _DOC.pack(len(strings), len(name), *lengths)
+        strings += name
+
+    terms = bytearray()
+    postings = bytearray()
+    posting_count = 0
+    encoded_terms = sorted((token.encode('utf-8')[:_U16_MAX], token) for token in postings_by_term)
+    for encoded, token in encoded_terms:
+        entries = postings_by_term[token]
+        terms += _TERM.pack(len(strings), len(encoded), posting_count, len(entries))
+        strings += encoded
+        for entry in entries:
+            postings += _POSTING.pack(*entry)
+        posting_count += len(entries)
+
+    averages = [total / doc_count if doc_count else 0.0 for total in length_totals]
+    version_bytes = version.encode('utf-8')
+
+    docs_offset = _HEADER.size + len(version_bytes)
+    terms_offset = docs_offset + len(docs)
+    postings_offset = terms_offset + len(terms)
+    strings_offset = postings_offset + len(postings)
+
+    header = _HEADER.pack(SEARCH_INDEX_MAGIC, SEARCH_INDEX_FORMAT, len(FIELDS), doc_count,
+                          len(encoded_terms), *field_weights, *averages, len(version_bytes),
+                          docs_offset, terms_offset, postings_offset, strings_offset)
+    return b"".join((header, version_bytes, bytes(docs), bytes(terms), bytes(postings), bytes(strings)))
+
+
+def write_search_index(packages: Iterable[Dict[str, Any]], path: str, version: str = "") -> int:
+    """
+    Arama indeksini üretip dosyaya atomik olarak yazar
+
+    Returns:
+        Yazılan bayt sayısı
+    """
+    data = build_search_index(packages, version)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return len(data)
+
+
+class SearchIndexReader:
+    """
+    İkili arama indeksi üzerinde BM25F sorguları
+
+    Tampon (bytes veya mmap) kopyalanmaz; sorgu sırasında yalnızca ilgili
+    terim ve posting kayıtları okunur.
+    """
+
+    def __init__(self, buffer):
+        """
+        Args:
+            buffer: build_search_index çıktısı veya onu gösteren mmap
+
+        Raises:
+            SearchIndexError: Biçim tanınmazsa
+        """
+        if len(buffer) < _HEADER.size:
+            raise SearchIndexError("Arama indeksi çok kısa")
+
+        (magic, file_format, field_count, self.doc_count, self.term_count,
+         w_name, w_desc, w_lang, a_name, a_desc, a_lang, version_length,
+         self._docs_offset, self._terms_offset, self._postings_offset,
+         self._strings_offset) = _HEADER.unpack_from(buffer, 0)
+
+        if magic != SEARCH_INDEX_MAGIC:
+            raise SearchIndexError("Arama indeksi tanınmadı")
+        if file_format != SEARCH_INDEX_FORMAT or field_count != len(FIELDS):
+            raise SearchIndexError(f"Desteklenmeyen arama indeksi biçimi: {file_format}")
+        if self._strings_offset > len(buffer):
+            raise SearchIndexError("Arama indeksi eksik")
+
+        self._buffer = buffer
+        self.field_weights = (w_name, w_desc, w_lang)
+        self.average_lengths = (a_name, a_desc, a_lang)
+        self.version = bytes(buffer[_HEADER.size:_HEADER.size + version_length]).decode('utf-8')
+
+    def close(self):
+        """mmap üzerindeyse eşlemeyi kapatır"""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings_offset + offset
+        return bytes(self._buffer[start:start + length])
+
+    def _term(self, term_no: int) -> Tuple[bytes, int, int]:
+        offset, length, first, count = _TERM.unpack_from(self._buffer, self._terms_offset + term_no * _TERM.size)
+        return self._string(offset, length), first, count
+
+    def _lower_bound(self, key: bytes) -> int:
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _matching_terms(self, token: str) -> List[Tuple[int, int, float]]:
+        """Sorgu kelimesi için (ilk posting, posting sayısı, ağırlık) listesi"""
+        key = token.encode('utf-8')
+        matches = []
+        term_no = self._lower_bound(key)
+        while term_no < self.term_count and len(matches) <= MAX_PREFIX_TERMS:
+            term, first, count = self._term(term_no)
+            if term == key:
+                matches.append((first, count, 1.0))
+            elif len(key) >= MIN_PREFIX_LENGTH and term.startswith(key):
+                matches.append((first, count, PREFIX_WEIGHT))
+            else:
+                break
+            term_no += 1
+        return matches
+
+    def doc_name(self, doc_id: int) -> str:
+        """Doküman numarasına karşılık gelen paket adı"""
+        offset, length = _DOC.unpack_from(self._buffer, self._docs_offset + doc_id * _DOC.size)[:2]
+        return self._string(offset, length).decode('utf-8')
+
+    def _doc_lengths(self, doc_id: int) -> Tuple[int, int, int]:
+        return _DOC.unpack_from(self._buffer, self._docs_offset + doc_id * _DOC.size)[2:]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        BM25F ile sıralı arama yapar
+
+        Args:
+            query: Arama sorgusu
+            limit: En fazla sonuç sayısı (None: tümü)
+
+        Returns:
+            Skora göre azalan [(paket_adı, skor), ...]
+        """
+        if not self.doc_count:
+            return []
+
+        scores: Dict[int, float] = {}
+        for token in dict.fromkeys(tokenize(query)):
+            # Bir kelimenin bir dokümana katkısı, eşleşen terimlerin en iyisidir
+            best: Dict[int, float] = {}
+            for first, count, weight in self._matching_terms(token):
+                idf = math.log(1.0 + (self.doc_count - count + 0.5) / (count + 0.5))
+                base = self._postings_offset + first * _POSTING.size
+                for position in range(count):
+                    doc_id, *frequencies = _POSTING.unpack_from(self._buffer, base + position * _POSTING.size)
+                    lengths = self._doc_lengths(doc_id)
+                    tf = 0.0
+                    for field_no, frequency in enumerate(frequencies):
+                        if frequency:
+                            average = self.average_lengths[field_no] or 1.0
+                            norm = 1.0 - BM25_B + BM25_B * lengths[field_no] / average
+                            tf += self.field_weights[field_no] * frequency / norm
+                    score = weight * idf * tf / (BM25_K1 + tf)
+                    if score > best.get(doc_id, 0.0):
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        ranked = ((score, -doc_id) for doc_id, score in scores.items())
+        if limit is None:
+            ranked = sorted(ranked, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, ranked)
+        return [(self.doc_name(-neg_doc_id), score) for score, neg_doc_id in ranked]
+
+
+def open_search_index(path: str) -> SearchIndexReader:
+    """
+    İndeks dosyasını mmap ile açar
+
+    Raises:
+        OSError: Dosya açılamazsa
+        SearchIndexError: Biçim tanınmazsa
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise SearchIndexError("Arama indeksi boş")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return SearchIndexReader(mapped)
+    except SearchIndexError:
+        mapped.close()
+        raise
+
+
+def search_index_url(index_url: str) -> str:
+    """index.json URL'sinin yanındaki arama indeksinin URL'si"""
+    return f"{index_url.rsplit('/', 1)[0]}/{SEARCH_INDEX_FILE}"
+
+
+# Süreç boyunca (url, index sürümü) başına tek okuyucu
+_readers: Dict[Tuple[str, str], SearchIndexReader] = {}
+_readers_lock = threading.Lock()
+
+
+def _download_search_index(url: str, version: str, target: Path) -> bool:
+    """Yayınlanmış indeksi indirir; sürümü tutuyorsa hedefe yazar"""
+    try:
+        from http_client import get_http_client
+        response = get_http_client().get(url, headers={'Accept': 'application/octet-stream'})
+        if response.status_code != 200:
+            return False
+        if SearchIndexReader(response.content).version != version:
+            return False
+    except (OSError, ValueError, SearchIndexError, struct.error):
+        return False
+
+    temp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'wb') as f:
+        f.write(response.content)
+    os.replace(temp_path, target)
+    return True
+
+
+def get_search_index(session) -> SearchIndexReader:
+    """
+    Registry oturumunun index sürümüne ait arama indeksini döndürür
+
+    Sırasıyla: süreç içi okuyucu, ~/.clapp/cache/index altındaki dosya,
+    index.json'un yanında yayınlanan search_index.bin, yerel üretim.
+    Aynı index sürümü için indeks yalnızca bir kez indirilir veya üretilir.
+
+    Args:
+        session: registry_client.RegistrySession
+
+    Raises:
+        registry_client.RegistryError: Index yüklenemezse
+    """
+    packages = session.load()
+    version = session.snapshot_version()
+    if version is None:
+        # Snapshot yoksa sürüm bilinmez; indeks kalıcı hale getirilmez
+        return SearchIndexReader(build_search_index(packages))
+
+    reader_key = (session.url, version)
+    reader = _readers.get(reader_key)
+    if reader is not None:
+        return reader
+
+    with _readers_lock:
+        reader = _readers.get(reader_key)
+        if reader is not None:
+            return reader
+
+        cache_dir = session.client.cache_dir
+        target = cache_dir / f"search-{hashlib.md5(session.url.encode()).hexdigest()}.bin"
+
+        try:
+            reader = open_search_index(str(target))
+            if reader.version != version:
+                reader.close()
+                reader = None
+        except (OSError, SearchIndexError, struct.error):
+            reader = None
+
+        if reader is None:
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                if session.client.offline or not _download_search_index(search_index_url(session.url), version, target):
+                    write_search_index(packages, str(target), version)
+                reader = open_search_index(str(target))
+            except (OSError, SearchIndexError, struct.error):
+                # Cache dizini yazılamıyorsa bellekte çalış
+                reader = SearchIndexReader(build_search_index(packages, version))
+
+        # Aynı URL'nin eski sürüm okuyucularını bırak
+        for key in [key for key in _readers if key[0] == session.url]:
+            del _readers[key]
+        _readers[reader_key] = reader
+        return reader
+
+
+def search_registry(session, query: str, limit: Optional[int] = None) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Registry oturumunda BM25 sıralı arama yapar
+
+    Paket kayıtları kopyalanmaz; oturumdaki sözlükler döndürülür.
+
+    Returns:
+        Skora göre azalan [(paket, skor), ...]
+    """
+    reader = get_search_index(session)
+    results = []
+    for name, score in reader.search(query, limit):
+        package = session.get(name)
+        if package is not None:
+            results.append((package, score))
+    return results
@@ -86,6 +86,16 @@ setup(
         "new_command",
         "update_command",
         "platform_utils",
+        "registry_client",
+        "installed_index",
+        "file_lock",
+        "app_env",
+        "app_staging",
+        "http_client",
+        "file_hasher",
+        "search_index",
+        "completion",
+        "app_delta",
     ],
     
     # Paket verileri
@@ -4,22 +4,522 @@ smart_search.py - Akıllı Arama Sistemi
 
 Bu modül clapp paketlerinde gelişmiş arama özellikleri sağlar:
 - Fuzzy search (bulanık arama)
-- Arama geçmişi
+- Arama geçmişi (eklemeli JSONL günlüğü + sıkıştırılmış özet)
 - Kategori bazlı arama
 - Dil bazlı filtreleme
 - Popülerlik sıralaması
 - Otomatik tamamlama
+
+Bulanık arama paket listesi başına bir kez kurulan trigram indeksini
+kullanır: adaylar indeksten alt-doğrusal sürede üretilir, sadece en iyi
+adaylar edit distance ile puanlanır. İndeks paket listesinin içerik parmak
+iziyle ~/.clapp/cache/index altında saklanır; aynı liste sonraki
+çalıştırmalarda yeniden kurulmaz.
 """
 
 import os
 import json
 import re
-import difflib
+import time
+import heapq
+import marshal
+import hashlib
+from array import array
+from collections import OrderedDict
+from itertools import islice
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime, timedelta
 from pathlib import Path
 import pickle
 
+# Bulanık eşleşmede edit distance ile puanlanan en fazla aday sayısı
+FUZZY_CANDIDATE_LIMIT = 200
+
+# Trigram indeksi bu sayıdan büyük listeler için diske yazılır
+TRIGRAM_PERSIST_MIN_PACKAGES = 1000
+TRIGRAM_INDEX_FORMAT = 1
+
+# Kaynak belirtilmeyen paket listelerinin indeks adı
+DEFAULT_INDEX_SOURCE = "default"
+
+
+def _trigrams(text: str, pad: bool = False) -> set:
+    """Metnin 3'lü karakter gruplarını döndürür (pad: kelime sınırları için boşluk ekle)"""
+    if pad:
+        text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein uzaklığı; max_distance aşılınca erken çıkar
+    
+    Returns:
+        Uzaklık veya max_distance + 1 (sınır aşıldıysa)
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) < len(b):
+        a, b = b, a
+    
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def edit_similarity(a: str, b: str, min_similarity: float = 0.0) -> float:
+    """1 - levenshtein / max(uzunluk); min_similarity altı için 0.0 döner"""
+    longest = max(len(a), len(b))
+    if longest == 0:
+        return 1.0
+    max_distance = int(longest * (1.0 - min_similarity))
+    distance = _edit_distance(a, b, max_distance)
+    if distance > max_distance:
+        return 0.0
+    return 1.0 - distance / longest
+
+
+class TrigramIndex:
+    """
+    Paket adları ve açıklamaları için trigram indeksi
+    
+    Tam/alt dizi eşleşmeleri indeksten gelen adaylar üzerinde 'in' ile
+    doğrulanır; bu yüzden sonuçları tam taramayla aynıdır.
+    """
+    
+    def __init__(self, packages: List[Dict[str, Any]], postings: Optional[Tuple[Dict[str, Any], ...]] = None):
+        """
+        Args:
+            packages: Paket listesi
+            postings: Diskten okunan (name_grams, padded_name_grams, description_grams);
+                verilirse trigram listeleri yeniden kurulmaz
+        """
+        self.packages = packages
+        self.names: List[str] = []
+        self.descriptions: List[str] = []
+        self.by_name: Dict[str, List[int]] = {}
+        self.by_language: Dict[str, List[int]] = {}
+        self.name_grams: Dict[str, List[int]] = {}
+        self.padded_name_grams: Dict[str, List[int]] = {}
+        self.description_grams: Dict[str, List[int]] = {}
+        
+        for position, package in enumerate(packages):
+            name = package.get("name", "").lower()
+            description = package.get("description", "").lower()
+            language = package.get("language", "").lower()
+            self.names.append(name)
+            self.descriptions.append(description)
+            self.by_name.setdefault(name, []).append(position)
+            self.by_language.setdefault(language, []).append(position)
+            if postings is not None:
+                continue
+            
+            for gram in _trigrams(name):
+                self.name_grams.setdefault(gram, []).append(position)
+            for gram in _trigrams(name, pad=True):
+                self.padded_name_grams.setdefault(gram, []).append(position)
+            for gram in _trigrams(description):
+                self.description_grams.setdefault(gram, []).append(position)
+        
+        if postings is not None:
+            self.name_grams, self.padded_name_grams, self.description_grams = postings
+    
+    def dump_postings(self) -> bytes:
+        """Trigram listelerini diske yazılacak biçimde döndürür (konum listeleri uint32 dizisi)"""
+        return marshal.dumps({
+            "format": TRIGRAM_INDEX_FORMAT,
+            "count": len(self.names),
+            "itemsize": array('I').itemsize,
+            "postings": [
+                {gram: array('I', positions).tobytes() for gram, positions in postings.items()}
+                for postings in (self.name_grams, self.padded_name_grams, self.description_grams)
+            ],
+        })
+    
+    @classmethod
+    def load(cls, packages: List[Dict[str, Any]], data: bytes) -> Optional["TrigramIndex"]:
+        """dump_postings() çıktısından indeksi kurar; biçim uymuyorsa None"""
+        try:
+            state = marshal.loads(data)
+            if (state.get("format") != TRIGRAM_INDEX_FORMAT or state.get("count") != len(packages)
+                    or state.get("itemsize") != array('I').itemsize):
+                return None
+            # Konum listeleri kopyalanmadan okunur
+            postings = tuple(
+                {gram: memoryview(raw).cast('I') for gram, raw in field.items()}
+                for field in state["postings"]
+            )
+        except (EOFError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+        return cls(packages, postings)
+    
+    @staticmethod
+    def _intersect(postings: Dict[str, List[int]], grams: set) -> set:
+        """Tüm trigramları içeren kayıtlar (en kısa listeden başlanır)"""
+        lists = sorted((postings.get(gram, []) for gram in grams), key=len)
+        if not lists or not lists[0]:
+            return set()
+        result = set(lists[0])
+        for positions in lists[1:]:
+            result.intersection_update(positions)
+            if not result:
+                break
+        return result
+    
+    def substring_candidates(self, query: str, field: str) -> List[int]:
+        """Sorguyu alt dizi olarak içeren kayıtlar ('name' veya 'description')"""
+        texts = self.names if field == "name" else self.descriptions
+        if len(query) < 3:
+            return [position for position, text in enumerate(texts) if query in text]
+        
+        postings = self.name_grams if field == "name" else self.description_grams
+        return [position for position in self._intersect(postings, _trigrams(query))
+                if query in texts[position]]
+    
+    def fuzzy_candidates(self, query: str, limit: int = FUZZY_CANDIDATE_LIMIT) -> List[int]:
+        """Adıyla en çok trigram paylaşan kayıtlar"""
+        counts: Dict[int, int] = {}
+        for gram in _trigrams(query, pad=True):
+            for position in self.padded_name_grams.get(gram, ()):
+                counts[position] = counts.get(position, 0) + 1
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return [position for position, _ in ranked[:limit]]
+    
+    def description_overlap(self, query: str, exclude: set) -> Dict[int, float]:
+        """Açıklamalarla trigram örtüşme oranı (sorgunun trigramlarına göre)"""
+        grams = _trigrams(query)
+        if not grams:
+            return {}
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            for position in self.description_grams.get(gram, ()):
+                if position not in exclude:
+                    counts[position] = counts.get(position, 0) + 1
+        return {position: count / len(grams) for position, count in counts.items()}
+
+
+def packages_fingerprint(packages: List[Dict[str, Any]]) -> str:
+    """Paket listesinin aranan alanlarından (ad, açıklama, dil) içerik özeti üretir"""
+    digest = hashlib.blake2b(digest_size=16)
+    for package in packages:
+        digest.update(f"{package.get('name', '')}\0{package.get('description', '')}\0"
+                      f"{package.get('language', '')}\n".encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def _source_key(source: str) -> str:
+    return hashlib.blake2b(source.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def get_trigram_index_path(fingerprint: str, source: str = DEFAULT_INDEX_SOURCE) -> Path:
+    """Kaynağın (ör. kurulu paketler) parmak izine ait kalıcı trigram indeksi dosyasının yolu"""
+    return Path.home() / ".clapp" / "cache" / "index" / f"trigram-{_source_key(source)}-{fingerprint}.idx"
+
+
+def _save_trigram_index(path: Path, index: TrigramIndex, source: str = DEFAULT_INDEX_SOURCE):
+    """İndeksi atomik olarak yazar; aynı kaynağın eski parmak izlerine ait dosyaları siler"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(index.dump_postings())
+        os.replace(temp_path, path)
+        # Farklı kaynakların (ör. kurulu ve uzak liste) indeksleri birbirini silmez
+        for old_path in path.parent.glob(f"trigram-{_source_key(source)}-*.idx"):
+            if old_path != path:
+                old_path.unlink()
+    except OSError:
+        # İndeks sadece hızlandırma amaçlı; yazılamazsa her seferinde kurulur
+        pass
+
+
+# Son kullanılan indeks ve parmak izi; aynı içerikli listeyle yapılan aramalar yeniden kurmaz
+_index_cache: Optional[Tuple[str, TrigramIndex]] = None
+
+
+def get_trigram_index(packages: List[Dict[str, Any]], source: str = DEFAULT_INDEX_SOURCE) -> TrigramIndex:
+    """
+    Paket listesi için trigram indeksini döndürür
+
+    İndeks listenin içerik parmak iziyle eşlenir: liste yerinde değişirse
+    yeniden kurulur. Büyük listelerin indeksi diske yazılır ve sonraki
+    süreçlerde oradan okunur; diskte kaynak başına son indeks tutulur.
+
+    Args:
+        packages: Paket listesi
+        source: Listenin kaynağı (ör. "installed" veya registry URL'si)
+    """
+    global _index_cache
+    fingerprint = packages_fingerprint(packages)
+    if _index_cache is not None and _index_cache[0] == fingerprint:
+        index = _index_cache[1]
+        index.packages = packages
+        return index
+
+    index = None
+    persist = len(packages) >= TRIGRAM_PERSIST_MIN_PACKAGES
+    path = get_trigram_index_path(fingerprint, source)
+    if persist:
+        try:
+            with open(path, 'rb') as f:
+                index = TrigramIndex.load(packages, f.read())
+        except OSError:
+            index = None
+
+    if index is None:
+        index = TrigramIndex(packages)
+        if persist:
+            _save_trigram_index(path, index, source)
+
+    _index_cache = (fingerprint, index)
+    return index
+
+
+# Arama kategorileri ve anahtar kelimeleri
+SEARCH_CATEGORIES = {
+    "cli": ["command", "terminal", "console", "cli", "command-line"],
+    "gui": ["gui", "interface", "window", "desktop", "graphical"],
+    "utility": ["utility", "tool", "helper", "assistant"],
+    "development": ["dev", "development", "programming", "code", "script"],
+    "game": ["game", "play", "entertainment", "fun"],
+    "productivity": ["productivity", "work", "office", "business"],
+    "education": ["education", "learn", "study", "tutorial"],
+    "multimedia": ["media", "video", "audio", "image", "photo"]
+}
+
+# Arama geçmişi ayarları
+DEFAULT_HISTORY_MAX_ENTRIES = 1000
+HISTORY_RETENTION_DAYS = 30
+HISTORY_COMPACT_LINES = 256
+
+
+def get_history_file() -> str:
+    """Varsayılan arama geçmişi özet dosyasının yolunu döndürür"""
+    return os.path.join(os.path.expanduser("~"), ".clapp", "search_history.json")
+
+
+def get_history_max_entries() -> int:
+    """CLAPP_SEARCH_HISTORY_MAX ortam değişkeninden saklanacak en fazla sorgu sayısını okur"""
+    try:
+        return max(1, int(os.environ.get("CLAPP_SEARCH_HISTORY_MAX", DEFAULT_HISTORY_MAX_ENTRIES)))
+    except ValueError:
+        return DEFAULT_HISTORY_MAX_ENTRIES
+
+
+class SearchHistory:
+    """
+    Eklemeli (append-only) JSONL günlüğü ve sıkıştırılmış özetten oluşan arama geçmişi
+
+    - Her arama günlüğe tek satır olarak eklenir; dosya yeniden yazılmaz
+    - Sorgu başına sayaç, son görülme ve sonuç sayısı bellekte artımlı
+      tutulur; en fazla max_entries sorgu saklanır (en eski görülen düşer)
+    - Günlük HISTORY_COMPACT_LINES satırı geçince özet dosyasına
+      sıkıştırılır ve günlük sıfırlanır; yükleme maliyeti sınırlı kalır
+    """
+
+    def __init__(self, summary_file: Path, max_entries: Optional[int] = None):
+        """
+        Args:
+            summary_file: Sıkıştırılmış özet dosyası (günlük aynı adla .jsonl uzantısında tutulur)
+            max_entries: Saklanacak en fazla farklı sorgu sayısı
+        """
+        self.summary_file = Path(summary_file)
+        self.log_file = self.summary_file.with_suffix(".jsonl")
+        self.max_entries = get_history_max_entries() if max_entries is None else max_entries
+
+        self._reset()
+        self._load_summary()
+        self._replay(self.log_file)
+
+    def _reset(self):
+        # sorgu -> {"count", "last_seen", "results_count"}; son görülme sırasına göre
+        self.queries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.days: Dict[str, int] = {}
+        self.total = 0
+        self._log_lines = 0
+
+    def _load_summary(self):
+        """Sıkıştırılmış özeti (veya eski biçimdeki geçmiş listesini) okur"""
+        try:
+            with open(self.summary_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(data, dict):
+            entries = sorted(data.get("queries", {}).items(), key=lambda item: item[1].get("last_seen", 0))
+            for query, entry in entries:
+                self.queries[query] = entry
+            self.days = dict(data.get("days", {}))
+            self.total = int(data.get("total", 0))
+        elif isinstance(data, list):
+            # Eski biçim: [{"query", "timestamp", "results_count"}, ...]
+            records = []
+            for record in data:
+                try:
+                    timestamp = datetime.fromisoformat(record["timestamp"]).timestamp()
+                    records.append((timestamp, record["query"], record.get("results_count", 0)))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            for timestamp, query, results_count in sorted(records):
+                self._apply(query, timestamp, results_count)
+
+    def _replay(self, log_file: Path) -> int:
+        """
+        Günlük satırlarını özete uygular
+
+        Returns:
+            Okunan bayt sayısı
+        """
+        consumed = 0
+        try:
+            with open(log_file, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Henüz yazılmakta olan son satır
+                        break
+                    consumed += len(line)
+                    try:
+                        record = json.loads(line)
+                        self._apply(record["query"], record["ts"], record.get("results", 0))
+                    except (KeyError, TypeError, ValueError):
+                        # Bozuk satırlar atlanır
+                        continue
+                    self._log_lines += 1
+        except OSError:
+            pass
+        return consumed
+
+    def _apply(self, query: str, timestamp: float, results_count: int):
+        """Tek bir aramayı özet verilere işler"""
+        entry = self.queries.pop(query, None)
+        if entry is None:
+            entry = {"count": 0, "last_seen": 0, "results_count": 0}
+        entry["count"] += 1
+        entry["last_seen"] = max(entry["last_seen"], timestamp)
+        entry["results_count"] = results_count
+        self.queries[query] = entry
+
+        while len(self.queries) > self.max_entries:
+            self.total -= self.queries.popitem(last=False)[1]["count"]
+
+        day = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+        self.days[day] = self.days.get(day, 0) + 1
+        self.total += 1
+
+    def _lock(self):
+        """Günlüğe ekleme ve sıkıştırma için süreçler arası kilit"""
+        from cache_manager import _KeyLock
+        return _KeyLock(self.summary_file.parent / "locks", str(self.summary_file))
+
+    def add(self, query: str, results_count: int = 0):
+        """Aramayı günlüğe ekler ve özetleri günceller"""
+        timestamp = time.time()
+        self._apply(query, timestamp, results_count)
+
+        line = json.dumps({"query": query, "ts": timestamp, "results": results_count}, ensure_ascii=False)
+        try:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            # Ekleme kısa süreli kilit altında yapılır; sıkıştırma sırasında
+            # yazılan satır kaybolmaz
+            with self._lock():
+                with open(self.log_file, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+            self._log_lines += 1
+        except OSError as e:
+            print(f"Arama geçmişi kaydetme hatası: {e}")
+            return
+
+        if self._log_lines >= HISTORY_COMPACT_LINES:
+            self.compact()
+
+    def _prune(self):
+        """Saklama süresini aşan sorguları ve günleri atar"""
+        cutoff = time.time() - HISTORY_RETENTION_DAYS * 24 * 60 * 60
+        while self.queries:
+            query, entry = next(iter(self.queries.items()))
+            if entry["last_seen"] > cutoff:
+                break
+            del self.queries[query]
+            self.total -= entry["count"]
+
+        cutoff_day = datetime.fromtimestamp(cutoff).strftime("%Y-%m-%d")
+        self.days = {day: count for day, count in self.days.items() if day >= cutoff_day}
+
+    def compact(self):
+        """
+        Günlüğü özet dosyasına sıkıştırır
+
+        Sıkıştırma, add() ile aynı süreçler arası kilit altında yapılır:
+        özet ve günlük diskten yeniden okunur (diğer süreçlerin satırları
+        da özete girer), özet yazılır ve günlüğün okunan kısmı kesilir.
+        Kilit tutulduğu sürece günlüğe yeni satır eklenemez.
+        """
+        with self._lock():
+            self._reset()
+            self._load_summary()
+            self._replay(self.log_file)
+            self._log_lines = 0
+            self._prune()
+
+            data = {
+                "version": 2,
+                "compacted_at": time.time(),
+                "total": self.total,
+                "days": self.days,
+                "queries": dict(self.queries),
+            }
+            try:
+                temp_file = self.summary_file.with_name(f"{self.summary_file.name}.{os.getpid()}.tmp")
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_file, self.summary_file)
+
+                # Okunan satırlar özete girdi. Kilit altında yazılmakta olan
+                # satır olamaz; sonda kalan yarım satır çökmüş bir yazıcıdandır
+                os.truncate(self.log_file, 0)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Arama geçmişi kaydetme hatası: {e}")
+
+    def clear(self):
+        """Tüm geçmişi siler"""
+        self._reset()
+        with self._lock():
+            for path in (self.log_file, self.summary_file):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def recent(self, limit: int = 10) -> List[str]:
+        """En son aranan sorgular (yeniden eskiye)"""
+        return list(islice(reversed(self.queries), limit))
+
+    def popular(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """En çok aranan sorgular ve arama sayıları"""
+        ranked = heapq.nlargest(limit, self.queries.items(),
+                                key=lambda item: (item[1]["count"], item[1]["last_seen"]))
+        return [(query, entry["count"]) for query, entry in ranked]
+
+    def trends(self, days: int = 7) -> Dict[str, int]:
+        """Son günlerin gün başına arama sayıları"""
+        cutoff_day = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        return {day: count for day, count in sorted(self.days.items()) if day > cutoff_day}
+
+
 class SmartSearch:
     """Akıllı arama motoru"""
     
@@ -31,95 +531,49 @@ class SmartSearch:
             history_file: Arama geçmişi dosyası
         """
         if history_file is None:
-            history_file = os.path.join(os.path.expanduser("~"), ".clapp", "search_history.json")
+            history_file = get_history_file()
         
         self.history_file = Path(history_file)
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
         
         # Arama geçmişi
-        self.search_history = self._load_history()
+        self.history = SearchHistory(self.history_file)
         
         # Kategori tanımları
-        self.categories = {
-            "cli": ["command", "terminal", "console", "cli", "command-line"],
-            "gui": ["gui", "interface", "window", "desktop", "graphical"],
-            "utility": ["utility", "tool", "helper", "assistant"],
-            "development": ["dev", "development", "programming", "code", "script"],
-            "game": ["game", "play", "entertainment", "fun"],
-            "productivity": ["productivity", "work", "office", "business"],
-            "education": ["education", "learn", "study", "tutorial"],
-            "multimedia": ["media", "video", "audio", "image", "photo"]
-        }
-    
-    def _load_history(self) -> List[Dict[str, Any]]:
-        """Arama geçmişini yükler"""
-        try:
-            if self.history_file.exists():
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception:
-            pass
-        return []
+        self.categories = dict(SEARCH_CATEGORIES)
+        
+        # Öneri indeksi ve kurulduğu (paket listesi, geçmiş) durumu
+        self._suggestion_index = None
+        self._suggestion_state = None
     
-    def _save_history(self):
-        """Arama geçmişini kaydeder"""
-        try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.search_history, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Arama geçmişi kaydetme hatası: {e}")
+    @property
+    def search_history(self) -> List[Dict[str, Any]]:
+        """Sorgu başına özet kayıtlar (eskiden yeniye)"""
+        return [
+            {
+                "query": query,
+                "timestamp": datetime.fromtimestamp(entry["last_seen"]).isoformat(),
+                "results_count": entry["results_count"],
+                "count": entry["count"],
+            }
+            for query, entry in self.history.queries.items()
+        ]
     
     def add_to_history(self, query: str, results_count: int = 0):
         """Arama geçmişine ekler"""
-        # Eski kayıtları temizle (30 günden eski)
-        cutoff_date = datetime.now() - timedelta(days=30)
-        self.search_history = [
-            record for record in self.search_history
-            if datetime.fromisoformat(record["timestamp"]) > cutoff_date
-        ]
-        
-        # Yeni kayıt ekle
-        record = {
-            "query": query,
-            "timestamp": datetime.now().isoformat(),
-            "results_count": results_count
-        }
-        
-        # Aynı sorgu varsa güncelle
-        for existing in self.search_history:
-            if existing["query"] == query:
-                existing["timestamp"] = record["timestamp"]
-                existing["results_count"] = results_count
-                self._save_history()
-                return
-        
-        self.search_history.append(record)
-        self._save_history()
+        self.history.add(query, results_count)
     
     def get_search_history(self, limit: int = 10) -> List[str]:
         """Arama geçmişini döndürür"""
         # En son kullanılan sorguları döndür
-        sorted_history = sorted(
-            self.search_history,
-            key=lambda x: datetime.fromisoformat(x["timestamp"]),
-            reverse=True
-        )
-        
-        return [record["query"] for record in sorted_history[:limit]]
+        return self.history.recent(limit)
     
     def get_popular_searches(self, limit: int = 5) -> List[Tuple[str, int]]:
         """Popüler aramaları döndürür"""
-        # Sorgu frekansını hesapla
-        query_counts = {}
-        for record in self.search_history:
-            query = record["query"]
-            query_counts[query] = query_counts.get(query, 0) + 1
-        
-        # En popüler olanları döndür
-        sorted_queries = sorted(query_counts.items(), key=lambda x: x[1], reverse=True)
-        return sorted_queries[:limit]
+        return self.history.popular(limit)
     
-    def fuzzy_search(self, query: str, packages: List[Dict[str, Any]], threshold: float = 0.6) -> List[Dict[str, Any]]:
+    def fuzzy_search(self, query: str, packages: List[Dict[str, Any]], threshold: float = 0.6,
+                     source: str = DEFAULT_INDEX_SOURCE) -> List[Dict[str, Any]]:
         """
         Bulanık arama yapar
         
@@ -127,43 +581,43 @@ class SmartSearch:
             query: Arama sorgusu
             packages: Paket listesi
             threshold: Eşleşme eşiği (0.0 - 1.0)
+            source: Paket listesinin kaynağı (kalıcı indeks adı)
             
         Returns:
             Eşleşen paketler (skor ile)
         """
-        results = []
         query_lower = query.lower()
-        
-        for package in packages:
-            score = 0.0
-            name = package.get("name", "").lower()
-            description = package.get("description", "").lower()
-            language = package.get("language", "").lower()
-            
-            # Tam eşleşme kontrolü
-            if query_lower == name:
-                score = 1.0
-            elif query_lower in name:
-                score = 0.9
-            elif query_lower in description:
-                score = 0.7
-            elif query_lower == language:
-                score = 0.6
-            else:
-                # Fuzzy matching
-                name_ratio = difflib.SequenceMatcher(None, query_lower, name).ratio()
-                desc_ratio = difflib.SequenceMatcher(None, query_lower, description).ratio()
-                
-                score = max(name_ratio, desc_ratio * 0.5)
-            
-            if score >= threshold:
-                results.append({
-                    **package,
-                    "search_score": score
-                })
-        
-        # Skora göre sırala
-        results.sort(key=lambda x: x["search_score"], reverse=True)
+        index = get_trigram_index(packages, source)
+        scores: Dict[int, float] = {}
+        
+        # Tam ve alt dizi eşleşmeleri (öncelik sırasıyla; ilk eşleşen skor geçerli)
+        for position in index.by_name.get(query_lower, ()):
+            scores[position] = 1.0
+        for position in index.substring_candidates(query_lower, "name"):
+            scores.setdefault(position, 0.9)
+        for position in index.substring_candidates(query_lower, "description"):
+            scores.setdefault(position, 0.7)
+        for position in index.by_language.get(query_lower, ()):
+            scores.setdefault(position, 0.6)
+        
+        # Bulanık eşleşme: sadece en çok trigram paylaşan adaylar puanlanır
+        for position in index.fuzzy_candidates(query_lower):
+            if position not in scores:
+                score = edit_similarity(query_lower, index.names[position], threshold)
+                if score >= threshold:
+                    scores[position] = score
+        
+        # Açıklama benzerliği yarım ağırlıklıdır; sadece düşük eşiklerde etkilidir
+        if threshold <= 0.5:
+            for position, overlap in index.description_overlap(query_lower, set(scores)).items():
+                if overlap * 0.5 >= threshold:
+                    scores[position] = overlap * 0.5
+        
+        results = [
+            {**packages[position], "search_score": score}
+            for position, score in sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            if score >= threshold
+        ]
         return results
     
     def search_by_category(self, category: str, packages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -213,7 +667,8 @@ class SmartSearch:
         ]
     
     def advanced_search(self, query: str, packages: List[Dict[str, Any]], 
-                       filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+                       filters: Optional[Dict[str, Any]] = None,
+                       source: str = DEFAULT_INDEX_SOURCE) -> List[Dict[str, Any]]:
         """
         Gelişmiş arama yapar
         
@@ -221,6 +676,7 @@ class SmartSearch:
             query: Arama sorgusu
             packages: Paket listesi
             filters: Filtreler (language, category, min_version, vb.)
+            source: Paket listesinin kaynağı (kalıcı indeks adı)
             
         Returns:
             Filtrelenmiş ve sıralanmış paketler
@@ -228,8 +684,11 @@ class SmartSearch:
         if filters is None:
             filters = {}
         
-        # Başlangıçta tüm paketler
+        # Sorgu varsa önce tüm listede indeksli arama yapılır (indeks liste başına
+        # bir kez kurulur); filtreler sıralamayı bozmadan sonuca uygulanır
         results = packages
+        if query:
+            results = self.fuzzy_search(query, packages, source=source)
         
         # Dil filtresi
         if "language" in filters:
@@ -246,10 +705,6 @@ class SmartSearch:
         if "max_version" in filters:
             results = self._filter_by_version(results, filters["max_version"], "max")
         
-        # Fuzzy search
-        if query:
-            results = self.fuzzy_search(query, results)
-        
         # Sıralama
         sort_by = filters.get("sort_by", "relevance")
         if sort_by == "name":
@@ -292,37 +747,24 @@ class SmartSearch:
         Returns:
             Öneri listesi
         """
-        suggestions = set()
-        partial_lower = partial_query.lower()
-        
-        # Paket isimlerinden öneriler
-        for package in packages:
-            name = package.get("name", "")
-            if partial_lower in name.lower():
-                suggestions.add(name)
-        
-        # Arama geçmişinden öneriler
-        for record in self.search_history:
-            query = record["query"]
-            if partial_lower in query.lower():
-                suggestions.add(query)
-        
-        # Kategori önerileri
-        for category in self.categories.keys():
-            if partial_lower in category.lower():
-                suggestions.add(f"category:{category}")
-        
-        # Dil önerileri
-        languages = set(package.get("language", "") for package in packages)
-        for language in languages:
-            if partial_lower in language.lower():
-                suggestions.add(f"language:{language}")
-        
-        return list(suggestions)[:limit]
+        from completion import CompletionIndex, KIND_PACKAGE, suggestion_entries
+        
+        # İndeks paket listesi veya geçmiş değişmedikçe yeniden kurulmaz
+        state = (id(packages), len(packages), self.history.total, len(self.history.queries))
+        if self._suggestion_index is None or self._suggestion_state != state:
+            counts = {query: record["count"] for query, record in self.history.queries.items()}
+            entries = suggestion_entries(((KIND_PACKAGE, package) for package in packages),
+                                         counts, self.categories)
+            self._suggestion_index = CompletionIndex.from_entries(entries)
+            self._suggestion_state = state
+        
+        # Önekle başlayanlar; ağırlığa (arama sayısı, dil yaygınlığı) göre sıralı
+        return self._suggestion_index.complete(partial_query, limit)
     
     def get_search_analytics(self) -> Dict[str, Any]:
         """Arama analitiklerini döndürür"""
-        if not self.search_history:
+        history = self.history
+        if not history.queries:
             return {
                 "total_searches": 0,
                 "unique_queries": 0,
@@ -331,27 +773,13 @@ class SmartSearch:
                 "search_trends": {}
             }
         
-        # Toplam arama sayısı
-        total_searches = len(self.search_history)
-        
-        # Benzersiz sorgu sayısı
-        unique_queries = len(set(record["query"] for record in self.search_history))
-        
-        # En popüler aramalar
+        total_searches = history.total
+        unique_queries = len(history.queries)
         popular_searches = self.get_popular_searches(5)
-        
-        # Son aramalar
         recent_searches = self.get_search_history(5)
         
         # Arama trendleri (son 7 gün)
-        trends = {}
-        cutoff_date = datetime.now() - timedelta(days=7)
-        
-        for record in self.search_history:
-            record_date = datetime.fromisoformat(record["timestamp"])
-            if record_date > cutoff_date:
-                date_str = record_date.strftime("%Y-%m-%d")
-                trends[date_str] = trends.get(date_str, 0) + 1
+        trends = history.trends(7)
         
         return {
             "total_searches": total_searches,
@@ -362,56 +790,42 @@ class SmartSearch:
         }
 
 class SearchIndex:
-    """Arama indeksi oluşturucu"""
+    """
+    BM25 arama indeksi (bkz. search_index)
+
+    Paket sözlükleri değiştirilmez ve kopyalanmaz; sonuçlar aynı
+    nesnelerdir.
+    """
     
     def __init__(self):
         """SearchIndex başlatıcısı"""
-        self.index = {}
+        self.reader = None
+        self._by_name: Dict[str, Dict[str, Any]] = {}
     
     def build_index(self, packages: List[Dict[str, Any]]):
         """Paketlerden arama indeksi oluşturur"""
-        self.index = {}
+        from search_index import SearchIndexReader, build_search_index
         
-        for package in packages:
-            name = package.get("name", "").lower()
-            description = package.get("description", "").lower()
-            language = package.get("language", "").lower()
-            
-            # Kelimeleri ayır
-            words = set()
-            words.update(name.split())
-            words.update(description.split())
-            words.add(language)
-            
-            # İndekse ekle
-            for word in words:
-                if len(word) >= 2:  # En az 2 karakter
-                    if word not in self.index:
-                        self.index[word] = []
-                    self.index[word].append(package)
+        self.reader = SearchIndexReader(build_search_index(packages))
+        self._by_name = {
+            package.get("name"): package
+            for package in packages
+            if isinstance(package, dict)
+        }
+    
+    def search_ranked(self, query: str, limit: Optional[int] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """İndeksten BM25 skoruyla sıralı [(paket, skor), ...] döndürür"""
+        if self.reader is None:
+            return []
+        return [
+            (self._by_name[name], score)
+            for name, score in self.reader.search(query, limit)
+            if name in self._by_name
+        ]
     
     def search_index(self, query: str) -> List[Dict[str, Any]]:
-        """İndeksten arama yapar"""
-        query_words = query.lower().split()
-        results = {}
-        
-        for word in query_words:
-            if word in self.index:
-                for package in self.index[word]:
-                    package_id = package.get("name", "")
-                    if package_id not in results:
-                        results[package_id] = package
-                        results[package_id]["match_count"] = 0
-                    results[package_id]["match_count"] += 1
-        
-        # Eşleşme sayısına göre sırala
-        sorted_results = sorted(
-            results.values(),
-            key=lambda x: x["match_count"],
-            reverse=True
-        )
-        
-        return sorted_results
+        """İndeksten arama yapar (skora göre sıralı)"""
+        return [package for package, _ in self.search_ranked(query)]
 
 # Yardımcı fonksiyonlar
 def create_smart_search() -> SmartSearch:
@@ -423,10 +837,11 @@ def create_search_index() -> SearchIndex:
     return SearchIndex()
 
 def search_packages(query: str, packages: List[Dict[str, Any]], 
-                   filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-    """Paketlerde arama yapar"""
+                   filters: Optional[Dict[str, Any]] = None,
+                   source: str = DEFAULT_INDEX_SOURCE) -> List[Dict[str, Any]]:
+    """Paketlerde arama yapar (source: listenin kaynağı, bkz. get_trigram_index)"""
     searcher = create_smart_search()
-    results = searcher.advanced_search(query, packages, filters)
+    results = searcher.advanced_search(query, packages, filters, source)
     
     # Arama geçmişine ekle
     searcher.add_to_history(query, len(results))
@@ -446,6 +861,5 @@ def get_search_analytics() -> Dict[str, Any]:
 def clear_search_history():
     """Arama geçmişini temizler"""
     searcher = create_smart_search()
-    searcher.search_history = []
-    searcher._save_history()
+    searcher.history.clear()
     print("✅ Arama geçmişi temizlendi") 
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+clapp test yapılandırması
+
+Modüller depo kökünde düz olarak durduğu için kök dizin sys.path'e eklenir.
+Her test ~/.clapp yerine geçici bir ev dizini kullanır.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def clapp_home(tmp_path, monkeypatch):
+    """
+    HOME'u geçici dizine yönlendirir ve ~/.clapp yolunu döndürür
+
+    Eski ev dizinine bağlı süreç kapsamlı örnekler (cache, hash servisi,
+    registry oturumları) test süresince boşaltılır.
+    """
+    import cache_manager
+    import file_hasher
+    import registry_client
+
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("USERPROFILE", str(home))
+    monkeypatch.setattr(cache_manager, "_default_manager", None)
+    monkeypatch.setattr(cache_manager, "_memory_tier", type(cache_manager._memory_tier)())
+    monkeypatch.setattr(file_hasher, "_hashers", {})
+    monkeypatch.setattr(registry_client, "_sessions", {})
+    return home / ".clapp"
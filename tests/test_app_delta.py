@@ -0,0 +1,135 @@
+"""Yayınlanan dosya listesi ile delta güncelleme testleri"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import pytest
+
+import app_delta
+from app_delta import FILE_MANIFEST_NAME, stage_delta_update
+from build_index import generate_index
+from install_command import download_app_from_github
+
+
+def _write_app(packages_dir, version, files):
+    app_dir = packages_dir / "demo"
+    if app_dir.exists():
+        shutil.rmtree(app_dir)
+    app_dir.mkdir(parents=True)
+    manifest = {"name": "demo", "version": version, "language": "python",
+                "description": "delta testi", "entry": "main.py"}
+    (app_dir / "manifest.json").write_text(json.dumps(manifest))
+    for rel_path, data in files.items():
+        path = app_dir / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def _publish(tmp_path):
+    """packages/ klasöründen index üretir, girdiyi döndürür"""
+    out = tmp_path / "out"
+    out.mkdir(exist_ok=True)
+    artifacts = out / "artifacts"
+    assert generate_index(str(out / "index.json"), str(tmp_path / "packages"), str(artifacts),
+                          artifacts.as_uri(), files_base_url=(tmp_path / "packages").as_uri())
+    with open(out / "index.json", encoding="utf-8") as f:
+        apps = json.load(f)
+    return apps[0]
+
+
+@pytest.fixture
+def installed_v1(clapp_home, tmp_path, monkeypatch):
+    payload = os.urandom(256 * 1024)
+    _write_app(tmp_path / "packages", "1.0.0", {
+        "main.py": b"print('v1')\n",
+        "data/big.bin": payload,
+        "sub/b.txt": b"tasinacak dosya\n",
+    })
+    app_info = _publish(tmp_path)
+
+    work = tmp_path / "work-install"
+    work.mkdir()
+    success, path = download_app_from_github(app_info, str(work))
+    assert success, path
+    apps_dir = clapp_home / "apps"
+    apps_dir.mkdir(parents=True)
+    os.rename(path, apps_dir / "demo")
+
+    fetched = []
+    download = app_delta._download_file
+
+    def recording_download(url, target, entry, progress=None):
+        fetched.append(entry["path"])
+        return download(url, target, entry, progress)
+
+    monkeypatch.setattr(app_delta, "_download_file", recording_download)
+    return payload, fetched
+
+
+def test_index_references_published_file_list(installed_v1, tmp_path, clapp_home):
+    app_info = _publish(tmp_path)
+
+    assert "files" not in app_info
+    manifest_path = tmp_path / "out" / "artifacts" / "demo-1.0.0.files.json"
+    assert app_info["files_manifest_url"] == manifest_path.as_uri()
+    assert app_info["files_manifest_sha256"] == hashlib.sha256(manifest_path.read_bytes()).hexdigest()
+
+    # Kurulumda liste indirilmeden çıkarılan dosyalardan hesaplanır
+    installed = app_delta.load_file_manifest(str(clapp_home / "apps" / "demo"))
+    published = json.loads(manifest_path.read_bytes())
+    assert installed["files"] == published["files"]
+
+
+def test_delta_update_fetches_only_changed_files(installed_v1, tmp_path, clapp_home):
+    payload, fetched = installed_v1
+    _write_app(tmp_path / "packages", "2.0.0", {
+        "main.py": b"print('v2')\n",
+        "data/big.bin": payload,
+        "moved/b.txt": b"tasinacak dosya\n",
+    })
+    app_info = _publish(tmp_path)
+
+    work = tmp_path / "work-update"
+    work.mkdir()
+    success, staged = stage_delta_update("demo", app_info, str(work))
+
+    assert success, staged
+    # Yeri değişen dosya kurulu listedeki sha256 ile bulunur
+    assert sorted(fetched) == ["main.py", "manifest.json"]
+    assert (work / "delta-demo" / "main.py").read_bytes() == b"print('v2')\n"
+    assert (work / "delta-demo" / "moved" / "b.txt").read_bytes() == b"tasinacak dosya\n"
+    assert (work / "delta-demo" / "data" / "big.bin").read_bytes() == payload
+    assert app_delta.load_file_manifest(staged)["version"] == "2.0.0"
+
+
+def test_missing_installed_list_falls_back_to_same_path_reuse(installed_v1, tmp_path, clapp_home):
+    payload, fetched = installed_v1
+    os.remove(clapp_home / "apps" / "demo" / FILE_MANIFEST_NAME)
+    _write_app(tmp_path / "packages", "2.0.0", {
+        "main.py": b"print('v2')\n",
+        "data/big.bin": payload,
+        "moved/b.txt": b"tasinacak dosya\n",
+    })
+    app_info = _publish(tmp_path)
+
+    work = tmp_path / "work-update"
+    work.mkdir()
+    success, staged = stage_delta_update("demo", app_info, str(work))
+
+    assert success, staged
+    assert sorted(fetched) == ["main.py", "manifest.json", "moved/b.txt"]
+
+
+def test_tampered_published_list_is_rejected(installed_v1, tmp_path):
+    app_info = _publish(tmp_path)
+    manifest_path = tmp_path / "out" / "artifacts" / "demo-1.0.0.files.json"
+    manifest_path.write_bytes(manifest_path.read_bytes().replace(b"1.0.0", b"9.9.9"))
+
+    work = tmp_path / "work-update"
+    work.mkdir()
+    success, message = stage_delta_update("demo", app_info, str(work))
+
+    assert not success
+    assert "sha256" in message
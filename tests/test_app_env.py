@@ -0,0 +1,62 @@
+"""app_env wheel deposu ve izole ortam testleri"""
+
+import json
+import os
+import zipfile
+
+import app_env
+from app_env import create_app_env, get_env_site_packages, get_env_path
+
+
+def _write_wheel(wheel_dir, name="clappdemo", version="1.0"):
+    """Ağ gerektirmeyen en küçük saf Python wheel'i"""
+    dist_info = f"{name}-{version}.dist-info"
+    wheel_path = wheel_dir / f"{name}-{version}-py3-none-any.whl"
+    with zipfile.ZipFile(wheel_path, "w") as wheel:
+        wheel.writestr(f"{name}/__init__.py", "VALUE = 42\n")
+        wheel.writestr(f"{dist_info}/METADATA",
+                       f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n")
+        wheel.writestr(f"{dist_info}/WHEEL",
+                       "Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n")
+        wheel.writestr(f"{dist_info}/RECORD", "")
+    return wheel_path
+
+
+def _write_app(apps_dir, app_name, dependencies):
+    app_path = apps_dir / app_name
+    app_path.mkdir(parents=True)
+    (app_path / "manifest.json").write_text(json.dumps({
+        "name": app_name, "version": "1.0.0", "language": "python",
+        "entry": "main.py", "dependencies": dependencies,
+    }))
+    return str(app_path)
+
+
+def test_envs_share_hardlinked_wheels_without_rerunning_pip(clapp_home, tmp_path, monkeypatch):
+    wheel_dir = tmp_path / "wheels"
+    wheel_dir.mkdir()
+    _write_wheel(wheel_dir)
+
+    commands = []
+    run = app_env.run_command_safely
+
+    def recording_run(command, **kwargs):
+        commands.append(command)
+        return run(command, **kwargs)
+
+    monkeypatch.setattr(app_env, "run_command_safely", recording_run)
+
+    for app_name in ("first", "second"):
+        app_path = _write_app(clapp_home / "apps", app_name, ["clappdemo==1.0"])
+        success, message = create_app_env(app_name, app_path, find_links=str(wheel_dir))
+        assert success, message
+
+    # Çözüm depoda kayıtlı; ikinci uygulama için pip çalışmaz
+    assert len(commands) == 1
+    assert "--no-index" in commands[0]
+
+    linked = [os.path.join(get_env_site_packages(get_env_path(app_name)), "clappdemo", "__init__.py")
+              for app_name in ("first", "second")]
+    first, second = (os.stat(path) for path in linked)
+    assert (first.st_dev, first.st_ino) == (second.st_dev, second.st_ino)
+    assert first.st_nlink > 2  # depo + iki ortam
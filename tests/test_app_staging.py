@@ -0,0 +1,133 @@
+"""app_staging atomik değiştirme ve kurtarma testleri"""
+
+import json
+import os
+import shutil
+
+import app_staging
+from app_staging import cleanup_stale_staging, get_apps_directory, recover_interrupted_swaps, swap_in_app
+
+
+def _make_app(path, version):
+    os.makedirs(path)
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"name": "demo", "version": version}, f)
+
+
+def _installed_version():
+    with open(os.path.join(get_apps_directory(), "demo", "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)["version"]
+
+
+def test_swap_replaces_existing_app(clapp_home, tmp_path):
+    _make_app(tmp_path / "v1", "1.0.0")
+    _make_app(tmp_path / "v2", "2.0.0")
+
+    assert swap_in_app("demo", str(tmp_path / "v1"))[0]
+    assert swap_in_app("demo", str(tmp_path / "v2"))[0]
+    assert _installed_version() == "2.0.0"
+    assert not [name for name in os.listdir(app_staging.get_staging_root()) if name.endswith(".swap.json")]
+
+
+def test_failed_rollback_keeps_journal_for_recovery(clapp_home, tmp_path, monkeypatch):
+    _make_app(tmp_path / "v1", "1.0.0")
+    _make_app(tmp_path / "v2", "2.0.0")
+    assert swap_in_app("demo", str(tmp_path / "v1"))[0]
+    target = os.path.join(get_apps_directory(), "demo")
+
+    # Eski sürüm çöpe taşınabilir ama hedefe hiçbir şey konamaz
+    real_rename = os.rename
+
+    def failing_rename(src, dst):
+        if os.path.abspath(dst) == target:
+            raise OSError("simulated failure")
+        return real_rename(src, dst)
+
+    monkeypatch.setattr(app_staging.os, "rename", failing_rename)
+    success, message = swap_in_app("demo", str(tmp_path / "v2"))
+    monkeypatch.setattr(app_staging.os, "rename", real_rename)
+
+    assert not success
+    assert "geri yüklenecek" in message
+    assert not os.path.exists(target)
+
+    journals = [name for name in os.listdir(app_staging.get_staging_root()) if name.endswith(".swap.json")]
+    assert len(journals) == 1
+    journal_path = os.path.join(app_staging.get_staging_root(), journals[0])
+    with open(journal_path, encoding="utf-8") as f:
+        journal = json.load(f)
+    assert os.path.isdir(journal["old"])
+
+    # Çöp temizliği kurtarılmayı bekleyen eski sürümü silmez
+    monkeypatch.setattr(app_staging, "remove_tree_async", lambda path: shutil.rmtree(path, ignore_errors=True))
+    cleanup_stale_staging()
+    assert os.path.isdir(journal["old"])
+
+    # Günlük yeterince eskiyince eski sürüm geri konur
+    journal["started_at"] = 0
+    with open(journal_path, "w", encoding="utf-8") as f:
+        json.dump(journal, f)
+    recover_interrupted_swaps()
+
+    assert _installed_version() == "1.0.0"
+    assert not os.path.exists(journal_path)
+
+
+def test_concurrent_swaps_of_same_app_write_separate_journals(clapp_home, tmp_path, monkeypatch):
+    _make_app(tmp_path / "v1", "1.0.0")
+    _make_app(tmp_path / "v2", "2.0.0")
+    journals = []
+    write = app_staging._write_journal
+
+    def recording_write(path, data):
+        journals.append(path)
+        write(path, data)
+
+    monkeypatch.setattr(app_staging, "_write_journal", recording_write)
+    assert swap_in_app("demo", str(tmp_path / "v1"))[0]
+    assert swap_in_app("demo", str(tmp_path / "v2"))[0]
+
+    assert len(set(journals)) == 2
+    assert all(os.path.basename(path).startswith("demo-") for path in journals)
+
+
+def test_pending_removals_are_joined_before_exit(clapp_home, tmp_path):
+    tree = tmp_path / "eski"
+    for i in range(20):
+        (tree / str(i)).mkdir(parents=True)
+        (tree / str(i) / "dosya").write_bytes(b"x" * 1024)
+
+    app_staging.remove_tree_async(str(tree))
+    app_staging.join_pending_removals()
+
+    assert not tree.exists()
+
+
+def test_update_reuses_callers_workspace(clapp_home, tmp_path, monkeypatch):
+    import app_delta
+    import update_command
+
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    _make_app(tmp_path / "v1", "1.0.0")
+    assert swap_in_app("demo", str(tmp_path / "v1"))[0]
+
+    staged_in = []
+
+    def fake_delta(app_name, app_info, temp_dir):
+        staged_in.append(temp_dir)
+        _make_app(os.path.join(temp_dir, "delta-demo"), "2.0.0")
+        return True, os.path.join(temp_dir, "delta-demo")
+
+    def no_workspace():
+        raise AssertionError("paylaşılan çalışma dizini varken yenisi oluşturuldu")
+
+    monkeypatch.setattr(app_delta, "stage_delta_update", fake_delta)
+    monkeypatch.setattr(update_command, "staging_workspace", no_workspace)
+
+    success, message = update_command.download_and_install_update(
+        "demo", "2.0.0", [{"name": "demo", "version": "2.0.0"}], workspace=str(workspace))
+
+    assert success, message
+    assert staged_in == [str(workspace)]
+    assert _installed_version() == "2.0.0"
@@ -0,0 +1,98 @@
+"""build_index parmak izi cache'i testleri"""
+
+import json
+import os
+
+import pytest
+
+import build_index
+from build_index import scan_packages_directory
+
+
+def _write_app(packages_dir, name, main_source):
+    app_dir = packages_dir / name
+    app_dir.mkdir(parents=True, exist_ok=True)
+    (app_dir / "manifest.json").write_text(json.dumps({
+        "name": name, "version": "1.0.0", "language": "python",
+        "description": f"{name} uygulaması", "entry": "main.py",
+    }))
+    (app_dir / "main.py").write_text(main_source)
+    return app_dir
+
+
+@pytest.fixture
+def build(tmp_path, monkeypatch):
+    packages_dir = tmp_path / "packages"
+    for name in ("alpha", "beta"):
+        _write_app(packages_dir, name, f"print('{name}')\n")
+    artifacts_dir = tmp_path / "artifacts"
+    cache_file = tmp_path / ".build_index_cache.json"
+
+    calls = {"artifact": [], "hashed": []}
+    build_artifact = build_index.build_app_artifact
+    build_manifest = build_index.build_file_manifest
+
+    def recording_artifact(app_path, app_name, *args):
+        calls["artifact"].append(app_name)
+        return build_artifact(app_path, app_name, *args)
+
+    def recording_manifest(app_path, *args):
+        calls["hashed"].append(os.path.basename(app_path))
+        return build_manifest(app_path, *args)
+
+    monkeypatch.setattr(build_index, "build_app_artifact", recording_artifact)
+    monkeypatch.setattr(build_index, "build_file_manifest", recording_manifest)
+
+    def run():
+        for recorded in calls.values():
+            recorded.clear()
+        return scan_packages_directory(str(packages_dir), str(artifacts_dir), "https://example.invalid/a",
+                                       str(cache_file), max_workers=2)
+
+    return packages_dir, artifacts_dir, calls, run
+
+
+def _artifact_stats(artifacts_dir):
+    return {path.name: path.stat().st_mtime_ns for path in artifacts_dir.iterdir()}
+
+
+def test_unchanged_apps_are_reused_from_cache(build):
+    packages_dir, artifacts_dir, calls, run = build
+    first = run()
+    assert sorted(calls["artifact"]) == ["alpha", "beta"]
+    artifacts = _artifact_stats(artifacts_dir)
+
+    assert run() == first
+    assert calls == {"artifact": [], "hashed": []}
+    assert _artifact_stats(artifacts_dir) == artifacts
+
+
+def test_mtime_only_change_rehashes_without_rebuilding_archive(build):
+    packages_dir, artifacts_dir, calls, run = build
+    first = run()
+    artifacts = _artifact_stats(artifacts_dir)
+
+    # git clone gibi: içerik aynı, mtime farklı
+    main_py = packages_dir / "alpha" / "main.py"
+    st = main_py.stat()
+    os.utime(main_py, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    assert run() == first
+    assert calls == {"artifact": [], "hashed": ["alpha"]}
+    assert _artifact_stats(artifacts_dir) == artifacts
+
+    # Yeni stat'lar cache'e yazıldı; sonraki çalıştırma hiç okumaz
+    run()
+    assert calls == {"artifact": [], "hashed": []}
+
+
+def test_content_change_rebuilds_only_that_app(build):
+    packages_dir, artifacts_dir, calls, run = build
+    first = {app["name"]: app for app in run()}
+
+    _write_app(packages_dir, "beta", "print('beta 2')\n")
+    second = {app["name"]: app for app in run()}
+
+    assert calls["artifact"] == ["beta"]
+    assert second["alpha"] == first["alpha"]
+    assert second["beta"]["artifact_sha256"] != first["beta"]["artifact_sha256"]
@@ -0,0 +1,178 @@
+"""CacheManager eşzamanlı yazma testleri"""
+
+import json
+import multiprocessing
+
+from cache_manager import CacheManager
+
+
+def _stress_worker(cache_dir: str, worker_id: int, iterations: int, keys: int):
+    """Aynı anahtarlara yazar, komşu anahtarı diskten okur: (okuma, bozuk okuma)"""
+    manager = CacheManager(cache_dir)
+    reads = corrupt = 0
+    for i in range(iterations):
+        key = f"stress-{(worker_id + i) % keys}"
+        items = [worker_id] * (500 + (i * 37) % 2000)
+        manager.set(key, {"worker": worker_id, "items": items, "count": len(items)}, "metadata")
+
+        # Bellek katmanını atlayıp diskten oku
+        other = manager._get_cache_key(f"stress-{(worker_id + i + 1) % keys}", "metadata")
+        try:
+            with open(other, "rb") as f:
+                data = json.loads(f.read().decode("utf-8"))
+            reads += 1
+            if len(data["items"]) != data["count"]:
+                corrupt += 1
+        except FileNotFoundError:
+            pass
+        except Exception:
+            reads += 1
+            corrupt += 1
+    return reads, corrupt
+
+
+def test_concurrent_writers_never_expose_partial_files(tmp_path):
+    processes, iterations, keys = 6, 100, 4
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.starmap(_stress_worker, [
+            (str(tmp_path), worker_id, iterations, keys) for worker_id in range(processes)
+        ])
+
+    reads = sum(reads for reads, _ in results)
+    corrupt = sum(corrupt for _, corrupt in results)
+    assert reads > 0
+    assert corrupt == 0
+
+    # Her anahtar son yazanın tam kaydını içerir
+    manager = CacheManager(str(tmp_path))
+    for key in range(keys):
+        data = manager.get(f"stress-{key}", "metadata")
+        assert data is not None
+        assert len(data["items"]) == data["count"]
+
+
+def test_get_returns_what_set_wrote(tmp_path):
+    manager = CacheManager(str(tmp_path))
+    assert manager.set("key", {"value": 1}, "metadata")
+    assert CacheManager(str(tmp_path)).get("key", "metadata") == {"value": 1}
+    assert manager.delete("key", "metadata")
+    assert CacheManager(str(tmp_path)).get("key", "metadata") is None
+
+
+def test_cached_memoizes_without_touching_type_budget(clapp_home, monkeypatch):
+    import cache_manager
+    from cache_manager import cached, get_cache_budget, get_default_cache_manager
+
+    monkeypatch.setenv("CLAPP_CACHE_BUDGET_MEMO", "2")
+    calls = []
+
+    @cached(max_age=60)
+    def square(value):
+        calls.append(value)
+        return value * value
+
+    assert square(4) == 16
+    assert square(4) == 16
+    assert calls == [4]
+    assert square.cache_info() == {"hits": 1, "misses": 1}
+
+    # Bütçe sadece ortam değişkeninden gelir
+    assert get_default_cache_manager().budgets["memo"] == get_cache_budget("memo") == 2 * 1024 * 1024
+
+    # Süreçler arası: bellek katmanı boşaltılınca diskten okunur
+    monkeypatch.setattr(cache_manager, "_memory_tier", type(cache_manager._memory_tier)())
+    assert square(4) == 16
+    assert calls == [4]
+    assert square.cache_clear() == 1
+
+
+def test_registry_snapshot_and_indexes_are_not_cache_entries(clapp_home, tmp_path):
+    from cache_manager import get_default_cache_manager
+    from registry_client import RegistrySession
+    from search_index import search_registry
+    from smart_search import get_trigram_index_path
+
+    index_file = tmp_path / "index.json"
+    index_file.write_text(json.dumps([
+        {"name": "cloud-notepad", "description": "not defteri", "language": "python"},
+    ]))
+    session = RegistrySession(index_file.as_uri())
+    assert search_registry(session, "notepad")
+
+    manager = get_default_cache_manager()
+    manager.set("kayit", {"veri": "x" * 1000}, "registry")
+    index_dir = session.client.cache_dir
+    assert get_trigram_index_path("abc").parent == index_dir
+    (index_dir / "trigram-abc.idx").write_bytes(b"idx")
+    written = sorted(path.name for path in index_dir.iterdir())
+    assert len(written) == 4  # snapshot, meta, search-*.bin, trigram-*.idx
+
+    # Defter, tahliye ve clear sadece CacheManager kayıtlarını görür
+    assert manager.verify() == {"added": 0, "removed": 0, "resized": 0}
+    manager.budgets["registry"] = 0
+    evicted, _ = manager.prune()
+    assert evicted == 1
+    manager.clear()
+    assert sorted(path.name for path in index_dir.iterdir()) == written
+
+
+def _entry(index):
+    return {"veri": str(index) * 1000}
+
+
+def test_lru_eviction_keeps_recently_read_entries_within_byte_budget(tmp_path, monkeypatch):
+    import time
+
+    import cache_manager
+
+    manager = CacheManager(str(tmp_path), budgets={"metadata": 3500})
+    entry_size = len(CacheManager._serialize(_entry(0), "metadata"))
+    assert 3 * entry_size <= 3500 < 4 * entry_size
+
+    for i in range(3):
+        manager.set(f"kayit-{i}", _entry(i), "metadata")
+        time.sleep(0.01)
+
+    # kayit-0 bellek katmanından okunur; defterde hâlâ en eski görünür
+    assert manager.get("kayit-0", "metadata") == _entry(0)
+    assert manager.stats["memory_hits"] == 1
+    time.sleep(0.01)
+
+    # kayit-1 diskten okunur (yeni süreç gibi)
+    monkeypatch.setattr(cache_manager, "_memory_tier", type(cache_manager._memory_tier)())
+    assert manager.get("kayit-1", "metadata") == _entry(1)
+    assert manager.stats["memory_hits"] == 1
+    time.sleep(0.01)
+
+    manager.set("kayit-3", _entry(3), "metadata")
+
+    # Bütçeyi aşan yazma en uzun süredir okunmayan kaydı (kayit-2) siler
+    remaining = sorted(path.stem for path in manager.metadata_cache.glob("*.json"))
+    assert remaining == sorted(manager._get_cache_key(f"kayit-{i}", "metadata").stem for i in (0, 1, 3))
+    assert manager.stats["evictions"] == 1
+    assert manager.ledger.total("metadata")[1] <= 3500
+    assert manager.get("kayit-2", "metadata") is None
+
+
+def test_memory_tier_serves_repeated_reads_without_disk(tmp_path, monkeypatch):
+    manager = CacheManager(str(tmp_path))
+    manager.set("kayit", {"deger": 1}, "registry")
+
+    opened = []
+    real_open = open
+
+    def recording_open(path, *args, **kwargs):
+        opened.append(str(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", recording_open)
+    for _ in range(3):
+        assert manager.get("kayit", "registry") == {"deger": 1}
+    monkeypatch.undo()
+
+    assert not [path for path in opened if path.startswith(str(tmp_path))]
+    assert manager.stats["memory_hits"] == 3
+
+    # Silinen kayıt bellek katmanından da düşer
+    assert manager.delete("kayit", "registry")
+    assert manager.get("kayit", "registry") is None
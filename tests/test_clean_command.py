@@ -0,0 +1,63 @@
+"""clapp clean --dry-run testleri"""
+
+import os
+import time
+
+import clean_command
+from cache_manager import get_default_cache_manager
+
+
+def _populate(clapp_home):
+    """Bütçeyi aşan cache, eski yarım indirme ve temp dizini hazırlar"""
+    manager = get_default_cache_manager()
+    for i in range(5):
+        manager.set(f"kayit-{i}", {"veri": "x" * 1000}, "metadata")
+    manager.budgets["metadata"] = 2500
+
+    partial = clapp_home / "cache" / "partial"
+    partial.mkdir(parents=True)
+    part_file = partial / "url-eski.part"
+    part_file.write_bytes(b"y" * 100)
+    old = time.time() - clean_command.PARTIAL_DOWNLOAD_MAX_AGE - 60
+    os.utime(part_file, (old, old))
+
+    temp_dir = clapp_home / "temp"
+    temp_dir.mkdir()
+    (temp_dir / "dosya").write_bytes(b"z" * 10)
+    return manager, part_file, temp_dir
+
+
+def test_dry_run_reports_without_deleting(clapp_home):
+    manager, part_file, temp_dir = _populate(clapp_home)
+    cache_files = sorted(manager.metadata_cache.glob("*.json"))
+
+    dry_files, dry_size = clean_command.clean_clapp_config(dry_run=True)
+
+    assert str(part_file) in dry_files
+    assert str(temp_dir) in dry_files
+    assert any("kayıt)" in item for item in dry_files)
+    assert part_file.exists() and temp_dir.exists()
+    assert sorted(manager.metadata_cache.glob("*.json")) == cache_files
+    assert manager.stats["evictions"] == 0
+
+    files, size = clean_command.clean_clapp_config()
+
+    assert files == dry_files
+    assert size == dry_size
+    assert not part_file.exists() and not temp_dir.exists()
+    assert len(list(manager.metadata_cache.glob("*.json"))) < len(cache_files)
+
+
+def test_run_clean_dry_run_keeps_files(clapp_home, tmp_path, monkeypatch, capsys):
+    _, part_file, _ = _populate(clapp_home)
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    (workdir / "eski.bak").write_text("yedek")
+    monkeypatch.chdir(workdir)
+
+    assert clean_command.run_clean(dry_run=True)
+
+    output = capsys.readouterr().out
+    assert "Toplam temizlenecek" in output
+    assert (workdir / "eski.bak").exists()
+    assert part_file.exists()
@@ -0,0 +1,43 @@
+"""completion önek araması testleri"""
+
+import completion
+from completion import KIND_INSTALLED, KIND_PACKAGE, PACKAGE_KINDS, CompletionIndex
+
+
+def _entries(count):
+    """Uzun ortak önekli paketler; ağırlık alfabetik sırayla artar"""
+    entries = []
+    for i in range(count):
+        name = f"clapp-plugin-{i:05d}"
+        kind = KIND_INSTALLED if i % 10 == 0 else KIND_PACKAGE
+        entries.append((name, kind, name, float(i)))
+    return entries
+
+
+def _expected(entries, prefix, limit, kinds=None):
+    matches = [(weight, display) for key, kind, display, weight in entries
+               if key.startswith(prefix) and (kinds is None or kind in kinds)]
+    return [display for _, display in sorted(matches, key=lambda item: (-item[0], item[1]))[:limit]]
+
+
+def test_long_common_prefix_beyond_scan_limit_is_ranked_by_weight():
+    count = completion.MAX_SCAN_LINES + 1000
+    entries = _entries(count)
+    index = CompletionIndex.from_entries(entries)
+
+    # Önek 13 karakter ve MAX_SCAN_LINES'tan fazla satıra uyuyor; en ağırlıklılar alfabetik sonda
+    for prefix in ("clapp-plugin-", "clapp-plugin-0", "CLAPP-PLUGIN-04"):
+        assert index.complete(prefix, 10) == _expected(entries, prefix.lower(), 10)
+        assert index.complete(prefix, 10, PACKAGE_KINDS) == _expected(entries, prefix.lower(), 10, PACKAGE_KINDS)
+        assert index.complete(prefix, 5, {KIND_INSTALLED}) == \
+            _expected(entries, prefix.lower(), 5, {KIND_INSTALLED})
+
+
+def test_rare_prefix_is_answered_by_scanning():
+    entries = _entries(600) + [("zeta-tool", KIND_PACKAGE, "zeta-tool", 1.0),
+                               ("zeta-app", KIND_INSTALLED, "zeta-app", 1.0)]
+    index = CompletionIndex.from_entries(entries)
+
+    assert index.complete("zeta", 10) == ["zeta-app", "zeta-tool"]
+    assert index.complete("zeta", 10, {KIND_INSTALLED}) == ["zeta-app"]
+    assert index.complete("clapp-plugin-0059", 10) == _expected(entries, "clapp-plugin-0059", 10)
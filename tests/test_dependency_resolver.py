@@ -0,0 +1,165 @@
+"""dependency_resolver testleri"""
+
+import json
+import random
+import subprocess
+import time
+
+import app_env
+import dependency_resolver
+from dependency_resolver import DependencyGraph
+
+
+def _python_app(tmp_path, dependencies):
+    app_dir = tmp_path / "demo"
+    app_dir.mkdir()
+    (app_dir / "manifest.json").write_text(json.dumps({
+        "name": "demo", "version": "1.0.0", "language": "python",
+        "entry": "main.py", "dependencies": dependencies,
+    }))
+    return app_dir
+
+
+def test_pip_requirements_are_not_filtered_by_app_name(tmp_path, monkeypatch):
+    missing = "clapp-test-dist-that-is-not-installed"
+    app_dir = _python_app(tmp_path, [missing, "pytest", "PyQt6==0.0.1; python_version < '3'"])
+    commands = []
+
+    def fake_run(command, **kwargs):
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    # Her ad kurulu bir clapp uygulaması olsa da pip gereksinimi olarak kontrol edilir
+    monkeypatch.setattr(dependency_resolver, "app_exists", lambda name: True)
+    monkeypatch.setattr("package_registry.app_exists", lambda name: True)
+    monkeypatch.setattr(dependency_resolver, "run_command_safely", fake_run)
+
+    success, message, missing_packages = dependency_resolver.check_and_install_python_dependencies(str(app_dir))
+
+    assert success, message
+    assert missing_packages == [missing]
+    assert len(commands) == 1
+    assert commands[0][-1] == missing
+
+    requirements, _ = app_env.collect_requirements(str(app_dir), json.loads((app_dir / "manifest.json").read_text()))
+    assert requirements == [missing, "pytest", "PyQt6==0.0.1; python_version < '3'"]
+
+
+def _synthetic_manifests(app_count, max_deps=4, seed=42):
+    """Her uygulama kendisinden önceki en fazla max_deps uygulamaya bağımlı (bol elmaslı DAG)"""
+    rng = random.Random(seed)
+    manifests = {}
+    for i in range(app_count):
+        deps = [f"app{j}" for j in rng.sample(range(i), min(i, rng.randint(0, max_deps)))]
+        manifests[f"app{i}"] = {"version": "1.0.0", "language": "python", "dependencies": deps}
+    return manifests
+
+
+def _reachable(start, edges):
+    seen, stack = set(), [start]
+    while stack:
+        node = stack.pop()
+        for dep in edges.get(node, ()):
+            if dep not in seen:
+                seen.add(dep)
+                stack.append(dep)
+    return seen
+
+
+def _tree_names(tree, names=None):
+    # Paylaşılan alt ağaçlar bir kez gezilir
+    names = set() if names is None else names
+    for child in tree["dependencies"]:
+        if child["name"] not in names:
+            names.add(child["name"])
+            _tree_names(child, names)
+    return names
+
+
+def test_dependency_graph_on_large_synthetic_dag():
+    app_count = 5000
+    manifests = _synthetic_manifests(app_count)
+    edges = {name: manifest["dependencies"] for name, manifest in manifests.items()}
+    last = f"app{app_count - 1}"
+
+    start = time.perf_counter()
+    graph = DependencyGraph(manifests)
+    order, cyclic = graph.topological_order()
+    cycles = graph.find_cycles()
+    tree = graph.tree(last)
+    dependents = graph.reverse_dependencies("app0", transitive=True)
+    elapsed = time.perf_counter() - start
+
+    # Bağımlılıklar her zaman bağımlı uygulamadan önce gelir
+    assert cyclic == [] and cycles == []
+    position = {name: i for i, name in enumerate(order)}
+    assert len(order) == app_count
+    assert all(position[dep] < position[name] for name, deps in edges.items() for dep in deps)
+
+    assert _tree_names(tree) == _reachable(last, edges) == graph.closure(last)
+
+    reverse = {}
+    for name, deps in edges.items():
+        for dep in deps:
+            reverse.setdefault(dep, []).append(name)
+    assert dependents == sorted(_reachable("app0", reverse))
+
+    # Ağaçlar paylaşıldığı için elmaslar tekrar açılmaz; eski özyinelemeli açılım dakikalar sürerdi
+    assert elapsed < 10, f"graf işlemleri {elapsed:.2f}s sürdü"
+
+
+def test_dependency_graph_reports_cycles_and_missing():
+    manifests = _synthetic_manifests(50)
+    manifests["app3"]["dependencies"] = manifests["app3"]["dependencies"] + ["app40", "yok-paket"]
+    manifests["app40"]["dependencies"] = manifests["app40"]["dependencies"] + ["app3"]
+    graph = DependencyGraph(manifests)
+
+    order, cyclic = graph.topological_order()
+    cycles = graph.find_cycles()
+
+    assert cyclic
+    assert len(order) + len(cyclic) == 50
+    assert any(cycle[0] == cycle[-1] and "app3" in cycle and "app40" in cycle for cycle in cycles)
+    for cycle in cycles:
+        assert all(b in graph.edges[a] for a, b in zip(cycle, cycle[1:]))
+    assert graph.missing["app3"] == ["yok-paket"]
+    assert "error" not in graph.tree("app40")
+
+
+def _brute_force_cycles(edges):
+    cycles = set()
+
+    def extend(path):
+        for dep in edges[path[-1]]:
+            if dep == path[0]:
+                cycles.add(tuple(path + [dep]))
+            elif dep > path[0] and dep not in path:
+                extend(path + [dep])
+
+    for name in edges:
+        extend([name])
+    return sorted(list(cycle) for cycle in cycles)
+
+
+def test_find_cycles_enumerates_every_elementary_cycle():
+    # a, b->a ve c->a döngülerini paylaşır; d kendine bağımlı
+    manifests = {
+        "a": {"dependencies": ["b", "c"]},
+        "b": {"dependencies": ["a", "c"]},
+        "c": {"dependencies": ["a"]},
+        "d": {"dependencies": ["d", "a"]},
+    }
+    graph = DependencyGraph(manifests)
+
+    assert graph.find_cycles() == [["a", "b", "a"], ["a", "b", "c", "a"], ["a", "c", "a"], ["d", "d"]]
+    assert graph.find_cycles(["a", "c"]) == [["a", "c", "a"]]
+    assert len(graph.find_cycles(limit=2)) == 2
+
+
+def test_find_cycles_matches_brute_force_on_random_graphs():
+    rng = random.Random(8)
+    for _ in range(30):
+        names = [f"app{i}" for i in range(7)]
+        manifests = {name: {"dependencies": rng.sample(names, rng.randint(0, 3))} for name in names}
+        graph = DependencyGraph(manifests)
+        assert graph.find_cycles() == _brute_force_cycles(graph.edges)
@@ -0,0 +1,69 @@
+"""file_hasher cache ve doğrulama yolları testleri"""
+
+import hashlib
+import os
+
+import pytest
+
+from file_hasher import FileHasher, get_file_hasher, hash_file
+from install_command import verify_artifact
+
+
+def _write(path, payload):
+    path.write_bytes(payload)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _spoof(path, payload):
+    """İçeriği aynı boyutta değiştirir, mtime değerini (ns) geri alır; inode aynı kalır"""
+    st = os.stat(path)
+    with open(path, "r+b") as f:
+        f.write(payload)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def test_hash_file_cache_hit_miss_and_invalidation(clapp_home, tmp_path):
+    path = tmp_path / "dosya.bin"
+    digest = _write(path, os.urandom(4096))
+    hasher = get_file_hasher()
+
+    assert hash_file(str(path)) == digest
+    assert hasher.stats == {"hits": 0, "misses": 1}
+
+    assert hash_file(str(path)) == digest
+    assert hasher.stats == {"hits": 1, "misses": 1}
+
+    # Yeni süreç de kalıcı cache'ten okur
+    assert FileHasher().hash_file(str(path)) == digest
+
+    changed = _write(path, os.urandom(8192))
+    assert hash_file(str(path)) == changed
+    assert hasher.stats == {"hits": 1, "misses": 2}
+
+
+def _spoofed_archive(tmp_path):
+    path = tmp_path / "demo-1.0.0.tar.gz"
+    payload = os.urandom(4096)
+    digest = _write(path, payload)
+    assert hash_file(str(path)) == digest
+
+    tampered = bytes(b ^ 0xFF for b in payload)
+    _spoof(path, tampered)
+    # Stat cache'i kandırılır; doğrulama yolları içerikten hesaplamalı
+    assert hash_file(str(path)) == digest
+    return path, digest, tampered
+
+
+def test_verify_artifact_ignores_spoofed_stat_cache(clapp_home, tmp_path):
+    path, digest, tampered = _spoofed_archive(tmp_path)
+
+    verified, message = verify_artifact(str(path), len(tampered), digest)
+    assert not verified
+    assert "sha256" in message
+
+
+def test_package_checksum_ignores_spoofed_stat_cache(clapp_home, tmp_path):
+    package_signing = pytest.importorskip("package_signing")
+    path, digest, tampered = _spoofed_archive(tmp_path)
+
+    assert package_signing.PackageSigner().calculate_checksum(str(path)) == hashlib.sha256(tampered).hexdigest()
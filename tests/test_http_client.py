@@ -0,0 +1,86 @@
+"""http_client bağlantı havuzu ve file:// adaptörü testleri"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+from http_client import get_http_client
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        # İstemci tarafı port, isteğin hangi TCP bağlantısından geldiğini gösterir
+        self.server.connections.append(self.client_address)
+        body = f"istek {len(self.server.connections)}".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def keep_alive_server(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1,localhost")
+    monkeypatch.setattr(http_client, "_client", None)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    server.daemon_threads = True
+    server.connections = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", server
+    server.shutdown()
+    server.server_close()
+    http_client.reset_http_client()
+
+
+def test_requests_reuse_pooled_connection(keep_alive_server):
+    base_url, server = keep_alive_server
+    client = get_http_client()
+    assert get_http_client() is client
+
+    for i in range(3):
+        assert client.get(f"{base_url}/index-{i}.json").text == f"istek {i + 1}"
+    with client.stream(f"{base_url}/arsiv.tar.gz") as response:
+        assert b"".join(response.iter_content(4)) == b"istek 4"
+
+    # Tüm istekler tek keep-alive bağlantısından geçer
+    assert len(server.connections) == 4
+    assert len(set(server.connections)) == 1
+
+    http_client.reset_http_client()
+    get_http_client().get(f"{base_url}/yeni")
+    assert len(set(server.connections)) == 2
+
+
+def test_file_adapter_serves_local_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_client, "_client", None)
+    path = tmp_path / "index.json"
+    path.write_bytes(b'[{"name": "demo"}]')
+    client = get_http_client()
+
+    response = client.get(path.as_uri())
+    assert response.status_code == 200
+    assert response.json() == [{"name": "demo"}]
+    assert response.headers["Content-Length"] == str(path.stat().st_size)
+
+    head = client.head(path.as_uri())
+    assert head.status_code == 200
+    assert head.content == b""
+    assert head.headers["Content-Length"] == str(path.stat().st_size)
+
+    with client.stream(path.as_uri()) as streamed:
+        assert b"".join(streamed.iter_content(5)) == path.read_bytes()
+
+    # Range desteklenmez; her zaman tüm dosya döner
+    ranged = client.get(path.as_uri(), headers={"Range": "bytes=5-"})
+    assert ranged.status_code == 200 and ranged.content == path.read_bytes()
+
+    assert client.get((tmp_path / "yok.json").as_uri()).status_code == 404
+    http_client.reset_http_client()
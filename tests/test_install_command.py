@@ -0,0 +1,165 @@
+"""install_command arşiv indirme ve kurulum testleri"""
+
+import hashlib
+import os
+
+from install_command import fetch_archive
+
+
+def _write_archive(path, payload):
+    with open(path, "wb") as f:
+        f.write(payload)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def test_tampered_cached_archive_is_evicted_and_downloaded_again(clapp_home, tmp_path):
+    source = tmp_path / "demo-1.0.0.tar.gz"
+    payload = os.urandom(4096)
+    sha256 = _write_archive(source, payload)
+    url = source.as_uri()
+
+    work = tmp_path / "work"
+    work.mkdir()
+    success, cached_path = fetch_archive(url, str(work), "demo", len(payload), sha256)
+    assert success
+    assert cached_path.startswith(str(clapp_home))
+
+    # Aynı boyutta ama farklı içerikli arşiv cache'te
+    with open(cached_path, "wb") as f:
+        f.write(bytes(b ^ 0xFF for b in payload))
+
+    success, path = fetch_archive(url, str(work), "demo", len(payload), sha256)
+    assert success
+    with open(path, "rb") as f:
+        assert hashlib.sha256(f.read()).hexdigest() == sha256
+
+
+def test_cached_archive_is_reused_without_network(clapp_home, tmp_path):
+    source = tmp_path / "demo-1.0.0.tar.gz"
+    payload = os.urandom(1024)
+    sha256 = _write_archive(source, payload)
+    url = source.as_uri()
+
+    work = tmp_path / "work"
+    work.mkdir()
+    assert fetch_archive(url, str(work), "demo", len(payload), sha256)[0]
+
+    # Kaynak silinse de cache'teki doğrulanmış arşiv kullanılır
+    source.unlink()
+    success, path = fetch_archive(url, str(work), "demo", len(payload), sha256)
+    assert success
+    assert path.startswith(str(clapp_home))
+
+
+def test_fetch_archive_shares_the_default_cache_manager(clapp_home, tmp_path, monkeypatch):
+    import cache_manager
+
+    created = []
+    init = cache_manager.CacheManager.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created.append(self)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(cache_manager.CacheManager, "__init__", counting_init)
+
+    work = tmp_path / "work"
+    work.mkdir()
+    for name in ("a", "b", "c"):
+        source = tmp_path / f"{name}-1.0.0.tar.gz"
+        payload = os.urandom(512)
+        sha256 = _write_archive(source, payload)
+        assert fetch_archive(source.as_uri(), str(work), name, len(payload), sha256)[0]
+
+    # Her çağrı ayrı SQLite bağlantısı açmaz
+    assert created == [cache_manager.get_default_cache_manager()]
+
+
+def test_repo_archive_is_fetched_once_and_extracted_concurrently(clapp_home, tmp_path, monkeypatch):
+    import json
+    import threading
+    import time
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    import install_command
+
+    names = ["alpha", "beta", "gamma"]
+    zip_path = tmp_path / "main.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for name in names:
+            zf.writestr(f"clapp-packages-main/packages/{name}/manifest.json",
+                        json.dumps({"name": name, "version": "1.0.0", "language": "python", "entry": "main.py"}))
+            zf.writestr(f"clapp-packages-main/packages/{name}/main.py", f"print('{name}')\n")
+
+    fetches = []
+
+    def fake_fetch_archive(url, temp_dir, description, *args):
+        fetches.append(url)
+        time.sleep(0.1)
+        return True, str(zip_path)
+
+    # Çıkarmalar kilit altında sırayla yapılsaydı bariyer zaman aşımına uğrardı
+    barrier = threading.Barrier(len(names), timeout=5)
+    extract = install_command.extract_subtree_with_progress
+
+    def concurrent_extract(*args, **kwargs):
+        barrier.wait()
+        return extract(*args, **kwargs)
+
+    monkeypatch.setattr(install_command, "fetch_archive", fake_fetch_archive)
+    monkeypatch.setattr(install_command, "extract_subtree_with_progress", concurrent_extract)
+
+    work = tmp_path / "work"
+    work.mkdir()
+    extractions = {}
+    lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        results = list(executor.map(
+            lambda name: install_command.download_app_from_github(
+                {"name": name, "version": "1.0.0", "repo_url": "https://github.com/mburakmmm/clapp-packages"},
+                str(work), extractions, lock),
+            names))
+
+    assert fetches == ["https://github.com/mburakmmm/clapp-packages/archive/refs/heads/main.zip"]
+    for name, (success, path) in zip(names, results):
+        assert success, path
+        assert os.path.isfile(os.path.join(path, "main.py"))
+
+
+def test_install_from_per_app_tarball_over_file_url(clapp_home, tmp_path, monkeypatch):
+    import json
+
+    import install_command
+    from build_index import generate_index
+
+    app_dir = tmp_path / "packages" / "hello"
+    (app_dir / "lib").mkdir(parents=True)
+    (app_dir / "manifest.json").write_text(json.dumps({
+        "name": "hello", "version": "1.2.0", "language": "python",
+        "description": "tarball kurulum testi", "entry": "main.py", "dependencies": [],
+    }))
+    (app_dir / "main.py").write_text("print('merhaba')\n")
+    (app_dir / "lib" / "util.py").write_text("VALUE = 42\n")
+
+    out = tmp_path / "out"
+    out.mkdir()
+    artifacts = out / "artifacts"
+    assert generate_index(str(out / "index.json"), str(tmp_path / "packages"), str(artifacts), artifacts.as_uri())
+    with open(out / "index.json", encoding="utf-8") as f:
+        apps = json.load(f)
+    assert apps[0]["artifact_url"].startswith("file://")
+    assert apps[0]["artifact_url"].endswith("hello-1.2.0.tar.gz")
+
+    # Paket deposu zip'i istenirse test başarısız olur
+    monkeypatch.setattr(install_command, "fetch_repo_archive",
+                        lambda *args, **kwargs: (False, "depo arşivi indirilmemeli"))
+    monkeypatch.setattr(install_command, "load_index", lambda *args, **kwargs: (True, "test index", apps))
+
+    success, message = install_command.install_app("hello")
+
+    assert success, message
+    installed = clapp_home / "apps" / "hello"
+    assert (installed / "main.py").read_text() == "print('merhaba')\n"
+    assert (installed / "lib" / "util.py").read_text() == "VALUE = 42\n"
+    assert json.loads((installed / "manifest.json").read_text())["version"] == "1.2.0"
@@ -0,0 +1,108 @@
+"""InstalledIndex tazelik testleri"""
+
+import json
+import os
+
+from installed_index import InstalledIndex
+
+
+def _write_manifest(app_path, **fields):
+    manifest = {
+        "name": os.path.basename(app_path),
+        "version": "1.0.0",
+        "language": "python",
+        "entry": "main.py",
+        "description": "demo",
+    }
+    manifest.update(fields)
+    with open(os.path.join(app_path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def _make_index(tmp_path):
+    apps_dir = tmp_path / "apps"
+    app_path = apps_dir / "demo"
+    app_path.mkdir(parents=True)
+    _write_manifest(str(app_path))
+    return InstalledIndex(str(apps_dir), str(tmp_path / "installed.json")), str(app_path)
+
+
+def test_entries_pick_up_manifest_edited_in_place(tmp_path):
+    index, app_path = _make_index(tmp_path)
+    assert index.entries()["demo"]["manifest"]["version"] == "1.0.0"
+
+    apps_dir_mtime = os.stat(os.path.dirname(app_path)).st_mtime_ns
+    _write_manifest(app_path, version="1.10.0")
+    # Yerinde düzenleme apps dizininin mtime'ını değiştirmez
+    assert os.stat(os.path.dirname(app_path)).st_mtime_ns == apps_dir_mtime
+
+    assert index.entries()["demo"]["manifest"]["version"] == "1.10.0"
+
+    # Yeni süreç de kalıcı indeksten güncel sürümü okur
+    reopened = InstalledIndex(index.apps_dir, index.index_path)
+    assert reopened.entries()["demo"]["manifest"]["version"] == "1.10.0"
+
+
+def test_entries_reflect_validity_changes(tmp_path):
+    index, app_path = _make_index(tmp_path)
+    assert index.entries()["demo"]["valid"]
+
+    with open(os.path.join(app_path, "manifest.json"), "w", encoding="utf-8") as f:
+        f.write("{ bozuk json")
+    entry = index.entries()["demo"]
+    assert not entry["valid"]
+    assert entry["manifest"] is None
+
+
+def test_entries_track_added_and_removed_apps(tmp_path):
+    index, app_path = _make_index(tmp_path)
+    other = os.path.join(index.apps_dir, "other")
+    os.mkdir(other)
+    _write_manifest(other)
+    assert set(index.entries()) == {"demo", "other"}
+
+    for name in os.listdir(other):
+        os.remove(os.path.join(other, name))
+    os.rmdir(other)
+    assert set(index.entries()) == {"demo"}
+
+
+def test_record_install_picks_up_apps_added_outside_clapp(tmp_path):
+    index, _ = _make_index(tmp_path)
+    assert set(index.entries()) == {"demo"}
+
+    # Elle kopyalanan klasör indekse yazılmadan dizini değiştirir
+    manual = os.path.join(index.apps_dir, "manual")
+    os.mkdir(manual)
+    _write_manifest(manual)
+
+    before = os.stat(index.apps_dir).st_mtime_ns
+    installed = os.path.join(index.apps_dir, "installed")
+    os.mkdir(installed)
+    _write_manifest(installed)
+    index.record_install("installed", before)
+
+    assert set(index.entries()) == {"demo", "manual", "installed"}
+    reopened = InstalledIndex(index.apps_dir, index.index_path)
+    assert set(reopened.entries()) == {"demo", "manual", "installed"}
+
+
+def test_record_install_from_stale_processes_keeps_both_entries(tmp_path):
+    index, _ = _make_index(tmp_path)
+    index.entries()
+    # İki süreç indeksi aynı anda yüklemiş gibi
+    first = InstalledIndex(index.apps_dir, index.index_path)
+    second = InstalledIndex(index.apps_dir, index.index_path)
+    first.entries()
+    second.entries()
+
+    for process, name in ((first, "one"), (second, "two")):
+        before = os.stat(index.apps_dir).st_mtime_ns
+        app_path = os.path.join(index.apps_dir, name)
+        os.mkdir(app_path)
+        _write_manifest(app_path)
+        process.record_install(name, before)
+
+    with open(index.index_path, encoding="utf-8") as f:
+        assert set(json.load(f)["apps"]) == {"demo", "one", "two"}
+    assert set(InstalledIndex(index.apps_dir, index.index_path).entries()) == {"demo", "one", "two"}
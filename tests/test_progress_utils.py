@@ -0,0 +1,88 @@
+"""Arşiv çıkarma testleri: sadece hedef alt ağaç çıkarılır, dışarı yazan üyeler reddedilir"""
+
+import io
+import json
+import tarfile
+import zipfile
+
+from progress_utils import extract_subtree_with_progress, extract_tar_with_progress, find_app_in_zip
+
+
+def _repo_zip(path, extra=()):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name in ("alpha", "beta"):
+            zf.writestr(f"clapp-packages-main/packages/{name}/manifest.json",
+                        json.dumps({"name": name, "version": "1.0.0"}))
+            zf.writestr(f"clapp-packages-main/packages/{name}/lib/{name}.py", f"NAME = '{name}'\n")
+        zf.writestr("clapp-packages-main/README.md", "depo\n")
+        for member, data in extra:
+            zf.writestr(member, data)
+    return path
+
+
+def _files(root):
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*") if path.is_file())
+
+
+def test_only_target_subtree_is_extracted(tmp_path):
+    zip_path = _repo_zip(tmp_path / "main.zip")
+
+    prefix, manifest = find_app_in_zip(str(zip_path), "beta")
+    assert prefix == "clapp-packages-main/packages/beta/"
+    assert manifest["name"] == "beta"
+    assert find_app_in_zip(str(zip_path), "yok") is None
+
+    dest = tmp_path / "out"
+    assert extract_subtree_with_progress(str(zip_path), prefix, str(dest))
+    assert _files(dest) == ["lib/beta.py", "manifest.json"]
+    assert _files(tmp_path) == ["main.zip", "out/lib/beta.py", "out/manifest.json"]
+
+
+def test_zip_traversal_member_is_rejected(tmp_path):
+    zip_path = _repo_zip(tmp_path / "main.zip",
+                         [("clapp-packages-main/packages/beta/../../../../kacak.txt", "x")])
+    dest = tmp_path / "a" / "b" / "out"
+
+    assert not extract_subtree_with_progress(str(zip_path), "clapp-packages-main/packages/beta/", str(dest))
+    assert not list(tmp_path.rglob("kacak.txt"))
+
+
+def _tar(path, members):
+    with tarfile.open(path, "w:gz") as tar:
+        for info, data in members:
+            tar.addfile(info, io.BytesIO(data) if data is not None else None)
+    return path
+
+
+def _file_member(name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    return info, data
+
+
+def test_tar_extracts_regular_members(tmp_path):
+    tar_path = _tar(tmp_path / "demo.tar.gz", [_file_member("demo/manifest.json", b"{}"),
+                                               _file_member("demo/main.py", b"print(1)\n")])
+    dest = tmp_path / "out"
+
+    assert extract_tar_with_progress(str(tar_path), str(dest))
+    assert _files(dest) == ["demo/main.py", "demo/manifest.json"]
+
+
+def test_tar_traversal_and_link_members_are_rejected(tmp_path):
+    link = tarfile.TarInfo("demo/link")
+    link.type = tarfile.SYMTYPE
+    link.linkname = "/etc/passwd"
+    cases = {
+        "dotdot": [_file_member("demo/ok.txt", b"ok"), _file_member("../kacak.txt", b"x")],
+        "absolute": [_file_member(str(tmp_path / "kacak.txt"), b"x")],
+        "symlink": [_file_member("demo/ok.txt", b"ok"), (link, None)],
+    }
+    for name, members in cases.items():
+        dest = tmp_path / name / "out"
+        tar_path = _tar(tmp_path / f"{name}.tar.gz", members)
+
+        assert not extract_tar_with_progress(str(tar_path), str(dest)), name
+        # Doğrulama çıkarmadan önce yapılır; hiçbir üye yazılmaz
+        assert not dest.exists() or _files(dest) == [], name
+    assert not list(tmp_path.rglob("kacak.txt"))
@@ -0,0 +1,133 @@
+"""registry_client oturum ve snapshot testleri"""
+
+import json
+
+import pytest
+
+import http_client
+import remote_registry
+from registry_client import (SOURCE_NETWORK, SOURCE_NOT_MODIFIED, SOURCE_OFFLINE, SOURCE_SNAPSHOT,
+                             RegistryClient, RegistryError)
+
+INDEX_URL = "https://registry.invalid/index.json"
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+PACKAGES = [
+    {"name": "cloud-notepad", "version": "1.0.0", "description": "bulutta not defteri", "language": "python"},
+    {"name": "notes", "version": "2.0.0", "description": "basit not uygulaması", "language": "lua"},
+]
+
+
+def _write_index(path, packages=PACKAGES):
+    path.write_text(json.dumps(packages))
+    return path.as_uri()
+
+
+def test_list_search_and_info_fetch_index_once(clapp_home, tmp_path, monkeypatch):
+    url = _write_index(tmp_path / "packages.json")
+    monkeypatch.setattr(remote_registry, "REMOTE_PACKAGES_URL", url)
+
+    fetches = []
+    fetch = RegistryClient.fetch
+
+    def counting_fetch(self, *args, **kwargs):
+        fetches.append(self.url)
+        return fetch(self, *args, **kwargs)
+
+    monkeypatch.setattr(RegistryClient, "fetch", counting_fetch)
+
+    assert "2 paket" in remote_registry.list_remote_packages()
+    assert [p["name"] for p in remote_registry.search_packages("notepad")] == ["cloud-notepad"]
+    assert remote_registry.get_package_info("notes")["version"] == "2.0.0"
+    assert [p["name"] for p in remote_registry.get_packages_by_language("lua")] == ["notes"]
+
+    assert remote_registry.get_remote_session().fetch_count == 1
+    assert fetches == [url]
+
+
+class _Response:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise OSError(f"HTTP {self.status_code}")
+
+
+class _FakeRegistry:
+    """ETag / If-Modified-Since destekleyen sahte sunucu; istek başlıklarını kaydeder"""
+
+    def __init__(self):
+        self.requests = []
+        self.down = False
+
+    def get(self, url, headers=None, timeout=None):
+        headers = dict(headers or {})
+        self.requests.append(headers)
+        if self.down:
+            raise OSError("bağlantı reddedildi")
+        if headers.get("If-None-Match") == ETAG or headers.get("If-Modified-Since") == LAST_MODIFIED:
+            return _Response(304)
+        return _Response(200, json.dumps(PACKAGES).encode(),
+                         {"ETag": ETAG, "Last-Modified": LAST_MODIFIED})
+
+
+@pytest.fixture
+def fake_registry(monkeypatch):
+    server = _FakeRegistry()
+    monkeypatch.setattr(http_client, "get_http_client", lambda: server)
+    return server
+
+
+def _client(tmp_path, **kwargs):
+    return RegistryClient(INDEX_URL, cache_dir=str(tmp_path / "index"), **kwargs)
+
+
+def test_conditional_request_returns_snapshot_on_304(tmp_path, fake_registry):
+    client = _client(tmp_path, ttl=0)
+
+    data, source = client.fetch()
+    assert (data, source) == (PACKAGES, SOURCE_NETWORK)
+    assert "If-None-Match" not in fake_registry.requests[0]
+    fetched_at = client._load_meta()["fetched_at"]
+
+    data, source = client.fetch()
+    assert (data, source) == (PACKAGES, SOURCE_NOT_MODIFIED)
+    assert fake_registry.requests[1]["If-None-Match"] == ETAG
+    assert fake_registry.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+    # 304 snapshot'ı yeniden doğrulanmış sayar
+    assert client._load_meta()["fetched_at"] >= fetched_at
+
+
+def test_fresh_snapshot_is_reused_within_ttl(tmp_path, fake_registry):
+    client = _client(tmp_path, ttl=300)
+    assert client.fetch()[1] == SOURCE_NETWORK
+
+    # Yeni süreç de TTL içinde ağa çıkmaz
+    assert _client(tmp_path, ttl=300).fetch() == (PACKAGES, SOURCE_SNAPSHOT)
+    assert len(fake_registry.requests) == 1
+
+    # force TTL'i yok sayar ama koşullu istek gönderir
+    assert client.fetch(force=True) == (PACKAGES, SOURCE_NOT_MODIFIED)
+    assert len(fake_registry.requests) == 2
+
+
+def test_offline_and_network_errors_fall_back_to_snapshot(tmp_path, fake_registry):
+    with pytest.raises(RegistryError):
+        _client(tmp_path, offline=True).fetch()
+
+    _client(tmp_path, ttl=0).fetch()
+    requests_made = len(fake_registry.requests)
+
+    assert _client(tmp_path, offline=True).fetch() == (PACKAGES, SOURCE_OFFLINE)
+    assert len(fake_registry.requests) == requests_made
+
+    fake_registry.down = True
+    assert _client(tmp_path, ttl=0).fetch() == (PACKAGES, SOURCE_OFFLINE)
+    assert len(fake_registry.requests) == requests_made + 1
+
+    with pytest.raises(RegistryError):
+        RegistryClient(INDEX_URL, cache_dir=str(tmp_path / "empty"), ttl=0).fetch()
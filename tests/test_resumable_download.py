@@ -0,0 +1,147 @@
+"""resumable_download Range / If-Range testleri (yerel http.server ile)"""
+
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+from progress_utils import get_partial_download_path, resumable_download
+
+
+class _ArchiveServer(ThreadingHTTPServer):
+    """Range ve If-Range destekleyen, istenirse yanıtı yarıda kesen sunucu"""
+
+    daemon_threads = True
+
+    def __init__(self, payload: bytes):
+        super().__init__(("127.0.0.1", 0), _ArchiveHandler)
+        self.payload = payload
+        self.etag = '"v1"'
+        self.cut_next_response = False
+        self.requests = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/demo.tar.gz"
+
+
+class _ArchiveHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        payload = server.payload
+        start = 0
+
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") in (None, server.etag):
+            start = int(range_header.split("=", 1)[1].split("-", 1)[0])
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+        else:
+            self.send_response(200)
+        body = payload[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+
+        if server.cut_next_response:
+            # Bağlantı aktarımın ortasında kopar
+            server.cut_next_response = False
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def archive_server(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1,localhost")
+    monkeypatch.setattr(http_client, "_client", None)
+    server = _ArchiveServer(os.urandom(256 * 1024))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    http_client.reset_http_client()
+
+
+def test_interrupted_download_resumes_with_range_in_next_run(clapp_home, tmp_path, archive_server):
+    payload = archive_server.payload
+    sha256 = hashlib.sha256(payload).hexdigest()
+    part_path = get_partial_download_path(archive_server.url, sha256)
+    assert part_path.startswith(str(clapp_home))
+
+    # 1. çalıştırma: bağlantı kopar, tekrar deneme yok; parça kalıcı dizinde kalır
+    archive_server.cut_next_response = True
+    first_run = tmp_path / "run1"
+    first_run.mkdir()
+    success, _ = resumable_download(archive_server.url, str(first_run / "demo.tar.gz"),
+                                    expected_size=len(payload), expected_sha256=sha256,
+                                    retries=0, part_path=part_path)
+    assert not success
+    partial_size = os.path.getsize(part_path)
+    assert 0 < partial_size < len(payload)
+
+    # 2. çalıştırma: farklı geçici dizin, aynı kalıcı parça
+    second_run = tmp_path / "run2"
+    second_run.mkdir()
+    target = second_run / "demo.tar.gz"
+    success, digest = resumable_download(archive_server.url, str(target),
+                                         expected_size=len(payload), expected_sha256=sha256,
+                                         retries=0, part_path=part_path)
+    assert success
+    assert digest == sha256
+    assert target.read_bytes() == payload
+    assert not os.path.exists(part_path)
+
+    resumed = archive_server.requests[-1]
+    assert resumed["Range"] == f"bytes={partial_size}-"
+    assert resumed["If-Range"] == '"v1"'
+
+
+def test_changed_file_restarts_download_when_if_range_fails(clapp_home, tmp_path, archive_server):
+    part_path = get_partial_download_path(archive_server.url)
+
+    archive_server.cut_next_response = True
+    success, _ = resumable_download(archive_server.url, str(tmp_path / "demo.tar.gz"),
+                                    retries=0, part_path=part_path)
+    assert not success
+    assert os.path.getsize(part_path) > 0
+
+    # Sunucudaki dosya değişti: If-Range tutmaz, 200 ile tamamı gelir
+    archive_server.payload = os.urandom(128 * 1024)
+    archive_server.etag = '"v2"'
+    success, digest = resumable_download(archive_server.url, str(tmp_path / "demo.tar.gz"),
+                                         retries=0, part_path=part_path)
+    assert success
+    assert digest == hashlib.sha256(archive_server.payload).hexdigest()
+    assert (tmp_path / "demo.tar.gz").read_bytes() == archive_server.payload
+    assert archive_server.requests[-1]["If-Range"] == '"v1"'
+
+
+def test_fetch_archive_keeps_partial_data_outside_workspace(clapp_home, tmp_path, archive_server):
+    from install_command import fetch_archive
+
+    payload = archive_server.payload
+    sha256 = hashlib.sha256(payload).hexdigest()
+    archive_server.cut_next_response = True
+
+    work = tmp_path / "work"
+    work.mkdir()
+    success, path = fetch_archive(archive_server.url, str(work), "demo", len(payload), sha256)
+    assert success
+    with open(path, "rb") as f:
+        assert f.read() == payload
+
+    # Kesilen ilk yanıt, ikinci denemede Range ile tamamlandı
+    assert "Range" in archive_server.requests[-1]
+    assert not os.path.exists(get_partial_download_path(archive_server.url, sha256))
+    assert not [name for name in os.listdir(work) if name.endswith(".part")]
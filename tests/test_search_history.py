@@ -0,0 +1,55 @@
+"""SearchHistory günlüğü ve eşzamanlı sıkıştırma testleri"""
+
+import multiprocessing
+
+import smart_search
+from smart_search import SearchHistory
+
+WORKERS = 6
+SEARCHES_PER_WORKER = 500
+QUERIES = ["python", "lua", "game", "cli", "editor"]
+
+
+def _add_searches(summary_file: str, compact_lines: int):
+    # Sık sıkıştırma: yazıcılar ve sıkıştırmalar sürekli çakışır
+    smart_search.HISTORY_COMPACT_LINES = compact_lines
+    history = SearchHistory(summary_file)
+    for i in range(SEARCHES_PER_WORKER):
+        history.add(QUERIES[i % len(QUERIES)], i)
+
+
+def test_concurrent_writers_and_compaction_lose_no_lines(tmp_path):
+    summary_file = str(tmp_path / "search_history.json")
+    processes = [
+        multiprocessing.Process(target=_add_searches, args=(summary_file, 7 + worker))
+        for worker in range(WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(120)
+        assert process.exitcode == 0
+
+    history = SearchHistory(summary_file)
+    assert history.total == WORKERS * SEARCHES_PER_WORKER
+    assert sum(entry["count"] for entry in history.queries.values()) == WORKERS * SEARCHES_PER_WORKER
+
+    # Sıkıştırma toplamı değiştirmez
+    history.compact()
+    assert SearchHistory(summary_file).total == WORKERS * SEARCHES_PER_WORKER
+
+
+def test_history_survives_reload_in_recency_order(tmp_path):
+    summary_file = tmp_path / "search_history.json"
+    history = SearchHistory(summary_file)
+    for query in ["a", "b", "a", "c"]:
+        history.add(query)
+
+    reloaded = SearchHistory(summary_file)
+    assert reloaded.recent(3) == ["c", "a", "b"]
+    assert reloaded.popular(1) == [("a", 2)]
+
+    reloaded.compact()
+    compacted = SearchHistory(summary_file)
+    assert compacted.recent(3) == ["c", "a", "b"]
+    assert compacted.log_file.stat().st_size == 0
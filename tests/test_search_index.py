@@ -0,0 +1,95 @@
+"""search_index BM25 arama indeksi testleri"""
+
+import json
+
+import pytest
+
+import remote_registry
+import search_index
+from registry_client import RegistrySession
+from search_index import (SearchIndexError, SearchIndexReader, build_search_index, get_search_index,
+                          open_search_index, write_search_index)
+
+PACKAGES = [
+    {"name": "cloud-notepad", "description": "bulutta not defteri", "language": "python"},
+    {"name": "pad-tools", "description": "metin araçları", "language": "lua"},
+    {"name": "notes", "description": "basit not uygulaması", "language": "python"},
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_readers(monkeypatch):
+    monkeypatch.setattr(search_index, "_readers", {})
+
+
+def _names(results):
+    return [name for name, _ in results]
+
+
+def test_build_and_read_round_trip(tmp_path):
+    path = tmp_path / "search_index.bin"
+    size = write_search_index(PACKAGES, str(path), "v1")
+
+    data = path.read_bytes()
+    assert size == len(data)
+    assert data == build_search_index(PACKAGES, "v1")
+
+    reader = open_search_index(str(path))
+    try:
+        assert reader.version == "v1"
+        assert reader.doc_count == len(PACKAGES)
+        assert [reader.doc_name(i) for i in range(reader.doc_count)] == [p["name"] for p in PACKAGES]
+        assert _names(reader.search("lua")) == ["pad-tools"]
+        assert _names(reader.search("notes")) == ["notes"]
+        assert reader.search("yok") == []
+    finally:
+        reader.close()
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    path = tmp_path / "search_index.bin"
+    path.write_bytes(b"XXXX" + build_search_index(PACKAGES, "v1")[4:])
+    with pytest.raises(SearchIndexError):
+        open_search_index(str(path))
+
+
+def test_prefix_matches_rank_below_exact_terms():
+    reader = SearchIndexReader(build_search_index(PACKAGES))
+
+    # "note" sadece önek olarak eşleşir ("notes", "notepad")
+    assert set(_names(reader.search("note"))) == {"notes", "cloud-notepad"}
+    assert dict(reader.search("notes"))["notes"] > dict(reader.search("note"))["notes"]
+
+    # Kısa önekler terim tablosunda genişletilmez
+    assert reader.search("n") == []
+
+
+def test_stored_index_with_old_version_is_rebuilt(clapp_home, tmp_path):
+    index_file = tmp_path / "index.json"
+    index_file.write_text(json.dumps(PACKAGES[:1]))
+    session = RegistrySession(index_file.as_uri())
+    first = get_search_index(session)
+    assert _names(first.search("lua")) == []
+    stored = list(session.client.cache_dir.glob("search-*.bin"))
+    assert len(stored) == 1
+
+    # Yeni index sürümü: diskteki indeks sürümü tutmadığı için yeniden üretilir
+    index_file.write_text(json.dumps(PACKAGES))
+    session.client.ttl = 0
+    search_index._readers.clear()
+    session = RegistrySession(index_file.as_uri(), session.client)
+    reader = get_search_index(session)
+
+    assert reader.version == session.snapshot_version() != first.version
+    assert _names(reader.search("lua")) == ["pad-tools"]
+    assert list(session.client.cache_dir.glob("search-*.bin")) == stored
+
+
+def test_search_packages_appends_substring_matches(clapp_home, tmp_path, monkeypatch):
+    index_file = tmp_path / "packages.json"
+    index_file.write_text(json.dumps(PACKAGES))
+    monkeypatch.setattr(remote_registry, "REMOTE_PACKAGES_URL", index_file.as_uri())
+
+    # "pad" bir kelime başı olarak pad-tools'u bulur; "notepad" içindeki eşleşme arkaya eklenir
+    results = [package["name"] for package in remote_registry.search_packages("pad")]
+    assert results == ["pad-tools", "cloud-notepad"]
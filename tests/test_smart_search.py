@@ -0,0 +1,165 @@
+"""
+smart_search trigram indeksi testleri
+
+İndeksli arama, paket başına difflib ile puanlayan eski tarama ile
+karşılaştırılır: tam ve alt dizi eşleşmelerinin ilk top-k'sı aynı olmalıdır.
+"""
+
+import difflib
+import random
+
+import pytest
+
+import smart_search
+from smart_search import SmartSearch, TrigramIndex, get_trigram_index, get_trigram_index_path, packages_fingerprint
+
+TOP_K = 10
+
+
+def _reference_fuzzy_search(query, packages, threshold=0.6):
+    """İndekssiz, paket başına difflib ile puanlayan eski arama"""
+    results = []
+    query_lower = query.lower()
+
+    for package in packages:
+        name = package.get("name", "").lower()
+        description = package.get("description", "").lower()
+        language = package.get("language", "").lower()
+
+        if query_lower == name:
+            score = 1.0
+        elif query_lower in name:
+            score = 0.9
+        elif query_lower in description:
+            score = 0.7
+        elif query_lower == language:
+            score = 0.6
+        else:
+            name_ratio = difflib.SequenceMatcher(None, query_lower, name).ratio()
+            desc_ratio = difflib.SequenceMatcher(None, query_lower, description).ratio()
+            score = max(name_ratio, desc_ratio * 0.5)
+
+        if score >= threshold:
+            results.append({**package, "search_score": score})
+
+    results.sort(key=lambda x: x["search_score"], reverse=True)
+    return results
+
+
+def _synthetic_registry(count):
+    """Sentetik paket listesi üretir"""
+    rng = random.Random(42)
+    words = ["note", "task", "timer", "clock", "weather", "calc", "editor", "viewer", "player",
+             "chat", "mail", "image", "photo", "music", "video", "game", "snake", "chess",
+             "todo", "budget", "markdown", "json", "http", "server", "client", "backup"]
+    languages = ["python", "lua", "dart", "go", "rust", "node", "bash"]
+    packages = []
+    for i in range(count):
+        first, second = rng.sample(words, 2)
+        packages.append({
+            "name": f"{first}-{second}-{i}",
+            "version": f"{rng.randint(0, 3)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}",
+            "language": rng.choice(languages),
+            "description": " ".join(rng.choice(words) for _ in range(12)) + f" tool {i}",
+        })
+    return packages
+
+
+def _literal_matches(query, results):
+    """Sonuçlardan tam veya alt dizi olarak eşleşenleri (ad, skor) olarak döndürür"""
+    query_lower = query.lower()
+    return [
+        (package["name"], package["search_score"]) for package in results
+        if query_lower in package.get("name", "").lower()
+        or query_lower in package.get("description", "").lower()
+        or query_lower == package.get("language", "").lower()
+    ]
+
+
+def _searcher():
+    # Geçmiş dosyası gerektirmeyen arama örneği
+    return SmartSearch.__new__(SmartSearch)
+
+
+@pytest.fixture
+def fresh_index(clapp_home, monkeypatch):
+    monkeypatch.setattr(smart_search, "_index_cache", None)
+    return clapp_home
+
+
+@pytest.mark.parametrize("query", [
+    lambda packages: packages[2500]["name"],
+    lambda packages: packages[-1]["name"].upper(),
+    lambda packages: "-1666",
+    lambda packages: "weather-",
+    lambda packages: "tool 714",
+    lambda packages: "python",
+], ids=["exact", "exact-upper", "name-substring", "name-prefix", "description-substring", "language"])
+def test_literal_top_k_matches_reference(fresh_index, query):
+    packages = _synthetic_registry(5000)
+    query = query(packages)
+
+    reference = _reference_fuzzy_search(query, packages)
+    indexed = _searcher().fuzzy_search(query, packages)
+
+    assert _literal_matches(query, reference)
+    assert _literal_matches(query, indexed)[:TOP_K] == _literal_matches(query, reference)[:TOP_K]
+
+
+def test_index_is_persisted_and_reused(fresh_index, monkeypatch):
+    packages = _synthetic_registry(smart_search.TRIGRAM_PERSIST_MIN_PACKAGES)
+    built = get_trigram_index(packages)
+    path = get_trigram_index_path(packages_fingerprint(packages))
+    assert path.exists()
+
+    # Yeni bir süreç gibi: bellekteki indeks yok, trigramlar yeniden kurulmamalı
+    monkeypatch.setattr(smart_search, "_index_cache", None)
+    monkeypatch.setattr(smart_search, "_trigrams", lambda *args, **kwargs: pytest.fail("indeks yeniden kuruldu"))
+    copy = [dict(package) for package in packages]
+    loaded = get_trigram_index(copy)
+
+    assert loaded is not built
+    assert loaded.packages is copy
+    for field in ("name_grams", "padded_name_grams", "description_grams"):
+        original = getattr(built, field)
+        restored = getattr(loaded, field)
+        assert restored.keys() == original.keys()
+        assert all(list(restored[gram]) == positions for gram, positions in original.items())
+
+
+def test_stale_or_corrupt_index_file_is_rebuilt(fresh_index, monkeypatch):
+    packages = _synthetic_registry(smart_search.TRIGRAM_PERSIST_MIN_PACKAGES)
+    get_trigram_index(packages)
+    path = get_trigram_index_path(packages_fingerprint(packages))
+    path.write_bytes(b"bozuk")
+
+    monkeypatch.setattr(smart_search, "_index_cache", None)
+    index = get_trigram_index(packages)
+
+    assert index.name_grams
+    assert TrigramIndex.load(packages, path.read_bytes()) is not None
+
+    # Başka kaynağın indeksi bu kaynağın dosyasını silmez
+    other = _synthetic_registry(smart_search.TRIGRAM_PERSIST_MIN_PACKAGES + 1)
+    get_trigram_index(other, source="https://registry.invalid/index.json")
+    other_path = get_trigram_index_path(packages_fingerprint(other), "https://registry.invalid/index.json")
+    assert path.exists() and other_path.exists()
+
+    # Liste değişince aynı kaynağın eski parmak izi dosyası silinir
+    packages.append({"name": "yeni-paket", "description": "", "language": "python"})
+    get_trigram_index(packages)
+    assert not path.exists()
+    assert get_trigram_index_path(packages_fingerprint(packages)).exists()
+    assert other_path.exists()
+
+
+def test_in_place_mutation_with_same_length_is_not_stale(fresh_index):
+    packages = _synthetic_registry(50)
+    searcher = _searcher()
+    assert all(package["name"] != "zebra-calc" for package in searcher.fuzzy_search("zebra-calc", packages))
+
+    packages[10] = {"name": "zebra-calc", "description": "yeni", "language": "lua"}
+    results = searcher.fuzzy_search("zebra-calc", packages)
+
+    assert results[0]["name"] == "zebra-calc"
+    assert results[0]["search_score"] == 1.0
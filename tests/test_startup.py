@@ -0,0 +1,72 @@
+"""
+CLI başlangıç süresi regresyon testleri
+
+`clapp version` komut modüllerini ve ağır bağımlılıkları (requests,
+cryptography, tqdm) yüklememeli ve çıplak yorumlayıcının üzerine sınırlı
+bir süre eklemelidir.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+# `clapp version` için yorumlayıcı açılışına eklenebilecek en fazla süre
+STARTUP_OVERHEAD_BUDGET = float(os.environ.get("CLAPP_STARTUP_OVERHEAD_BUDGET", "0.3"))
+
+HEAVY_MODULES = (
+    "requests", "cryptography", "tqdm",
+    "cache_manager", "package_signing", "smart_search", "progress_utils", "publish_command",
+    "install_command", "version_manager",
+)
+
+
+def _env(home):
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home))
+    env.pop("PYTHONPATH", None)
+    return env
+
+
+def _run(args, home, extra=()):
+    return subprocess.run([sys.executable, *extra, MAIN, *args], cwd=str(home), env=_env(home),
+                          capture_output=True, text=True, timeout=60)
+
+
+def _best_of(command, home, runs=5):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=str(home), env=_env(home), capture_output=True, timeout=60, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_version_does_not_import_command_modules(tmp_path):
+    result = _run(["version", "--short"], tmp_path, ("-X", "importtime"))
+
+    assert result.returncode == 0, result.stderr
+    imported = {line.rsplit("|", 1)[-1].strip().split(".")[0]
+                for line in result.stderr.splitlines() if line.startswith("import time:")}
+    assert "version_command" in imported
+    assert not imported & set(HEAVY_MODULES)
+
+
+def test_version_startup_overhead_within_budget(tmp_path):
+    # İlk çalıştırma mesajı bir kez gösterilir; ölçüme dahil edilmez
+    _run(["version", "--short"], tmp_path)
+
+    baseline = _best_of([sys.executable, "-c", "pass"], tmp_path)
+    clapp = _best_of([sys.executable, MAIN, "version", "--short"], tmp_path)
+
+    assert clapp - baseline < STARTUP_OVERHEAD_BUDGET, \
+        f"clapp version {clapp:.3f}s, yorumlayıcı {baseline:.3f}s"
+
+
+def test_startup_profile_reports_imports(tmp_path):
+    result = _run(["--startup-profile", "version", "--short"], tmp_path)
+
+    assert result.returncode == 0
+    assert "Başlangıç profili" in result.stderr
+    assert "version_command" in result.stderr
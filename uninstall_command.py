@@ -28,16 +28,11 @@ def get_installed_apps() -> List[str]:
     if not os.path.exists(apps_dir):
         return []
     
-    apps = []
-    for item in os.listdir(apps_dir):
-        item_path = os.path.join(apps_dir, item)
-        if os.path.isdir(item_path) and not item.startswith('.'):
-            # manifest.json varlığını kontrol et
-            manifest_path = os.path.join(item_path, "manifest.json")
-            if os.path.exists(manifest_path):
-                apps.append(item)
-    
-    return apps
+    from installed_index import get_installed_index
+    
+    # manifest.json'u olan klasörler
+    return [item for item, entry in get_installed_index().entries().items()
+            if entry.get('manifest_stat') is not None]
 
 def is_app_installed(app_name: str) -> bool:
     """Uygulamanın kurulu olup olmadığını kontrol eder"""
@@ -103,8 +98,16 @@ def remove_app_directory(app_name: str) -> Tuple[bool, str]:
             return False, "Uygulama klasörü bulunamadı"
         
         # Klasörü sil
+        from installed_index import record_uninstall, snapshot_apps_dir
+        apps_dir_mtime = snapshot_apps_dir()
         shutil.rmtree(app_path)
         
+        record_uninstall(app_name, apps_dir_mtime)
+        
+        # Varsa uygulamaya özel Python ortamını da kaldır
+        from app_env import remove_app_env
+        remove_app_env(app_name)
+        
         return True, f"Uygulama klasörü kaldırıldı: {app_path}"
         
     except PermissionError:
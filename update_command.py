@@ -7,30 +7,31 @@ Bu modül kullanıcıların yüklü uygulamalarını güncellemelerini sağlar.
 
 import os
 import json
+import contextlib
 import shutil
 import tempfile
-import urllib.request
-import zipfile
 from typing import Tuple, Optional, Dict, Any
-from progress_utils import download_with_progress, extract_with_progress, show_success_message, show_error_message, show_info_message, show_warning_message
+from progress_utils import show_success_message, show_error_message, show_info_message, show_warning_message
+from install_command import download_app_from_github
+from installed_index import record_install, snapshot_apps_dir
+from app_staging import swap_in_app, staging_workspace
 
 def load_index() -> Tuple[bool, Dict[str, Any], str]:
     """
-    GitHub'dan index.json'u yükler
+    GitHub'dan index.json'u yükler (registry_client snapshot'ı üzerinden)
     
     Returns:
         (success, index_data, error_message)
     """
+    from registry_client import RegistryError, SOURCE_MESSAGES, get_registry_session
+    
     try:
-        index_url = "https://raw.githubusercontent.com/mburakmmm/clapp-packages/main/index.json"
-        show_info_message("🔄 GitHub'dan index.json indiriliyor...")
-        
-        with urllib.request.urlopen(index_url, timeout=10) as response:
-            index_data = json.loads(response.read().decode('utf-8'))
-        
+        session = get_registry_session()
+        index_data = session.load()
+        show_info_message(f"🔄 {SOURCE_MESSAGES[session.source]}")
         return True, index_data, ""
-    except urllib.error.URLError as e:
-        return False, {}, f"Network hatası: {e}"
+    except RegistryError as e:
+        return False, {}, str(e)
     except Exception as e:
         return False, {}, f"Index yükleme hatası: {e}"
 
@@ -47,21 +48,16 @@ def get_installed_apps() -> Dict[str, Dict[str, Any]]:
     if not os.path.exists(apps_dir):
         return installed_apps
     
-    for app_name in os.listdir(apps_dir):
-        app_path = os.path.join(apps_dir, app_name)
-        if os.path.isdir(app_path):
-            manifest_path = os.path.join(app_path, "manifest.json")
-            if os.path.exists(manifest_path):
-                try:
-                    with open(manifest_path, 'r', encoding='utf-8') as f:
-                        manifest = json.load(f)
-                    installed_apps[app_name] = {
-                        'version': manifest.get('version', 'unknown'),
-                        'path': app_path,
-                        'manifest': manifest
-                    }
-                except:
-                    continue
+    from installed_index import get_installed_index
+    
+    for app_name, entry in get_installed_index().entries().items():
+        manifest = entry.get('manifest')
+        if manifest is not None:
+            installed_apps[app_name] = {
+                'version': manifest.get('version', 'unknown'),
+                'path': entry['path'],
+                'manifest': manifest
+            }
     
     return installed_apps
 
@@ -97,7 +93,9 @@ def check_for_updates(app_name: str, current_version: str, index_data: Dict[str,
     
     return None
 
-def download_and_install_update(app_name: str, version: str, index_data: Dict[str, Any]) -> Tuple[bool, str]:
+def download_and_install_update(app_name: str, version: str, index_data: Dict[str, Any],
+                                workspace: Optional[str] = None,
+                                extractions: Optional[Dict[str, str]] = None) -> Tuple[bool, str]:
     """
     Uygulama güncellemesini indirir ve yükler
     
@@ -105,6 +103,8 @@ def download_and_install_update(app_name: str, version: str, index_data: Dict[st
         app_name: Uygulama adı
         version: Yüklenecek sürüm
         index_data: Index verisi (liste formatında)
+        workspace: Birden fazla güncelleme arasında paylaşılan geçici dizin
+        extractions: Paylaşılan depo arşivi kayıtları (zip_url -> zip yolu)
         
     Returns:
         (success, message)
@@ -120,48 +120,45 @@ def download_and_install_update(app_name: str, version: str, index_data: Dict[st
         if not app_info:
             return False, f"Uygulama bilgisi bulunamadı: {app_name} v{version}"
         
-        repo_url = app_info['repo_url']
-        subdir = app_info['subdir']
-        
-        # GitHub'dan zip dosyasını indir
-        zip_url = f"{repo_url}/archive/refs/heads/main.zip"
         show_info_message(f"📦 {app_name} v{version} indiriliyor...")
         
-        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_file:
-            temp_zip_path = temp_file.name
-        
-        # İndirme işlemi
-        download_with_progress(zip_url, temp_zip_path, f"📦 {app_name} indiriliyor")
-        
-        # Geçici dizin oluştur
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Zip dosyasını çıkar
-            extract_with_progress(temp_zip_path, temp_dir, f"📦 {app_name} çıkarılıyor")
+        # Paylaşılan çalışma dizini yoksa geçici dizin oluştur
+        with contextlib.nullcontext(workspace) if workspace else staging_workspace() as temp_dir:
             
-            # Uygulama dizinini bul
-            extracted_dir = os.path.join(temp_dir, "clapp-packages-main", subdir)
-            if not os.path.exists(extracted_dir):
-                return False, f"Uygulama dizini bulunamadı: {subdir}"
+            # Önce sadece değişen dosyaları indirmeyi dene (delta)
+            from app_delta import stage_delta_update
+            delta_success, delta_result = stage_delta_update(app_name, app_info, temp_dir)
+            if delta_success:
+                extracted_dir = delta_result
+            else:
+                if app_info.get('files_manifest_url'):
+                    show_info_message(f"Tam sürüm indirilecek: {delta_result}")
+                
+                # Per-app arşiv varsa sadece onu, yoksa paket deposunu indir
+                download_success, download_result = download_app_from_github(app_info, temp_dir, extractions)
+                if not download_success:
+                    return False, download_result
+                
+                extracted_dir = download_result
             
-            # Yüklü uygulamayı yedekle
+            # İzole ortam varsa güncelleme sonrası yeniden kurulacak
+            from app_env import get_app_python, create_app_env
             apps_dir = os.path.expanduser("~/.clapp/apps")
             app_path = os.path.join(apps_dir, app_name)
-            backup_path = os.path.join(apps_dir, f"{app_name}_backup")
+            had_env = get_app_python(app_name) is not None
             
-            if os.path.exists(app_path):
-                if os.path.exists(backup_path):
-                    shutil.rmtree(backup_path)
-                shutil.move(app_path, backup_path)
+            # Yeni sürümü rename ile yerine koy; eski sürüm arka planda silinir
+            apps_dir_mtime = snapshot_apps_dir()
+            swap_success, swap_message = swap_in_app(app_name, extracted_dir)
+            if not swap_success:
+                return False, swap_message
             
-            # Yeni sürümü yükle
-            shutil.copytree(extracted_dir, app_path)
+            if had_env:
+                env_success, env_message = create_app_env(app_name, app_path)
+                if not env_success:
+                    show_warning_message(env_message)
             
-            # Eski yedekleri temizle
-            if os.path.exists(backup_path):
-                shutil.rmtree(backup_path)
-        
-        # Geçici zip dosyasını sil
-        os.unlink(temp_zip_path)
+            record_install(app_name, apps_dir_mtime)
         
         return True, f"{app_name} v{version} başarıyla güncellendi!"
         
@@ -228,20 +225,25 @@ def update_all_apps() -> Tuple[bool, str]:
     updated_count = 0
     errors = []
     
-    for app_name in installed_apps.keys():
-        current_version = installed_apps[app_name]['version']
-        latest_version = check_for_updates(app_name, current_version, index_data)
-        
-        if latest_version:
-            show_info_message(f"🔄 {app_name} v{current_version} → v{latest_version} güncelleniyor...")
-            success, message = download_and_install_update(app_name, latest_version, index_data)
-            if success:
-                updated_count += 1
-                show_success_message(f"✅ {app_name} güncellendi")
+    # Tüm güncellemeler tek çalışma dizinini ve tek arşiv çıkarmasını paylaşır
+    extractions: Dict[str, str] = {}
+    
+    with staging_workspace() as workspace:
+        for app_name in installed_apps.keys():
+            current_version = installed_apps[app_name]['version']
+            latest_version = check_for_updates(app_name, current_version, index_data)
+            
+            if latest_version:
+                show_info_message(f"🔄 {app_name} v{current_version} → v{latest_version} güncelleniyor...")
+                success, message = download_and_install_update(app_name, latest_version, index_data,
+                                                               workspace, extractions)
+                if success:
+                    updated_count += 1
+                    show_success_message(f"✅ {app_name} güncellendi")
+                else:
+                    errors.append(f"{app_name}: {message}")
             else:
-                errors.append(f"{app_name}: {message}")
-        else:
-            show_info_message(f"✅ {app_name} zaten güncel (v{current_version})")
+                show_info_message(f"✅ {app_name} zaten güncel (v{current_version})")
     
     # Sonuç raporu
     if updated_count > 0:
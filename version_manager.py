@@ -13,7 +13,6 @@ Bu modül clapp paketlerinin versiyon yönetimini sağlar:
 import os
 import json
 import re
-import requests
 from typing import Dict, List, Tuple, Optional, Any
 try:
     from packaging import version as pkg_version
@@ -60,7 +59,8 @@ except ImportError:
             self.Version = SimpleVersion
     
     pkg_version = PkgVersion()
-from datetime import datetime, timezone
+from registry_client import get_registry_session
+from cache_manager import cached
 
 class VersionManager:
     """Gelişmiş versiyon yönetimi sınıfı"""
@@ -151,40 +151,7 @@ class VersionManager:
         Returns:
             En son versiyon veya None
         """
-        try:
-            # Cache'den kontrol et
-            cached_data = self._load_cache()
-            if app_name in cached_data:
-                cache_time = cached_data[app_name].get("timestamp", 0)
-                # 1 saat cache geçerli
-                if datetime.now().timestamp() - cache_time < 3600:
-                    return cached_data[app_name].get("latest_version")
-            
-            # Registry'den al
-            registry_data = self._fetch_registry()
-            if not registry_data:
-                return None
-            
-            # Uygulamayı bul
-            app_info = None
-            for app in registry_data:
-                if app.get("name") == app_name:
-                    app_info = app
-                    break
-            
-            if not app_info:
-                return None
-            
-            latest_version = app_info.get("version", "0.0.0")
-            
-            # Cache'e kaydet
-            self._update_cache(app_name, latest_version)
-            
-            return latest_version
-            
-        except Exception as e:
-            print(f"Versiyon kontrolü hatası: {e}")
-            return None
+        return lookup_latest_version(self.registry_url, app_name)
     
     def check_for_updates(self, app_name: str, current_version: str) -> Dict[str, Any]:
         """
@@ -322,48 +289,42 @@ class VersionManager:
             return {"error": str(e)}
     
     def _fetch_registry(self) -> Optional[List[Dict]]:
-        """Registry'den veri alır"""
+        """Registry'den veri alır (süreç kapsamlı registry oturumu üzerinden)"""
         try:
-            response = requests.get(self.registry_url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return get_registry_session(self.registry_url).load()
         except Exception as e:
             print(f"Registry fetch hatası: {e}")
             return None
     
-    def _load_cache(self) -> Dict:
-        """Cache'i yükler"""
-        try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception:
-            pass
-        return {}
-    
-    def _update_cache(self, app_name: str, latest_version: str):
-        """Cache'i günceller"""
-        try:
-            cache_data = self._load_cache()
-            cache_data[app_name] = {
-                "latest_version": latest_version,
-                "timestamp": datetime.now().timestamp()
-            }
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
-        except Exception as e:
-            print(f"Cache güncelleme hatası: {e}")
-    
     def clear_cache(self):
         """Cache'i temizler"""
         try:
+            lookup_latest_version.cache_clear()
+            # Eski sürümlerin yazdığı cache dosyası
             if os.path.exists(self.cache_file):
                 os.remove(self.cache_file)
-                print("✅ Versiyon cache temizlendi")
+            print("✅ Versiyon cache temizlendi")
         except Exception as e:
             print(f"Cache temizleme hatası: {e}")
 
+@cached(max_age=3600)
+def lookup_latest_version(registry_url: str, app_name: str) -> Optional[str]:
+    """
+    Registry'deki en son versiyonu döndürür
+    
+    Sonuç süreçler arası 1 saat saklanır; bulunamayan uygulamalar ve registry
+    hataları saklanmaz.
+    """
+    try:
+        package = get_registry_session(registry_url).get(app_name)
+    except Exception as e:
+        print(f"Versiyon kontrolü hatası: {e}")
+        return None
+    
+    if not package:
+        return None
+    return package.get("version", "0.0.0")
+
 # Yardımcı fonksiyonlar
 def create_version_manager() -> VersionManager:
     """Varsayılan ayarlarla VersionManager oluşturur"""
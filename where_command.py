@@ -23,16 +23,13 @@ def locate_app_path(app_name: str) -> Optional[str]:
     Returns:
         Uygulama dizininin tam yolu veya None
     """
-    if not app_exists(app_name):
-        return None
-    
-    apps_dir = get_apps_directory()
-    app_path = os.path.join(apps_dir, app_name)
+    from installed_index import get_installed_index
     
-    if os.path.exists(app_path):
-        return os.path.abspath(app_path)
+    entry = get_installed_index().get(app_name)
+    if not entry or not entry.get('valid'):
+        return None
     
-    return None
+    return os.path.abspath(entry['path'])
 
 def list_all_app_locations() -> Dict[str, str]:
     """
@@ -41,16 +38,13 @@ def list_all_app_locations() -> Dict[str, str]:
     Returns:
         Uygulama adı -> konum eşleştirmesi
     """
-    from package_registry import list_packages
+    from installed_index import get_installed_index
     
     locations = {}
-    packages = list_packages()
     
-    for package in packages:
-        app_name = package['name']
-        app_path = locate_app_path(app_name)
-        if app_path:
-            locations[app_name] = app_path
+    for folder, entry in get_installed_index().entries().items():
+        if entry.get('valid'):
+            locations[entry['manifest']['name']] = os.path.abspath(entry['path'])
     
     return locations
 
@@ -64,6 +58,8 @@ def get_app_details(app_name: str) -> Optional[Dict]:
     Returns:
         Uygulama detayları veya None
     """
+    from installed_index import get_installed_index
+    
     app_path = locate_app_path(app_name)
     if not app_path:
         return None
@@ -80,7 +76,7 @@ def get_app_details(app_name: str) -> Optional[Dict]:
         "description": manifest.get('description', ''),
         "entry": manifest.get('entry', ''),
         "dependencies": manifest.get('dependencies', []),
-        "size": get_directory_size(app_path)
+        "size": get_installed_index().get_size(app_name)
     }
 
 def get_directory_size(directory: str) -> int: